@@ -0,0 +1,52 @@
+"""background jobs queue table
+
+Revision ID: 5b7e2c91d4a0
+Revises: add_pending_ws
+Create Date: 2026-10-17 13:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7e2c91d4a0'
+down_revision = 'add_pending_ws'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    backgroundjobstatus_enum = sa.Enum('queued', 'failed', name='backgroundjobstatus')
+    op.create_table(
+        'background_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task', sa.String(), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('status', backgroundjobstatus_enum, nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('run_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('last_error', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_background_jobs_id'), 'background_jobs', ['id'], unique=False)
+    # Dequeue scans only due, queued rows
+    op.create_index(
+        'ix_background_jobs_queued_run_at',
+        'background_jobs',
+        ['run_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'queued'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_background_jobs_queued_run_at', table_name='background_jobs')
+    op.drop_index(op.f('ix_background_jobs_id'), table_name='background_jobs')
+    op.drop_table('background_jobs')
+    sa.Enum('queued', 'failed', name='backgroundjobstatus').drop(op.get_bind(), checkfirst=True)
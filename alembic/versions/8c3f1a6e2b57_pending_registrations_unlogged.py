@@ -0,0 +1,36 @@
+"""pending registrations unlogged table
+
+Revision ID: 8c3f1a6e2b57
+Revises: 5b7e2c91d4a0
+Create Date: 2026-10-17 13:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c3f1a6e2b57'
+down_revision = '5b7e2c91d4a0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # UNLOGGED: OTPs live 10 minutes, so skip WAL; the table is emptied after a crash
+    op.execute(
+        """
+        CREATE UNLOGGED TABLE pending_registrations (
+            email text PRIMARY KEY,
+            otp text NOT NULL,
+            payload jsonb NOT NULL,
+            expires_at timestamptz NOT NULL
+        )
+        """
+    )
+    op.create_index('ix_pending_registrations_expires_at', 'pending_registrations', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_pending_registrations_expires_at', table_name='pending_registrations')
+    op.drop_table('pending_registrations')
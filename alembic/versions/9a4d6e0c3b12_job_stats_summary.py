@@ -0,0 +1,44 @@
+"""job_stats summary table
+
+Revision ID: 9a4d6e0c3b12
+Revises: f3b8d2c65a19
+Create Date: 2026-10-17 17:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4d6e0c3b12'
+down_revision = 'f3b8d2c65a19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'job_stats',
+        sa.Column('admin_id', sa.Integer(), nullable=False),
+        sa.Column('total_jobs', sa.Integer(), nullable=False),
+        sa.Column('active_jobs', sa.Integer(), nullable=False),
+        sa.Column('workers_required', sa.Integer(), nullable=False),
+        sa.Column('workers_hired', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['admin_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('admin_id'),
+    )
+    # Backfill from existing jobs (same statement as `python -m app.entities.jobs.stats`)
+    op.execute(
+        """
+        INSERT INTO job_stats (admin_id, total_jobs, active_jobs, workers_required, workers_hired, updated_at)
+        SELECT admin_id, count(*), count(*) FILTER (WHERE status = 'active'),
+               coalesce(sum(workers_required), 0), coalesce(sum(workers_hired), 0), now()
+        FROM jobs
+        GROUP BY admin_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('job_stats')
@@ -0,0 +1,47 @@
+"""indexes for ETag list versions
+
+Revision ID: b7e1c4d9f2a8
+Revises: 9a4d6e0c3b12
+Create Date: 2026-10-17 19:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e1c4d9f2a8'
+down_revision = '9a4d6e0c3b12'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns, extra create_index kwargs)
+INDEXES = [
+    # AsyncJobService.get_jobs_version: index-only count / max / sum of updated_at per admin
+    ('ix_jobs_admin_id_updated_at', 'jobs', ['admin_id', 'updated_at'], {}),
+    # AsyncUserService.get_workers_version
+    ('ix_users_admin_id_updated_at_workers', 'users', ['admin_id', 'updated_at'],
+     {'postgresql_where': sa.text("user_role = 'worker'")}),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
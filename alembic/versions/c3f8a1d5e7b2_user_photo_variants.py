@@ -0,0 +1,41 @@
+"""user photo hash and variants
+
+Revision ID: c3f8a1d5e7b2
+Revises: b7e1c4d9f2a8
+Create Date: 2026-10-17 20:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f8a1d5e7b2'
+down_revision = 'b7e1c4d9f2a8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('photo_hash', sa.String(length=64), nullable=True))
+    op.add_column('users', sa.Column('photo_variants', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    # UserService.set_photo: dedupe lookup by content hash
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_photo_hash',
+            'users',
+            ['photo_hash'],
+            unique=False,
+            postgresql_where=sa.text('photo_hash IS NOT NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_photo_hash', table_name='users', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('users', 'photo_variants')
+    op.drop_column('users', 'photo_hash')
@@ -0,0 +1,58 @@
+"""indexes for hot service filters
+
+Revision ID: d41e7b9a3c20
+Revises: 8c3f1a6e2b57
+Create Date: 2026-10-17 14:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41e7b9a3c20'
+down_revision = '8c3f1a6e2b57'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns, extra create_index kwargs)
+INDEXES = [
+    # JobService.get_all_jobs: admin filter, newest first
+    ('ix_jobs_admin_id_created_at_id', 'jobs', ['admin_id', 'created_at', 'id'], {}),
+    # JobService.get_jobs_stats: index-only aggregate per admin
+    ('ix_jobs_admin_id_stats', 'jobs', ['admin_id'],
+     {'postgresql_include': ['id', 'status', 'workers_required', 'workers_hired']}),
+    # Worker panels / revenue: applications by worker
+    ('ix_job_applications_worker_id', 'job_applications', ['worker_id'], {}),
+    # Pending payments and settlement by job
+    ('ix_job_applications_job_id_payment_status', 'job_applications', ['job_id', 'payment_status'], {}),
+    # login_user / check_user_email_exists / reset_password
+    ('ix_users_email', 'users', ['email'], {}),
+    # get_all_workers_by_admin: only worker rows are ever listed
+    ('ix_users_admin_id_workers', 'users', ['admin_id'],
+     {'postgresql_where': sa.text("user_role = 'worker'")}),
+    # request_registration / verify_and_register duplicate check
+    ('ix_business_email', 'business', ['email'], {}),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
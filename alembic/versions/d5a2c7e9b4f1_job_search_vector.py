@@ -0,0 +1,54 @@
+"""job full-text search vector
+
+Revision ID: d5a2c7e9b4f1
+Revises: c3f8a1d5e7b2
+Create Date: 2026-10-17 21:30:00.000000
+
+Adding a STORED generated column rewrites the jobs table under an ACCESS
+EXCLUSIVE lock, so run this in a maintenance window on large tables. The GIN
+index is then built CONCURRENTLY.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a2c7e9b4f1'
+down_revision = 'c3f8a1d5e7b2'
+branch_labels = None
+depends_on = None
+
+# array_to_string is STABLE; generated columns need IMMUTABLE functions
+ARRAY_FUNCTION = (
+    "CREATE OR REPLACE FUNCTION immutable_array_to_string(text[], text) RETURNS text "
+    "LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$ SELECT array_to_string($1, $2) $$"
+)
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(immutable_array_to_string(characteristics, ' '), '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    op.execute(ARRAY_FUNCTION)
+    op.add_column('jobs', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR, persisted=True), nullable=True))
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_jobs_search_vector',
+            'jobs',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_jobs_search_vector', table_name='jobs', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('jobs', 'search_vector')
+    op.execute("DROP FUNCTION IF EXISTS immutable_array_to_string(text[], text)")
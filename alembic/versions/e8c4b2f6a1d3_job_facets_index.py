@@ -0,0 +1,36 @@
+"""covering index for job facets
+
+Revision ID: e8c4b2f6a1d3
+Revises: d5a2c7e9b4f1
+Create Date: 2026-10-17 23:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8c4b2f6a1d3'
+down_revision = 'd5a2c7e9b4f1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # AsyncJobService.get_job_facets: index-only GROUPING SETS aggregate per admin
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_jobs_admin_id_facets',
+            'jobs',
+            ['admin_id'],
+            unique=False,
+            postgresql_include=['status', 'job_category', 'salary_type', 'salary'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_jobs_admin_id_facets', table_name='jobs', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,36 @@
+"""created_at NOT NULL on every BaseModel table
+
+Revision ID: f1d6a9c3e8b4
+Revises: e8c4b2f6a1d3
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1d6a9c3e8b4'
+down_revision = 'e8c4b2f6a1d3'
+branch_labels = None
+depends_on = None
+
+TABLES = ('users', 'business', 'jobs', 'job_applications', 'background_jobs')
+
+
+def upgrade() -> None:
+    # Keyset pagination orders on (created_at, id): a NULL created_at sorts first under DESC
+    # and never satisfies the `(created_at, id) < cursor` comparison, so such rows were
+    # skipped or repeated. Backfill from updated_at (else now()) and forbid NULLs.
+    for table in TABLES:
+        op.execute(f"UPDATE {table} SET created_at = coalesce(updated_at, now()) WHERE created_at IS NULL")
+        # A validated CHECK lets SET NOT NULL skip its own scan under ACCESS EXCLUSIVE
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_created_at_not_null CHECK (created_at IS NOT NULL) NOT VALID")
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_created_at_not_null")
+        op.alter_column(table, 'created_at', existing_type=sa.DateTime(timezone=True), nullable=False)
+        op.drop_constraint(f'{table}_created_at_not_null', table, type_='check')
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, 'created_at', existing_type=sa.DateTime(timezone=True), nullable=True)
@@ -0,0 +1,39 @@
+"""indexes for paginated list filters
+
+Revision ID: f3b8d2c65a19
+Revises: d41e7b9a3c20
+Create Date: 2026-10-17 16:10:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8d2c65a19'
+down_revision = 'd41e7b9a3c20'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns)
+INDEXES = [
+    # GET /jobs?status=...: keyset order within one status
+    ('ix_jobs_admin_id_status_created_at_id', 'jobs', ['admin_id', 'status', 'created_at', 'id']),
+    # GET /jobs?from_date=...&to_date=...
+    ('ix_jobs_admin_id_from_date_time', 'jobs', ['admin_id', 'from_date_time']),
+    # GET /business: keyset order over the whole table
+    ('ix_business_created_at_id', 'business', ['created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -2,153 +2,231 @@
 Authentication and Authorization Dependencies
 
 Uses JWT Bearer token. Admin login puts sub=admin_id and role="admin" in the token.
+
+Verified claims are kept in a bounded LRU keyed by a digest of the token, each
+entry expiring at the token's `exp`, so clients that resend the same token skip
+the HMAC decode. The caller is resolved once per request into a Principal
+(id, role, admin_id) stored on request.state.principal. The dependencies are
+`async def`: they do no I/O, so running them on the event loop avoids a
+threadpool hop per dependency.
 """
 
-from fastapi import Depends, HTTPException, status
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jwt.exceptions import InvalidTokenError
 
+from app.config import settings
 from app.core.security import verify_token
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
-def get_current_admin_id(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> int:
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated caller resolved from the JWT."""
+    id: int
+    role: str | None
+    admin_id: int | None = None
+
+
+class VerifiedTokenCache:
     """
-    STRICT ADMIN ONLY - Returns admin_id (from token sub).
-    Use on routes that require admin role for write operations (create/update/delete/approve).
-    For viewing jobs that workers should also see, use get_admin_id_for_jobs() instead.
+    Bounded LRU of verified JWT claims; entries expire at the token's `exp`.
+    Claims are shared by every request presenting the token, so they are stored read-only.
     """
-    credentials_exception = HTTPException(
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[bytes, tuple[Mapping[str, Any], float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, token: str) -> Mapping[str, Any] | None:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, token: str, claims: Mapping[str, Any]) -> None:
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or self.max_size <= 0:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (MappingProxyType(dict(claims)), float(exp))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+token_cache = VerifiedTokenCache(settings.TOKEN_CACHE_SIZE)
+
+
+def verify_token_cached(token: str) -> Mapping[str, Any]:
+    """verify_token() with a cache of previously verified, unexpired tokens; the claims are read-only."""
+    token = token.strip() if token else token
+    claims = token_cache.get(token) if token else None
+    if claims is None:
+        claims = MappingProxyType(verify_token(token))
+        token_cache.put(token, claims)
+    return claims
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    forbidden_exception = HTTPException(
-        status_code=status.HTTP_403_FORBIDDEN,
-        detail="Admin access required.",
-    )
+
+
+def _resolve_principal(request: Request, token: str) -> Principal:
+    principal = getattr(request.state, "principal", None)
+    if principal is not None:
+        return principal
     try:
-        token = credentials.credentials
-        payload = verify_token(token)
+        payload = verify_token_cached(token)
         sub = payload.get("sub")
-        role = payload.get("role")
         if sub is None:
-            raise credentials_exception
-        if role != "admin":
-            raise forbidden_exception
-        return int(sub)
+            raise _credentials_exception()
+        admin_id = payload.get("admin_id")
+        principal = Principal(
+            id=int(sub),
+            role=payload.get("role"),
+            admin_id=int(admin_id) if admin_id is not None else None,
+        )
     except HTTPException:
         raise
     except (InvalidTokenError, ValueError, TypeError) as e:
         logger.error(f"Token validation error: {str(e)}")
-        raise credentials_exception
+        raise _credentials_exception()
+    request.state.principal = principal
+    return principal
 
 
-def get_admin_id_for_jobs(
+async def get_principal(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> Principal:
+    """Resolve the caller once per request (cached on request.state.principal)."""
+    return _resolve_principal(request, credentials.credentials)
+
+
+async def get_current_admin_id(
+    principal: Principal = Depends(get_principal),
+) -> int:
+    """
+    STRICT ADMIN ONLY - Returns admin_id (from token sub).
+    Use on routes that require admin role for write operations (create/update/delete/approve).
+    For viewing jobs that workers should also see, use get_admin_id_for_jobs() instead.
+    """
+    if principal.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required.",
+        )
+    return principal.id
+
+
+async def get_admin_id_for_jobs(
+    principal: Principal = Depends(get_principal),
 ) -> int:
     """
     Returns admin_id for job filtering - works for both admins and workers.
     - If admin: returns their own admin_id (from token sub)
     - If worker: returns their associated admin_id (from token admin_id field)
-    
+
     PURPOSE: Workers need to see jobs posted by their admin, so worker tokens
     contain an admin_id field. This function allows both roles to view jobs
     filtered by admin_id.
-    
+
     SECURITY NOTE: Only use this for READ operations (GET /jobs).
     For CREATE/UPDATE/DELETE, use get_current_admin_id() which is admin-only.
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    forbidden_exception = HTTPException(
+    # Admin: return their own ID
+    if principal.role == "admin":
+        return principal.id
+
+    # Worker: return their associated admin_id from token
+    if principal.role == "worker":
+        if principal.admin_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Worker token missing admin_id field",
+            )
+        return principal.admin_id
+
+    # Any other role is forbidden
+    raise HTTPException(
         status_code=status.HTTP_403_FORBIDDEN,
         detail="Access denied. Admin or Worker role required.",
     )
-    try:
-        token = credentials.credentials
-        payload = verify_token(token)
-        sub = payload.get("sub")
-        role = payload.get("role")
-        
-        if sub is None:
-            raise credentials_exception
-            
-        # Admin: return their own ID
-        if role == "admin":
-            return int(sub)
-            
-        # Worker: return their associated admin_id from token
-        if role == "worker":
-            admin_id = payload.get("admin_id")
-            if admin_id is None:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Worker token missing admin_id field",
-                )
-            return int(admin_id)
-            
-        # Any other role is forbidden
-        raise forbidden_exception
-        
-    except HTTPException:
-        raise
-    except (InvalidTokenError, ValueError, TypeError) as e:
-        logger.error(f"Token validation error: {str(e)}")
-        raise credentials_exception
 
 
-def get_current_admin_id_optional(
-    credentials: HTTPAuthorizationCredentials | None = Depends(HTTPBearer(auto_error=False)),
+async def get_current_admin_id_optional(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials | None = Depends(optional_security),
 ) -> int | None:
     """Return admin_id from JWT if valid admin token present, else None. Use for routes that allow optional admin auth."""
     if credentials is None:
         return None
     try:
-        token = credentials.credentials
-        payload = verify_token(token)
-        sub = payload.get("sub")
-        role = payload.get("role")
-        if sub is not None and role == "admin":
-            return int(sub)
+        principal = _resolve_principal(request, credentials.credentials)
+        if principal.role == "admin":
+            return principal.id
     except Exception:
         pass
     return None
 
-def get_current_worker_id(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
+async def get_current_worker_id(
+    principal: Principal = Depends(get_principal),
 ) -> int:
     """Return worker_id from JWT if valid worker token present, else raises. Use for routes that require worker auth."""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    forbidden_exception = HTTPException(
-        status_code=status.HTTP_403_FORBIDDEN,
-        detail="Worker access required.",
-    )
-    try:
-        token = credentials.credentials
-        payload = verify_token(token)
-        sub = payload.get("sub")
-        role = payload.get("role")
-        if sub is None:
-            raise credentials_exception
-        if role != "worker":
-            raise forbidden_exception
-        return int(sub)
-    except HTTPException:
-        raise
-    except (InvalidTokenError, ValueError, TypeError) as e:
-        logger.error(f"Token validation error: {str(e)}")
-        raise credentials_exception
\ No newline at end of file
+    if principal.role != "worker":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Worker access required.",
+        )
+    return principal.id
@@ -1,33 +1,284 @@
+import queue
 import smtplib
+import threading
+import time
+from contextlib import contextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
+from sqlalchemy.orm import Session
 from app.config import settings
+from app.core.job_queue import enqueue, register_batch_scope, register_task
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+
+class SMTPConnectionPool:
+    """
+    Long-lived SMTP connections shared by every EmailService.
+
+    Connections are handed out LIFO so the warmest one is reused. A connection
+    idle for longer than `keepalive_seconds` is checked with NOOP before use and
+    one idle past `max_idle_seconds` is dropped (servers such as Gmail close
+    quiet sessions anyway). Broken connections are replaced transparently.
+
+    Inside `session()` every send() of the current thread reuses one checked-out
+    connection, so a batch of queued emails costs a single SMTP session.
+
+    With `require_tls` (the default) every session must upgrade with STARTTLS
+    and log in, and connecting fails when the server does not offer them, so
+    a stripped EHLO can never downgrade to plaintext credentials or mail.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        size: int = 2,
+        keepalive_seconds: float = 30,
+        max_idle_seconds: float = 240,
+        timeout: float = 10,
+        require_tls: bool = True,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = size
+        self.keepalive_seconds = keepalive_seconds
+        self.max_idle_seconds = max_idle_seconds
+        self.timeout = timeout
+        self.require_tls = require_tls
+        self._idle: queue.LifoQueue[tuple[smtplib.SMTP, float]] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._in_use = 0
+        self._in_use_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _acquire_slot(self) -> None:
+        self._slots.acquire()
+        with self._in_use_lock:
+            self._in_use += 1
+
+    def _release_slot(self) -> None:
+        with self._in_use_lock:
+            self._in_use -= 1
+        self._slots.release()
+
+    def stats(self) -> dict:
+        return {"size": self.size, "in_use": self._in_use, "idle": self._idle.qsize()}
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            server.ehlo()
+            if self.require_tls:
+                # Both raise SMTPNotSupportedError when the extension is not advertised
+                server.starttls()
+                server.ehlo()
+                server.login(self.username, self.password)
+            else:
+                if server.has_extn("starttls"):
+                    server.starttls()
+                    server.ehlo()
+                if self.username and server.has_extn("auth"):
+                    server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    @staticmethod
+    def _close(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _is_alive(self, server: smtplib.SMTP) -> bool:
+        try:
+            return server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _checkout(self) -> smtplib.SMTP:
+        while True:
+            try:
+                server, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            idle_for = time.monotonic() - last_used
+            if idle_for > self.max_idle_seconds:
+                self._close(server)
+                continue
+            if idle_for > self.keepalive_seconds and not self._is_alive(server):
+                self._close(server)
+                continue
+            return server
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; it is returned to the pool unless the block raised an SMTP/socket error."""
+        self._acquire_slot()
+        server = None
+        try:
+            server = self._checkout()
+            yield server
+        except (smtplib.SMTPServerDisconnected, OSError):
+            if server is not None:
+                server.close()
+                server = None
+            raise
+        finally:
+            if server is not None:
+                self._idle.put((server, time.monotonic()))
+            self._release_slot()
+
+    @contextmanager
+    def session(self):
+        """
+        Send everything inside the block over one connection (current thread only).
+        The connection is checked out on the first send() and returned when the block exits.
+        """
+        if getattr(self._local, "active", False):
+            yield
+            return
+        self._local.active = True
+        self._local.server = None
+        try:
+            yield
+        finally:
+            server = self._local.server
+            self._local.active = False
+            self._local.server = None
+            if server is not None:
+                self._idle.put((server, time.monotonic()))
+                self._release_slot()
+
+    def _drop_session_server(self) -> None:
+        server = self._local.server
+        if server is not None:
+            self._local.server = None
+            server.close()
+            self._release_slot()
+
+    def _send_in_session(self, messages: list[MIMEMultipart]) -> None:
+        for attempt in range(2):
+            try:
+                if self._local.server is None:
+                    self._acquire_slot()
+                    try:
+                        self._local.server = self._checkout()
+                    except Exception:
+                        self._release_slot()
+                        raise
+                while messages:
+                    self._local.server.send_message(messages[0])
+                    messages.pop(0)
+                return
+            except (smtplib.SMTPServerDisconnected, OSError):
+                self._drop_session_server()
+                if attempt:
+                    raise
+                logger.info("SMTP connection dropped, reconnecting")
+
+    def send(self, messages: list[MIMEMultipart]) -> None:
+        """
+        Send messages over one session, reconnecting once if the server dropped us.
+        Sent messages are removed from `messages`, so on error it holds what is left.
+        """
+        if getattr(self._local, "active", False):
+            self._send_in_session(messages)
+            return
+        for attempt in range(2):
+            try:
+                with self.connection() as server:
+                    while messages:
+                        server.send_message(messages[0])
+                        messages.pop(0)
+                return
+            except (smtplib.SMTPServerDisconnected, OSError):
+                if attempt:
+                    raise
+                logger.info("SMTP connection dropped, reconnecting")
+
+    def close(self) -> None:
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(server)
+
+
+_pool: SMTPConnectionPool | None = None
+_init_lock = threading.Lock()
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    global _pool
+    if _pool is None:
+        with _init_lock:
+            if _pool is None:
+                _pool = SMTPConnectionPool(
+                    settings.GOOGLE_SMTP,
+                    settings.GOOGLE_PORT,
+                    settings.GOOGLE_EMAIL,
+                    settings.GOOGLE_PASSWORD,
+                    size=settings.SMTP_POOL_SIZE,
+                    keepalive_seconds=settings.SMTP_KEEPALIVE_SECONDS,
+                    max_idle_seconds=settings.SMTP_MAX_IDLE_SECONDS,
+                    timeout=settings.SMTP_TIMEOUT,
+                    require_tls=settings.SMTP_REQUIRE_TLS,
+                )
+    return _pool
+
+
+# Every batch of background jobs shares one SMTP session for the emails it sends
+register_batch_scope(lambda: get_smtp_pool().session())
+
+
+def shutdown_email() -> None:
+    """Close pooled SMTP connections (app shutdown)."""
+    if _pool is not None:
+        _pool.close()
+
+
 class EmailService:
     def __init__(self):
-        self.smtp_server = settings.GOOGLE_SMTP
-        self.smtp_port = settings.GOOGLE_PORT
         self.email = settings.GOOGLE_EMAIL
-        self.password = settings.GOOGLE_PASSWORD
+        self.pool = get_smtp_pool()
 
+    def _build_message(self, to: str, subject: str, body: str) -> MIMEMultipart:
+        msg = MIMEMultipart()
+        msg['From'] = self.email
+        msg['To'] = to
+        msg['Subject'] = subject
+        msg.attach(MIMEText(body, 'plain'))
+        return msg
+
+    # Send now over a pooled connection; raises on failure
     def send_email(self, to: str, subject: str, body: str):
         try:
-            msg = MIMEMultipart()
-            msg['From'] = self.email
-            msg['To'] = to
-            msg['Subject'] = subject
-            msg.attach(MIMEText(body, 'plain'))
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.email, self.password)
-            server.send_message(msg)
-            server.quit()
+            self.pool.send([self._build_message(to, subject, body)])
             return True
         except Exception as e:
             logger.error(f"Error sending email: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    # Durable delivery: queued in the caller's transaction, sent by the background job workers.
+    # The body is stored in background_jobs: never use this for passwords or OTPs (queue a reference task instead)
+    def enqueue_email(self, db: Session, to: str, subject: str, body: str) -> None:
+        enqueue(db, SEND_EMAIL_TASK, {"to": to, "subject": subject, "body": body})
+
+
+SEND_EMAIL_TASK = "send_email"
+
+
+@register_task(SEND_EMAIL_TASK)
+def _send_email_task(db: Session, payload: dict) -> None:
+    EmailService().send_email(payload["to"], payload["subject"], payload["body"])
@@ -0,0 +1,310 @@
+"""
+Read-through cache for single entities (JobRead, BusinessRead, UserRead by id).
+
+Two tiers:
+- local: bounded LRU per process, entries expire after ENTITY_CACHE_LOCAL_TTL.
+- shared (ENTITY_CACHE_BACKEND=redis): JSON under `entity:<name>:<id>` at
+  REDIS_URL with ENTITY_CACHE_SHARED_TTL, so every worker sees the same fills
+  and invalidations.
+
+Services read with `cache.get_or_load(id, loader)` and call
+`cache.invalidate(id)` after committing a write. Invalidation only deletes
+entries; it never writes new values. That avoids two writers racing to store
+their own versions.
+
+The race left over is a *stale fill*. A reader misses and loads the old row,
+a writer commits and invalidates, and then the reader stores the old row.
+Every key hashes to one of GENERATION_STRIPES counters (a Redis counter per
+key for the shared tier). Invalidation bumps the counter, and a fill is
+dropped if the counter moved while the loader ran.
+
+Without a shared tier, another process's local copy can be stale for up to
+ENTITY_CACHE_LOCAL_TTL, so keep that TTL short when running several workers.
+Cached models are shared between callers and must be treated as read-only.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+from pydantic import BaseModel
+
+from app.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+GENERATION_STRIPES = 1024
+
+
+class LocalTier:
+    """Thread-safe LRU with per-entry expiry and striped generation counters."""
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[Any, tuple[Any, float]] = OrderedDict()
+        self._generations = [0] * GENERATION_STRIPES
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def generation(self, key: Any) -> int:
+        return self._generations[hash(key) % GENERATION_STRIPES]
+
+    def get(self, key: Any) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[1] <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Any, value: Any, generation: int) -> bool:
+        """Store unless the key was invalidated since `generation` was read."""
+        if self.max_size <= 0:
+            return False
+        with self._lock:
+            if self._generations[hash(key) % GENERATION_STRIPES] != generation:
+                return False
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def invalidate(self, key: Any) -> None:
+        with self._lock:
+            self._generations[hash(key) % GENERATION_STRIPES] += 1
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations = [g + 1 for g in self._generations]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisTier:
+    """Shared tier: `entity:<name>:<id>` values plus `entity:<name>:<id>:gen` counters."""
+
+    def __init__(self, ttl: float, url: str | None = None, client=None) -> None:
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("ENTITY_CACHE_BACKEND=redis requires the 'redis' package") from e
+            client = redis.Redis.from_url(url or settings.REDIS_URL)
+        self.client = client
+        self.ttl = max(1, int(ttl))
+
+    def generation(self, key: str) -> bytes | None:
+        return self.client.get(key + ":gen")
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(key)
+
+    def put(self, key: str, raw: bytes, generation: bytes | None) -> bool:
+        """SET under WATCH of the generation counter; skipped if it moved since `generation` was read."""
+        from redis.exceptions import WatchError
+
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(key + ":gen")
+                if pipe.get(key + ":gen") != generation:
+                    return False
+                pipe.multi()
+                pipe.set(key, raw, ex=self.ttl)
+                pipe.execute()
+                return True
+            except WatchError:
+                return False
+
+    def invalidate(self, key: str) -> None:
+        pipe = self.client.pipeline(transaction=True)
+        pipe.incr(key + ":gen")
+        pipe.expire(key + ":gen", self.ttl * 2)
+        pipe.delete(key)
+        pipe.execute()
+
+
+class EntityCache(Generic[M]):
+    """Cache of one schema type keyed by id; see the module docstring."""
+
+    def __init__(self, name: str, schema: type[M], local: LocalTier, shared: RedisTier | None = None) -> None:
+        self.name = name
+        self.schema = schema
+        self.local = local
+        self.shared = shared
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.stale_fills = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.local.max_size > 0
+
+    def _count(self, counter: str, n: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + n)
+
+    def _shared_key(self, id: Any) -> str:
+        return f"entity:{self.name}:{id}"
+
+    # The shared tier is best effort: a Redis outage degrades to local + database
+    def _shared_lookup(self, id: Any) -> tuple[M | None, bytes | None]:
+        if self.shared is None:
+            return None, None
+        try:
+            key = self._shared_key(id)
+            generation = self.shared.generation(key)
+            raw = self.shared.get(key)
+            return (self.schema.model_validate_json(raw) if raw else None), generation
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Entity cache {self.name}: shared tier read failed: {e}")
+            return None, None
+
+    def _shared_store(self, id: Any, value: M, generation: bytes | None) -> None:
+        if self.shared is None:
+            return
+        try:
+            if not self.shared.put(self._shared_key(id), value.model_dump_json().encode(), generation):
+                self._count("stale_fills")
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Entity cache {self.name}: shared tier write failed: {e}")
+
+    def _lookup(self, id: Any) -> tuple[M | None, int, bytes | None]:
+        generation = self.local.generation(id)
+        value = self.local.get(id)
+        if value is not None:
+            self._count("hits")
+            return value, generation, None
+        value, shared_generation = self._shared_lookup(id)
+        if value is not None:
+            self._count("shared_hits")
+            self.local.put(id, value, generation)
+            return value, generation, None
+        self._count("misses")
+        return None, generation, shared_generation
+
+    def _fill(self, id: Any, value: M | None, generation: int, shared_generation: bytes | None) -> None:
+        if value is None:
+            return
+        if not self.local.put(id, value, generation):
+            self._count("stale_fills")
+            return
+        self._shared_store(id, value, shared_generation)
+
+    def get_or_load(self, id: Any, loader: Callable[[], M | None]) -> M | None:
+        if not self.enabled:
+            return loader()
+        value, generation, shared_generation = self._lookup(id)
+        if value is not None:
+            return value
+        value = loader()
+        self._fill(id, value, generation, shared_generation)
+        return value
+
+    async def aget_or_load(self, id: Any, loader: Callable[[], Awaitable[M | None]]) -> M | None:
+        """Async variant; shared-tier calls run in a thread so Redis round trips do not block the loop."""
+        if not self.enabled:
+            return await loader()
+        if self.shared is None:
+            value, generation, shared_generation = self._lookup(id)
+        else:
+            value, generation, shared_generation = await asyncio.to_thread(self._lookup, id)
+        if value is not None:
+            return value
+        value = await loader()
+        if self.shared is None:
+            self._fill(id, value, generation, shared_generation)
+        else:
+            await asyncio.to_thread(self._fill, id, value, generation, shared_generation)
+        return value
+
+    def invalidate(self, *ids: Any) -> None:
+        """Drop entries after the write that changed them has committed."""
+        if not self.enabled:
+            return
+        for id in ids:
+            self.local.invalidate(id)
+            if self.shared is not None:
+                try:
+                    self.shared.invalidate(self._shared_key(id))
+                except Exception as e:
+                    self._count("errors")
+                    logger.warning(f"Entity cache {self.name}: shared tier invalidation failed: {e}")
+        self._count("invalidations", len(ids))
+
+    def clear(self) -> None:
+        self.local.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                "size": len(self.local),
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.local.evictions,
+                "expirations": self.local.expirations,
+                "stale_fills": self.stale_fills,
+                "invalidations": self.invalidations,
+                "errors": self.errors,
+                "hit_ratio": (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+            }
+
+
+_caches: dict[str, EntityCache] = {}
+_shared: RedisTier | None = None
+_registry_lock = threading.Lock()
+
+
+def _shared_tier() -> RedisTier | None:
+    global _shared
+    backend = settings.ENTITY_CACHE_BACKEND.lower()
+    if backend == "memory":
+        return None
+    if backend != "redis":
+        raise ValueError(f"Unknown ENTITY_CACHE_BACKEND: {settings.ENTITY_CACHE_BACKEND}")
+    if _shared is None:
+        _shared = RedisTier(ttl=settings.ENTITY_CACHE_SHARED_TTL)
+    return _shared
+
+
+def entity_cache(name: str, schema: type[M]) -> EntityCache[M]:
+    """The process-wide cache for `name`, created on first use."""
+    with _registry_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            local = LocalTier(settings.ENTITY_CACHE_SIZE, settings.ENTITY_CACHE_LOCAL_TTL)
+            cache = _caches[name] = EntityCache(name, schema, local, _shared_tier())
+        return cache
+
+
+def entity_cache_stats() -> dict[str, dict]:
+    with _registry_lock:
+        caches = dict(_caches)
+    return {name: cache.stats() for name, cache in caches.items()}
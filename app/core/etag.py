@@ -0,0 +1,88 @@
+"""
+Conditional GET (ETag / If-None-Match) for tenant-scoped lists.
+
+A list's version is a cheap aggregate over the tenant's rows, see
+`table_version()`: row count, max(updated_at) and the sum of the updated_at
+epochs. An insert or delete changes the count, and an update changes the sum,
+even when it commits with an older now() than the latest row. The ETag hashes
+that version together with the endpoint scope and the query string (cursor,
+limit, filters), so it costs one index-only aggregate per poll.
+
+Routes take `conditional: ConditionalRequest = Depends()`:
+
+    if conditional.enabled and conditional.matches(f"jobs:{admin_id}", await service.get_jobs_version(admin_id)):
+        return conditional.not_modified()
+
+    result = await service.get_all_jobs(...)
+    conditional.send_etag()
+    return ok(data=result.items, ...)
+
+On a match the route returns 304 before loading or serializing any rows.
+Otherwise the ETag goes out on the successful response only (never on a
+`fail()` envelope), and clients send it back in If-None-Match on the next
+poll. With ETAGS_ENABLED off, `enabled` is False and the version query is skipped.
+"""
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response, status
+from sqlalchemy import Select, extract, func, select
+
+from app.config import settings
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def table_version(model: Any, *where: Any) -> Select:
+    """count, max(updated_at) and sum of updated_at epochs of `model` rows matching `where`."""
+    return select(
+        func.count(),
+        func.max(model.updated_at),
+        func.sum(extract("epoch", model.updated_at)),
+    ).where(*where)
+
+
+def make_etag(scope: str, version: Any, query: str = "") -> str:
+    raw = repr((settings.version, scope, tuple(version) if version is not None else None, query))
+    return f'W/"{hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison (RFC 9110 13.1.2) of an If-None-Match header against `etag`."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+class ConditionalRequest:
+    """FastAPI dependency handling ETag / If-None-Match for one GET endpoint."""
+
+    def __init__(self, request: Request, response: Response) -> None:
+        self.request = request
+        self.response = response
+        self.etag: str | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return settings.ETAGS_ENABLED
+
+    def matches(self, scope: str, version: Any) -> bool:
+        """Compute the ETag for `version`; True when the client already has it."""
+        query = "&".join(f"{k}={v}" for k, v in sorted(self.request.query_params.multi_items()))
+        self.etag = make_etag(scope, version, query)
+        return etag_matches(self.request.headers.get("if-none-match"), self.etag)
+
+    def send_etag(self) -> None:
+        """Attach the ETag to the (successful) response."""
+        if self.etag is not None:
+            self.response.headers["ETag"] = self.etag
+            self.response.headers["Cache-Control"] = CACHE_CONTROL
+
+    def not_modified(self) -> Response:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": self.etag, "Cache-Control": CACHE_CONTROL},
+        )
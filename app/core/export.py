@@ -0,0 +1,92 @@
+"""
+Streaming CSV / NDJSON exports for accounting (revenue, workers, job history).
+
+Export routes build a select of plain labeled columns and return
+`export_response(stmt, format, "jobs")`. The select runs on a connection of
+its own, not the request session, which closes when the route returns. It
+runs with `stream_results=True`, so psycopg2 uses a named server-side cursor
+and pulls EXPORT_FETCH_SIZE rows per round trip. Each batch is encoded
+straight from the row tuples, with no ORM objects or pydantic models, and
+sent as one chunk. Memory stays flat however many rows the export has.
+
+The export holds one pooled connection until the last row is sent. Once the
+200 and the first chunk have gone out, an error can no longer be reported as
+a `fail()` envelope. It is logged, and the client gets a truncated body.
+"""
+import csv
+import io
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Iterator, Sequence
+
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+from sqlalchemy import Select
+
+from app.config import settings
+from app.core.logging import get_logger
+from app.db.session import engine
+
+logger = get_logger(__name__)
+
+
+class ExportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+MEDIA_TYPES = {
+    ExportFormat.csv: "text/csv; charset=utf-8",
+    ExportFormat.ndjson: "application/x-ndjson",
+}
+
+
+_PLAIN = (str, int, float, bool)
+
+
+def _csv_value(value: Any) -> Any:
+    if type(value) in _PLAIN:
+        return value
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return ";".join(str(_csv_value(v)) for v in value)
+    return value
+
+
+def encode_csv(rows: Sequence[Sequence[Any]]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows([_csv_value(v) for v in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+def encode_ndjson(keys: Sequence[str], rows: Sequence[Sequence[Any]]) -> bytes:
+    return b"".join(to_json(dict(zip(keys, row))) + b"\n" for row in rows)
+
+
+def stream_rows(stmt: Select, format: ExportFormat) -> Iterator[bytes]:
+    """Run `stmt` on a server-side cursor and yield it encoded, one fetch batch per chunk."""
+    try:
+        with engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=settings.EXPORT_FETCH_SIZE).execute(stmt)
+            keys = list(result.keys())
+            if format == ExportFormat.csv:
+                yield encode_csv([keys])
+            for rows in result.partitions():
+                yield encode_csv(rows) if format == ExportFormat.csv else encode_ndjson(keys, rows)
+    except Exception as e:
+        logger.error(f"Error streaming export: {str(e)}")
+        raise
+
+
+def export_response(stmt: Select, format: ExportFormat, name: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_rows(stmt, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format.value}"'},
+    )
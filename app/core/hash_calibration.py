@@ -0,0 +1,77 @@
+"""
+Password hash cost calibration.
+
+Measures hashing time on this host and picks the cost (rounds) that keeps one
+hash close to a latency budget. Run it on the production hardware and copy the
+printed settings into .env; users are rehashed transparently on their next login.
+
+    python -m app.core.hash_calibration --scheme sha512_crypt --target-ms 100
+"""
+import argparse
+import math
+import statistics
+import time
+
+from passlib.exc import MissingBackendError
+from passlib.registry import get_crypt_handler
+
+from app.core.security import PASSWORD_HASH_SCHEMES
+
+SAMPLE_PASSWORD = "calibration-Passw0rd!"
+
+
+def measure_ms(scheme: str, rounds: int, samples: int = 5) -> float:
+    """Median milliseconds to hash one password at `rounds`."""
+    handler = get_crypt_handler(scheme).using(rounds=rounds)
+    durations = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        handler.hash(SAMPLE_PASSWORD)
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+def _estimate(scheme: str, rounds: int, measured_ms: float, target_ms: float) -> int:
+    handler = get_crypt_handler(scheme)
+    if getattr(handler, "rounds_cost", "linear") == "log2":
+        # bcrypt: each extra round doubles the cost
+        estimate = rounds + round(math.log2(target_ms / measured_ms))
+    else:
+        estimate = round(rounds * target_ms / measured_ms)
+    return max(handler.min_rounds, min(handler.max_rounds, estimate))
+
+
+def calibrate(scheme: str, target_ms: float, samples: int = 5) -> tuple[int, float]:
+    """Return (rounds, measured_ms) for the largest cost that stays within `target_ms`."""
+    handler = get_crypt_handler(scheme)
+    rounds = handler.default_rounds
+    measured = measure_ms(scheme, rounds, samples)
+    # Two refinement passes absorb the fixed per-hash overhead in the linear model
+    for _ in range(2):
+        rounds = _estimate(scheme, rounds, measured, target_ms)
+        measured = measure_ms(scheme, rounds, samples)
+    while measured > target_ms and rounds > handler.min_rounds:
+        rounds = _estimate(scheme, rounds, measured, target_ms * 0.95)
+        measured = measure_ms(scheme, rounds, samples)
+    return rounds, measured
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pick a password hash cost for a latency budget on this host.")
+    parser.add_argument("--scheme", choices=PASSWORD_HASH_SCHEMES, default="sha512_crypt")
+    parser.add_argument("--target-ms", type=float, default=100.0, help="Latency budget for one hash")
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+
+    try:
+        rounds, measured = calibrate(args.scheme, args.target_ms, args.samples)
+    except (MissingBackendError, ValueError) as e:
+        # e.g. argon2 without argon2-cffi, or passlib's bcrypt self-test failing on bcrypt>=4.1
+        parser.error(f"{args.scheme} is not usable in this environment: {e}")
+    print(f"# {args.scheme}: {measured:.1f} ms per hash at rounds={rounds} (target {args.target_ms:.0f} ms)")
+    print(f"PASSWORD_HASH_SCHEME={args.scheme}")
+    print(f"PASSWORD_HASH_ROUNDS={rounds}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Durable background job queue backed by the `background_jobs` table.
+
+Services call `enqueue(db, task, payload)` inside their own transaction, so a
+job only becomes visible if the surrounding commit succeeds. Worker threads
+started from app.main claim up to JOB_QUEUE_BATCH_SIZE due jobs at a time with
+`FOR UPDATE SKIP LOCKED`, run each registered handler in the same transaction
+and delete the rows that succeeded in one commit. Batch scopes registered with
+`register_batch_scope` wrap every batch, which is how all the emails of a batch
+go out over a single SMTP session.
+Failures are retried with exponential backoff until `max_attempts`, after
+which the row is kept with status `failed` for inspection and deleted by the
+workers JOB_QUEUE_FAILED_RETENTION_DAYS later.
+
+A side effect that must only happen once the handler's writes are stored
+(emailing a freshly set password) is registered with `after_commit`; it runs
+right after the batch commits, and if it raises the job is queued again.
+
+Payloads are stored in plain JSONB and outlive failures, so they must never
+hold secrets (passwords, OTPs): enqueue a reference such as a user id and let
+the handler produce or look up the secret.
+
+A worker that dies mid-batch releases its row locks, so the whole batch is
+picked up again after a restart (delivery is at-least-once).
+"""
+import threading
+import time
+from contextlib import AbstractContextManager, ExitStack
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Callable
+
+from sqlalchemy import Column, DateTime, Enum as SQLAEnum, Index, Integer, String, delete, select, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.config import settings
+from app.core.logging import get_logger
+from app.db.base import Base, BaseModel
+from app.db.session import SessionLocal
+
+logger = get_logger(__name__)
+
+
+class BackgroundJobStatus(str, Enum):
+    queued = "queued"
+    failed = "failed"
+
+
+class BackgroundJob(Base, BaseModel):
+    __tablename__ = "background_jobs"
+    __table_args__ = (
+        Index("ix_background_jobs_queued_run_at", "run_at", postgresql_where=text("status = 'queued'")),
+    )
+
+    task = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict)
+    status = Column(SQLAEnum(BackgroundJobStatus), nullable=False, default=BackgroundJobStatus.queued)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error = Column(String, nullable=True)
+
+
+TaskHandler = Callable[[Session, dict[str, Any]], None]
+
+_handlers: dict[str, TaskHandler] = {}
+_batch_scopes: list[Callable[[], AbstractContextManager]] = []
+
+
+def register_task(name: str) -> Callable[[TaskHandler], TaskHandler]:
+    """
+    Register a handler `(db, payload) -> None` for jobs enqueued under `name`.
+    Handlers must not commit: their writes are committed together with the job's removal.
+    """
+    def decorator(fn: TaskHandler) -> TaskHandler:
+        _handlers[name] = fn
+        return fn
+    return decorator
+
+
+def register_batch_scope(factory: Callable[[], AbstractContextManager]) -> None:
+    """Register a context manager factory entered around every batch of jobs (e.g. one SMTP session)."""
+    _batch_scopes.append(factory)
+
+
+_AFTER_COMMIT = "job_queue.after_commit"
+
+
+def after_commit(db: Session, fn: Callable[[], None]) -> None:
+    """
+    Run `fn` after the current job's writes are committed instead of inside the transaction.
+    If it raises, the job is queued again with backoff (its writes stay committed).
+    """
+    db.info[_AFTER_COMMIT].append(fn)
+
+
+def enqueue(
+    db: Session,
+    task: str,
+    payload: dict[str, Any],
+    delay_seconds: float = 0,
+    max_attempts: int | None = None,
+) -> BackgroundJob:
+    """Add a job to the caller's session; it is committed with the caller's transaction."""
+    job = BackgroundJob(
+        task=task,
+        payload=payload,
+        status=BackgroundJobStatus.queued,
+        attempts=0,
+        max_attempts=max_attempts or settings.JOB_QUEUE_MAX_ATTEMPTS,
+    )
+    if delay_seconds:
+        job.run_at = datetime.now(timezone.utc) + timedelta(seconds=delay_seconds)
+    db.add(job)
+    return job
+
+
+def _backoff_seconds(attempts: int) -> float:
+    return min(settings.JOB_QUEUE_BACKOFF_SECONDS * (2 ** attempts), settings.JOB_QUEUE_MAX_BACKOFF_SECONDS)
+
+
+def _run_job(db: Session, job: BackgroundJob) -> list[Callable[[], None]]:
+    """Run one claimed job; returns its after_commit callbacks (none when it failed)."""
+    db.info[_AFTER_COMMIT] = callbacks = []
+    try:
+        handler = _handlers.get(job.task)
+        if handler is None:
+            raise LookupError(f"No handler registered for task '{job.task}'")
+        # Savepoint: a failing handler is rolled back while we keep the row lock
+        with db.begin_nested():
+            handler(db, dict(job.payload or {}))
+    except Exception as e:
+        _record_failure(job, e)
+        return []
+    finally:
+        del db.info[_AFTER_COMMIT]
+    db.delete(job)
+    return callbacks
+
+
+def _record_failure(job: BackgroundJob, error: Exception, job_id: int | None = None) -> None:
+    logger.error(f"Background job {job_id or job.id} ({job.task}) failed on attempt {job.attempts + 1}: {str(error)}")
+    job.run_at = datetime.now(timezone.utc) + timedelta(seconds=_backoff_seconds(job.attempts))
+    job.attempts += 1
+    if job.attempts >= job.max_attempts:
+        job.status = BackgroundJobStatus.failed
+    job.last_error = str(error)[:2000]
+
+
+def process_batch(db: Session, limit: int | None = None) -> int:
+    """Claim up to `limit` (JOB_QUEUE_BATCH_SIZE) due jobs, run them and commit once. Returns how many were claimed."""
+    jobs = db.scalars(
+        select(BackgroundJob)
+        .where(BackgroundJob.status == BackgroundJobStatus.queued, BackgroundJob.run_at <= func.now())
+        .order_by(BackgroundJob.run_at)
+        .limit(limit or settings.JOB_QUEUE_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not jobs:
+        db.rollback()
+        return 0
+
+    with ExitStack() as scopes:
+        for scope in _batch_scopes:
+            scopes.enter_context(scope())
+        pending = []
+        for job in jobs:
+            callbacks = _run_job(db, job)
+            if callbacks:
+                # The row is deleted by the commit, so keep what a retry needs
+                retry = BackgroundJob(
+                    task=job.task, payload=job.payload, status=BackgroundJobStatus.queued,
+                    attempts=job.attempts, max_attempts=job.max_attempts,
+                )
+                pending.append((job.id, retry, callbacks))
+        db.commit()
+        failed = False
+        for job_id, retry, callbacks in pending:
+            try:
+                for fn in callbacks:
+                    fn()
+            except Exception as e:
+                _record_failure(retry, e, job_id)
+                db.add(retry)
+                failed = True
+        if failed:
+            db.commit()
+    return len(jobs)
+
+
+def process_next(db: Session) -> bool:
+    """Claim and run one due job. Returns False when nothing was ready."""
+    return process_batch(db, limit=1) > 0
+
+
+def purge_failed_jobs(db: Session) -> int:
+    """Delete failed jobs older than JOB_QUEUE_FAILED_RETENTION_DAYS; returns how many were removed."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.JOB_QUEUE_FAILED_RETENTION_DAYS)
+    result = db.execute(
+        delete(BackgroundJob).where(BackgroundJob.status == BackgroundJobStatus.failed, BackgroundJob.updated_at < cutoff)
+    )
+    db.commit()
+    return result.rowcount
+
+
+PURGE_INTERVAL_SECONDS = 3600
+
+
+class JobWorkerPool:
+    """In-process worker threads polling the queue; started and stopped by the app lifespan."""
+
+    def __init__(self, session_factory: Callable[[], Session], workers: int, poll_interval: float) -> None:
+        self.session_factory = session_factory
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._next_purge = 0.0
+
+    def start(self) -> None:
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Started {self.workers} background job workers")
+
+    def stop(self, timeout: float = 10) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with self.session_factory() as db:
+                    # Drain everything that is due before sleeping again
+                    while not self._stop.is_set() and process_batch(db):
+                        pass
+                    if time.monotonic() >= self._next_purge:
+                        self._next_purge = time.monotonic() + PURGE_INTERVAL_SECONDS
+                        purge_failed_jobs(db)
+            except Exception as e:
+                logger.error(f"Background job worker error: {str(e)}")
+            self._stop.wait(self.poll_interval)
+
+
+_pool: JobWorkerPool | None = None
+
+
+def start_workers() -> None:
+    global _pool
+    if settings.JOB_QUEUE_WORKERS <= 0 or _pool is not None:
+        return
+    _pool = JobWorkerPool(SessionLocal, settings.JOB_QUEUE_WORKERS, settings.JOB_QUEUE_POLL_INTERVAL)
+    _pool.start()
+
+
+def workers_alive() -> int:
+    """Background job worker threads currently running (for /metrics)."""
+    return sum(thread.is_alive() for thread in _pool._threads) if _pool is not None else 0
+
+
+def stop_workers() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.stop()
+        _pool = None
@@ -0,0 +1,139 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Lists are ordered newest first on (created_at, id). The cursor is an opaque
+URL-safe token holding the (created_at, id) of the last row of the previous
+page, so the next page is a `WHERE (created_at, id) < (:created_at, :id)`
+range scan instead of an OFFSET that re-reads every skipped row. created_at
+is NOT NULL on every table: a NULL would never compare below a cursor.
+
+Routes take `page: PageParams = Depends(page_params)`, services apply it with
+`keyset()` and split the over-fetched rows with `split_page()`; the cursor
+goes back to the client as APIResponse.next_cursor (null on the last page).
+
+Relevance-ranked lists (search) page the same way on (rank, id) instead:
+`RankedPageParams` / `ranked_page_params`, `ranked_keyset()` and
+`split_ranked_page()`.
+"""
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Generic, TypeVar
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import REAL, Select, cast, tuple_
+
+from app.config import settings
+
+T = TypeVar("T")
+
+
+def _encode(values: list) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> list:
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    return json.loads(raw)
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    return _encode([created_at.isoformat(), id])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of encode_cursor(); raises ValueError for anything it did not produce."""
+    try:
+        created_at, id = _decode(cursor)
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def encode_ranked_cursor(rank: float, id: int) -> str:
+    return _encode([rank, id])
+
+
+def decode_ranked_cursor(cursor: str) -> tuple[float, int]:
+    """Inverse of encode_ranked_cursor(); raises ValueError for anything it did not produce."""
+    try:
+        rank, id = _decode(cursor)
+        return float(rank), int(id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+@dataclass(frozen=True)
+class PageParams:
+    limit: int = field(default_factory=lambda: settings.PAGE_DEFAULT_LIMIT)
+    after: tuple[datetime, int] | None = None
+
+
+@dataclass(frozen=True)
+class RankedPageParams:
+    limit: int = field(default_factory=lambda: settings.PAGE_DEFAULT_LIMIT)
+    after: tuple[float, int] | None = None
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
+
+def page_params(
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
+    limit: int = Query(default=settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+) -> PageParams:
+    """FastAPI dependency for `?cursor=&limit=`."""
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return PageParams(limit=limit, after=after)
+
+
+def ranked_page_params(
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
+    limit: int = Query(default=settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+) -> RankedPageParams:
+    """FastAPI dependency for `?cursor=&limit=` on relevance-ranked lists."""
+    try:
+        after = decode_ranked_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return RankedPageParams(limit=limit, after=after)
+
+
+def keyset(stmt: Select, model: Any, page: PageParams) -> Select:
+    """Order `stmt` newest first on model.(created_at, id) and fetch one row past the page."""
+    if page.after is not None:
+        stmt = stmt.where(tuple_(model.created_at, model.id) < tuple_(*page.after))
+    return stmt.order_by(model.created_at.desc(), model.id.desc()).limit(page.limit + 1)
+
+
+def split_page(rows: list, page: PageParams, key: Callable[[Any], Any] = lambda row: row) -> tuple[list, str | None]:
+    """Trim the extra row fetched by keyset(); return (rows, next_cursor)."""
+    if len(rows) <= page.limit:
+        return list(rows), None
+    rows = list(rows[:page.limit])
+    last = key(rows[-1])
+    return rows, encode_cursor(last.created_at, last.id)
+
+
+def ranked_keyset(stmt: Select, rank: Any, id: Any, page: RankedPageParams) -> Select:
+    """Order `stmt` by (rank, id) descending and fetch one row past the page. `rank` must be a REAL expression."""
+    if page.after is not None:
+        # A float4 rank survives the JSON round trip exactly; cast back so the comparison is too
+        stmt = stmt.where(tuple_(rank, id) < tuple_(cast(page.after[0], REAL), page.after[1]))
+    return stmt.order_by(rank.desc(), id.desc()).limit(page.limit + 1)
+
+
+def split_ranked_page(rows: list, page: RankedPageParams, key: Callable[[Any], tuple[float, int]]) -> tuple[list, str | None]:
+    """Trim the extra row fetched by ranked_keyset(); `key` gives a row's (rank, id)."""
+    if len(rows) <= page.limit:
+        return list(rows), None
+    rows = list(rows[:page.limit])
+    return rows, encode_ranked_cursor(*key(rows[-1]))
@@ -1,39 +1,214 @@
 """
-In-memory store for pending business registrations (OTP + payload).
+Store for pending business registrations (OTP + payload).
 Key: business email (lowercase). Value: { otp, payload, expires_at }.
-TTL 10 minutes. For production consider Redis.
+TTL 10 minutes.
+
+The backend is chosen with PENDING_STORE_BACKEND:
+- "memory": process-local, bounded (LRU) with a periodic expiry sweep. Single worker only.
+- "postgres": UNLOGGED `pending_registrations` table, shared by every worker.
+- "redis": any Redis-protocol server at REDIS_URL, expiry handled by the server.
 """
+import json
+import threading
 import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
 from typing import Any
 
+from sqlalchemy import text
+
+from app.config import settings
+
 PENDING_TTL_SECONDS = 600  # 10 minutes
 
-_pending: dict[str, dict[str, Any]] = {}
+
+class PendingStore(ABC):
+    """Key/value store for pending registrations; keys are normalized emails."""
+
+    @abstractmethod
+    def set(self, key: str, entry: dict[str, Any], ttl: float) -> None: ...
+
+    @abstractmethod
+    def get(self, key: str) -> dict[str, Any] | None: ...
+
+    @abstractmethod
+    def pop(self, key: str) -> dict[str, Any] | None: ...
+
+
+class InMemoryPendingStore(PendingStore):
+    """Bounded LRU dict; expired entries are swept at most every `sweep_interval` seconds on write."""
+
+    def __init__(self, max_size: int = 10_000, sweep_interval: float = 60) -> None:
+        self.max_size = max_size
+        self.sweep_interval = sweep_interval
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = time.time() + sweep_interval
+
+    def _sweep(self, now: float) -> None:
+        expired = [key for key, entry in self._entries.items() if now > entry["expires_at"]]
+        for key in expired:
+            del self._entries[key]
+        self._next_sweep = now + self.sweep_interval
+
+    def set(self, key: str, entry: dict[str, Any], ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            if time.time() > entry["expires_at"]:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def pop(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if not entry or time.time() > entry["expires_at"]:
+            return None
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class PostgresPendingStore(PendingStore):
+    """
+    Rows in the UNLOGGED `pending_registrations` table (no WAL; contents are
+    lost on a crash, which is fine for 10-minute OTPs). Expired rows are
+    deleted at most every `sweep_interval` seconds on write.
+    """
+
+    def __init__(self, engine=None, sweep_interval: float = 60) -> None:
+        if engine is None:
+            from app.db.session import engine
+        self.engine = engine
+        self.sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+
+    def set(self, key: str, entry: dict[str, Any], ttl: float) -> None:
+        now = time.time()
+        with self.engine.begin() as conn:
+            if now >= self._next_sweep:
+                self._next_sweep = now + self.sweep_interval
+                conn.execute(text("DELETE FROM pending_registrations WHERE expires_at < now()"))
+            conn.execute(
+                text(
+                    "INSERT INTO pending_registrations (email, otp, payload, expires_at) "
+                    "VALUES (:email, :otp, CAST(:payload AS jsonb), to_timestamp(:expires_at)) "
+                    "ON CONFLICT (email) DO UPDATE SET otp = excluded.otp, payload = excluded.payload, "
+                    "expires_at = excluded.expires_at"
+                ),
+                {"email": key, "otp": entry["otp"], "payload": json.dumps(entry["payload"], default=str), "expires_at": entry["expires_at"]},
+            )
+
+    @staticmethod
+    def _entry(row) -> dict[str, Any] | None:
+        if row is None:
+            return None
+        return {"otp": row.otp, "payload": row.payload, "expires_at": float(row.expires_at)}
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text(
+                    "SELECT otp, payload, extract(epoch FROM expires_at) AS expires_at "
+                    "FROM pending_registrations WHERE email = :email AND expires_at > now()"
+                ),
+                {"email": key},
+            ).first()
+        return self._entry(row)
+
+    def pop(self, key: str) -> dict[str, Any] | None:
+        with self.engine.begin() as conn:
+            row = conn.execute(
+                text(
+                    "DELETE FROM pending_registrations WHERE email = :email "
+                    "RETURNING otp, payload, extract(epoch FROM expires_at) AS expires_at, expires_at > now() AS live"
+                ),
+                {"email": key},
+            ).first()
+        if row is None or not row.live:
+            return None
+        return self._entry(row)
+
+
+class RedisPendingStore(PendingStore):
+    """JSON values under `pending_registration:<email>` with a server-side TTL."""
+
+    prefix = "pending_registration:"
+
+    def __init__(self, url: str | None = None, client=None) -> None:
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("PENDING_STORE_BACKEND=redis requires the 'redis' package") from e
+            client = redis.Redis.from_url(url or settings.REDIS_URL)
+        self.client = client
+
+    def set(self, key: str, entry: dict[str, Any], ttl: float) -> None:
+        self.client.set(self.prefix + key, json.dumps(entry, default=str), ex=max(1, int(ttl)))
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw else None
+
+    def pop(self, key: str) -> dict[str, Any] | None:
+        raw = self.client.getdel(self.prefix + key)
+        return json.loads(raw) if raw else None
+
+
+_store: PendingStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_pending_store() -> PendingStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                backend = settings.PENDING_STORE_BACKEND.lower()
+                if backend == "memory":
+                    _store = InMemoryPendingStore(max_size=settings.PENDING_STORE_MAX_SIZE)
+                elif backend == "postgres":
+                    _store = PostgresPendingStore()
+                elif backend == "redis":
+                    _store = RedisPendingStore()
+                else:
+                    raise ValueError(f"Unknown PENDING_STORE_BACKEND: {settings.PENDING_STORE_BACKEND}")
+    return _store
 
 
 def set_pending(email: str, otp: str, payload: dict[str, Any]) -> None:
     key = email.strip().lower()
-    _pending[key] = {
-        "otp": otp,
-        "payload": payload,
-        "expires_at": time.time() + PENDING_TTL_SECONDS,
-    }
+    get_pending_store().set(
+        key,
+        {
+            "otp": otp,
+            "payload": payload,
+            "expires_at": time.time() + PENDING_TTL_SECONDS,
+        },
+        PENDING_TTL_SECONDS,
+    )
 
 
 def get_pending(email: str) -> dict[str, Any] | None:
     key = email.strip().lower()
-    entry = _pending.get(key)
-    if not entry:
-        return None
-    if time.time() > entry["expires_at"]:
-        del _pending[key]
-        return None
-    return entry
+    return get_pending_store().get(key)
 
 
 def pop_pending(email: str) -> dict[str, Any] | None:
     key = email.strip().lower()
-    entry = _pending.pop(key, None)
-    if not entry or time.time() > entry["expires_at"]:
-        return None
-    return entry
+    return get_pending_store().pop(key)
@@ -0,0 +1,186 @@
+"""
+User photo pipeline: content-addressed storage with thumbnails rendered off the API process.
+
+An upload is the raw image as the request body (`read_photo` dependency),
+capped at PHOTO_MAX_BYTES and hashed with SHA-256 while it streams in.
+The digest names the stored objects, `photos/{sha256}/{variant}.webp`:
+- `full`: longest side PHOTO_MAX_DIMENSION.
+- One square crop per PHOTO_SIZES edge.
+Every variant is EXIF-rotated and re-encoded as WebP, which also drops the
+phone's EXIF/GPS metadata.
+
+Decoding and resizing a phone photo costs tens to hundreds of ms of CPU.
+It runs on a dedicated ProcessPoolExecutor (PHOTO_WORKERS), so it never
+holds the API process's GIL. Callers block on the result from a threadpool
+route, like the password hashing executor in app.core.security.
+UserService.set_photo skips rendering when another user already has the
+same digest.
+
+Only keys are stored (users.photo_variants). URLs are resolved when users
+are serialized. Lists resolve them all in one batch first, which matters
+for signed URLs; see `url_resolver` in app.core.storage.
+
+Pillow is optional (`pip install .[images]`); without it uploads fail with
+RuntimeError and everything else works.
+"""
+import hashlib
+import importlib.util
+import io
+import math
+import multiprocessing
+import threading
+import time
+import warnings
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Request, status
+
+from app.config import settings
+from app.core.metrics import PHOTO_RENDER_SECONDS, PHOTO_RENDERS_IN_FLIGHT
+from app.core.storage import get_storage, url_resolver
+
+CONTENT_TYPE = "image/webp"
+FULL = "full"
+
+
+@dataclass(frozen=True)
+class PhotoUpload:
+    data: bytes
+    digest: str  # sha256 hex of `data`
+
+
+async def read_photo(request: Request) -> PhotoUpload:
+    """Dependency: the request body as a photo, rejected with 413 past PHOTO_MAX_BYTES before it is all read."""
+    limit = settings.PHOTO_MAX_BYTES
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > limit:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=f"Photo exceeds {limit} bytes")
+    body = bytearray()
+    digest = hashlib.sha256()
+    async for chunk in request.stream():
+        body += chunk
+        digest.update(chunk)
+        if len(body) > limit:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=f"Photo exceeds {limit} bytes")
+    if not body:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty photo")
+    return PhotoUpload(bytes(body), digest.hexdigest())
+
+
+def photo_key(digest: str, variant: str) -> str:
+    return f"photos/{digest}/{variant}.webp"
+
+
+def variant_url(variants: dict | None, variant: str) -> str | None:
+    """URL of one stored variant, through the URL cache (filled in bulk by prefetch_photo_urls)."""
+    key = (variants or {}).get(variant)
+    return url_resolver().resolve_one(key) if key else None
+
+
+def _list_keys(users) -> list[str]:
+    variants = (FULL, str(settings.PHOTO_LIST_SIZE))
+    return [user.photo_variants[v] for user in users if user.photo_variants for v in variants if v in user.photo_variants]
+
+
+def prefetch_photo_urls(users) -> None:
+    """Resolve the photo URLs of a page of User rows in one batch before they are serialized."""
+    url_resolver().resolve(_list_keys(users))
+
+
+async def aprefetch_photo_urls(users) -> None:
+    await url_resolver().aresolve(_list_keys(users))
+
+
+# ---------- Rendering (runs in the photo workers) ----------
+
+def _encode(image, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, "WEBP", quality=quality)
+    return buffer.getvalue()
+
+
+def render_variants(data: bytes, sizes: tuple[int, ...], max_dimension: int, quality: int, max_pixels: int) -> dict[str, bytes]:
+    """Encoded WebP bytes per variant name; raises ValueError for anything that is not a usable image."""
+    from PIL import Image, ImageOps
+
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", Image.DecompressionBombWarning)
+            with Image.open(io.BytesIO(data)) as source:
+                # JPEG: decode at 1/2..1/8 scale straight away when that still covers the full variant
+                ratio = max_dimension / max(source.size)
+                if ratio < 1:
+                    source.draft("RGB", (math.ceil(source.width * ratio), math.ceil(source.height * ratio)))
+                image = ImageOps.exif_transpose(source)
+                image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+    except (Image.DecompressionBombError, Image.DecompressionBombWarning):
+        raise ValueError(f"Image exceeds {max_pixels} pixels") from None
+    except Exception:
+        raise ValueError("Unsupported or corrupt image") from None
+
+    image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+    variants = {FULL: _encode(image, quality)}
+    # Largest square first, then each smaller one from the previous square
+    square = image
+    for size in sorted(sizes, reverse=True):
+        square = ImageOps.fit(square, (size, size), Image.Resampling.LANCZOS)
+        variants[str(size)] = _encode(square, quality)
+    return variants
+
+
+# ---------- Photo executor ----------
+
+_photo_executor: Executor | None = None
+_photo_executor_lock = threading.Lock()
+
+
+def _get_photo_executor() -> Executor:
+    global _photo_executor
+    if _photo_executor is None:
+        with _photo_executor_lock:
+            if _photo_executor is None:
+                if importlib.util.find_spec("PIL") is None:
+                    raise RuntimeError("Photo uploads require the 'pillow' package (pip install .[images])")
+                # spawn: forking a process that already runs threads is unsafe
+                _photo_executor = ProcessPoolExecutor(
+                    max_workers=settings.PHOTO_WORKERS, mp_context=multiprocessing.get_context("spawn")
+                )
+    return _photo_executor
+
+
+def shutdown_photos() -> None:
+    global _photo_executor
+    if _photo_executor is not None:
+        _photo_executor.shutdown(wait=False, cancel_futures=True)
+        _photo_executor = None
+
+
+def render_photo(data: bytes) -> dict[str, bytes]:
+    """Render every variant on the photo executor (blocks the calling thread until done)."""
+    PHOTO_RENDERS_IN_FLIGHT.inc()
+    started = time.perf_counter()
+    try:
+        return _get_photo_executor().submit(
+            render_variants,
+            data,
+            tuple(settings.PHOTO_SIZES),
+            settings.PHOTO_MAX_DIMENSION,
+            settings.PHOTO_QUALITY,
+            settings.PHOTO_MAX_PIXELS,
+        ).result()
+    finally:
+        PHOTO_RENDERS_IN_FLIGHT.dec()
+        PHOTO_RENDER_SECONDS.observe(time.perf_counter() - started)
+
+
+def store_photo(upload: PhotoUpload) -> dict[str, str]:
+    """Render and store every variant of `upload`; returns {variant: storage key}."""
+    storage = get_storage()
+    keys = {}
+    for variant, blob in render_photo(upload.data).items():
+        key = photo_key(upload.digest, variant)
+        storage.upload_stream(key, [blob], len(blob), CONTENT_TYPE)
+        keys[variant] = key
+    return keys
@@ -0,0 +1,159 @@
+"""
+Per-request SQL instrumentation and N+1 detection.
+
+`before_cursor_execute` / `after_cursor_execute` listeners on every Engine
+(the sync engine and the async engine's sync core alike) record into the
+QueryStats bound to the current context: number of statements, total time
+spent in the driver and how often each statement *shape* ran. A shape is the
+SQL with bind parameters and literals collapsed, so twenty lazy loads of
+`SELECT ... FROM jobs WHERE jobs.id = ?` show up as one shape run twenty times.
+
+QueryCounterMiddleware opens a QueryStats per HTTP request. In debug mode it
+adds X-DB-Query-Count, X-DB-Query-Time-Ms and X-DB-Duplicate-Queries headers,
+and it logs a warning when one shape repeats QUERY_DUPLICATE_WARN_THRESHOLD
+times or more in a request. Tests use `observe_requests()` (see the
+`query_budget` fixture in tests/conftest.py) to assert query budgets.
+"""
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+    label: str = ""
+
+    @property
+    def duplicates(self) -> int:
+        """Statements that repeated an earlier shape in the same scope."""
+        return sum(n - 1 for n in self.shapes.values() if n > 1)
+
+    def repeated(self, threshold: int = 2) -> list[tuple[str, int]]:
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def report(self) -> str:
+        lines = [f"{self.label or 'scope'}: {self.count} queries, {self.seconds * 1000:.1f} ms"]
+        lines += [f"  {n}x {shape}" for shape, n in self.shapes.most_common()]
+        return "\n".join(lines)
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+_PARAM = re.compile(r"%\(\w+\)s|\$\d+|%s")
+_NUMBER = re.compile(r"\b\d+\b")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    shape = _PARAM.sub("?", statement)
+    shape = _NUMBER.sub("?", shape)
+    shape = _LIST.sub("(?...)", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_counter_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_counter_start")
+    if starts:
+        stats.seconds += time.perf_counter() - starts.pop()
+    stats.count += 1
+    stats.shapes[statement_shape(statement)] += 1
+
+
+@contextmanager
+def track_queries(label: str = "") -> Iterator[QueryStats]:
+    """Count statements executed in this context (and threads/tasks spawned from it) until exit."""
+    stats = QueryStats(label=label)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+_observers: list[Callable[[QueryStats], None]] = []
+_observers_lock = threading.Lock()
+
+
+@contextmanager
+def observe_requests() -> Iterator[list[QueryStats]]:
+    """Collect the QueryStats of every HTTP request that finishes while the block runs."""
+    collected: list[QueryStats] = []
+    with _observers_lock:
+        _observers.append(collected.append)
+    try:
+        yield collected
+    finally:
+        with _observers_lock:
+            _observers.remove(collected.append)
+
+
+class QueryCounterMiddleware:
+    """Pure ASGI middleware (keeps the request's context, unlike BaseHTTPMiddleware)."""
+
+    def __init__(self, app, headers: bool = False, warn_threshold: int = 5) -> None:
+        self.app = app
+        self.headers = headers
+        self.warn_threshold = warn_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries(f"{scope['method']} {scope['path']}") as stats:
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start" and self.headers:
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [
+                        (b"x-db-query-count", str(stats.count).encode()),
+                        (b"x-db-query-time-ms", f"{stats.seconds * 1000:.2f}".encode()),
+                        (b"x-db-duplicate-queries", str(stats.duplicates).encode()),
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                for shape, n in stats.repeated(self.warn_threshold):
+                    logger.warning(f"Possible N+1 in {stats.label}: {n}x {shape[:200]}")
+                with _observers_lock:
+                    observers = list(_observers)
+                for observer in observers:
+                    observer(stats)
+
+
+def install_query_counter(app) -> None:
+    """Add the middleware when QUERY_COUNTER_ENABLED; response headers only in debug mode."""
+    if settings.QUERY_COUNTER_ENABLED:
+        app.add_middleware(
+            QueryCounterMiddleware,
+            headers=settings.debug,
+            warn_threshold=settings.QUERY_DUPLICATE_WARN_THRESHOLD,
+        )
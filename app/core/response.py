@@ -1,5 +1,12 @@
-from typing import Any, Generic, TypeVar
-from pydantic import BaseModel, Field
+import inspect
+from functools import lru_cache, wraps
+from typing import Any, Callable, Generic, TypeVar
+from fastapi import Response
+from fastapi.dependencies.utils import get_dependant, get_parameterless_sub_dependant
+from fastapi.routing import APIRoute, get_request_handler
+from pydantic import BaseModel, Field, TypeAdapter
+from pydantic_core import PydanticSerializationError
+from app.config import settings
 
 
 T = TypeVar("T")
@@ -10,13 +17,122 @@ class APIResponse(BaseModel, Generic[T]):
     message: str = Field(default="")
     data: T | None = Field(default=None)
     errors: Any | None = Field(default=None)
+    next_cursor: str | None = Field(default=None)
 
 
-def ok(data: Any = None, message: str = "") -> APIResponse[Any]:
-    return APIResponse(success=True, message=message, data=data)
+def ok(data: Any = None, message: str = "", next_cursor: str | None = None) -> APIResponse[Any]:
+    return APIResponse(success=True, message=message, data=data, next_cursor=next_cursor)
 
 
 def fail(message: str, errors: Any | None = None) -> APIResponse[Any]:
     return APIResponse(success=False, message=message, errors=errors)
 
 
+@lru_cache(maxsize=None)
+def response_adapter(response_model: Any) -> TypeAdapter:
+    """One TypeAdapter (compiled pydantic-core serializer) per response type."""
+    return TypeAdapter(response_model)
+
+
+def render_envelope(response_model: Any, result: APIResponse) -> bytes | None:
+    """
+    Serialize an `ok()` / `fail()` envelope straight to JSON bytes as `response_model`.
+
+    Serializing against the declared type drops fields that are not part of it, like
+    FastAPI's response filtering. Returns None when the payload does not match the
+    declared type (ORM objects, dicts, ...), so the caller can fall back to the
+    validating FastAPI path.
+    """
+    envelope = response_model.model_construct(_fields_set=result.model_fields_set, **result.__dict__)
+    try:
+        return response_adapter(response_model).dump_json(envelope, by_alias=True, warnings="error")
+    except PydanticSerializationError:
+        return None
+
+
+_SUB_RESPONSE = "fast_json_sub_response"
+
+
+class EnvelopeJSONResponse(Response):
+    media_type = "application/json"
+
+
+class FastJSONRoute(APIRoute):
+    """
+    Route class that serializes `APIResponse` envelopes once, with pydantic-core.
+
+    FastAPI's default path dumps the returned model to a dict, validates it again
+    against `response_model` and serializes the result, on top of the services'
+    own `model_validate`. Here an endpoint's `APIResponse` is rendered directly
+    with the response type's cached TypeAdapter; `response_model` still documents
+    the endpoint in OpenAPI. Anything else the endpoint returns, and envelopes
+    that do not match their declared type, take the normal path.
+    """
+
+    def get_route_handler(self) -> Callable:
+        model = self.response_model
+        if (
+            not settings.FAST_JSON_RESPONSES
+            or not (isinstance(model, type) and issubclass(model, APIResponse))
+            or self.response_model_include or self.response_model_exclude
+            or self.response_model_exclude_unset or self.response_model_exclude_defaults or self.response_model_exclude_none
+        ):
+            return super().get_route_handler()
+
+        call = self.dependant.call
+        status_code = self.status_code or 200
+        # FastAPI injects a single Response per endpoint, so reuse the endpoint's own if it takes one
+        response_param = self.dependant.response_param_name
+
+        # Headers / status set on the injected Response (by the endpoint or its dependencies)
+        # are applied to the rendered response as well, so the endpoint also takes it.
+        def render(result: Any, sub_response: Response) -> Any:
+            if isinstance(result, APIResponse):
+                body = render_envelope(model, result)
+                if body is not None:
+                    response = EnvelopeJSONResponse(body, status_code=sub_response.status_code or status_code)
+                    response.headers.raw.extend(sub_response.headers.raw)
+                    return response
+            return result
+
+        def sub_response(values: dict[str, Any]) -> Response:
+            return values[response_param] if response_param else values.pop(_SUB_RESPONSE)
+
+        if inspect.iscoroutinefunction(call):
+            @wraps(call)
+            async def endpoint(**values: Any) -> Any:
+                response = sub_response(values)
+                return render(await call(**values), response)
+        else:
+            @wraps(call)
+            def endpoint(**values: Any) -> Any:
+                response = sub_response(values)
+                return render(call(**values), response)
+
+        signature = inspect.signature(call)
+        if not response_param:
+            signature = signature.replace(parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(_SUB_RESPONSE, inspect.Parameter.KEYWORD_ONLY, annotation=Response),
+            ])
+        endpoint.__signature__ = signature
+        dependant = get_dependant(path=self.path_format, call=endpoint, scope="function")
+        for depends in self.dependencies[::-1]:
+            dependant.dependencies.insert(0, get_parameterless_sub_dependant(depends=depends, path=self.path_format))
+
+        return get_request_handler(
+            dependant=dependant,
+            body_field=self.body_field,
+            status_code=self.status_code,
+            response_class=self.response_class,
+            response_field=self.secure_cloned_response_field,
+            response_model_include=self.response_model_include,
+            response_model_exclude=self.response_model_exclude,
+            response_model_by_alias=self.response_model_by_alias,
+            response_model_exclude_unset=self.response_model_exclude_unset,
+            response_model_exclude_defaults=self.response_model_exclude_defaults,
+            response_model_exclude_none=self.response_model_exclude_none,
+            dependency_overrides_provider=self.dependency_overrides_provider,
+            embed_body_fields=self._embed_body_fields,
+        )
+
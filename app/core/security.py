@@ -1,19 +1,46 @@
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Union
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional, Union
+import asyncio
+import multiprocessing
 import secrets
+import threading
+import time
 import jwt
 from jwt.exceptions import InvalidTokenError, ExpiredSignatureError
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from app.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import HASH_QUEUE_BUCKETS, Histogram
 
 logger = get_logger(__name__)
 
 # Password hashing
-context = CryptContext(
-    schemes=["sha512_crypt"]
-)
+# Supported schemes; existing sha512_crypt hashes always stay verifiable.
+PASSWORD_HASH_SCHEMES = ("argon2", "bcrypt", "sha512_crypt")
+
+
+def build_crypt_context(scheme: str, rounds: int | None = None) -> CryptContext:
+    """
+    CryptContext hashing with `scheme`. Other schemes are deprecated, and when
+    `rounds` is set any hash with a different cost needs an update, so
+    login_user can rehash transparently after the cost or scheme changes.
+    """
+    if scheme not in PASSWORD_HASH_SCHEMES:
+        raise ValueError(f"Unsupported password hash scheme: {scheme}")
+    schemes = [scheme] if scheme == "sha512_crypt" else [scheme, "sha512_crypt"]
+    options = {}
+    if rounds:
+        options = {
+            f"{scheme}__default_rounds": rounds,
+            f"{scheme}__min_rounds": rounds,
+            f"{scheme}__max_rounds": rounds,
+        }
+    return CryptContext(schemes=schemes, default=scheme, deprecated="auto", **options)
+
+
+context = build_crypt_context(settings.PASSWORD_HASH_SCHEME, settings.PASSWORD_HASH_ROUNDS)
 
 def generate_random_password(length: int) -> str:
     return secrets.token_urlsafe(length) # password like NuO5pUBw1J_-tfWTjB2e
@@ -21,14 +48,164 @@ def generate_random_password(length: int) -> str:
 def generate_random_otp(length: int) -> str:
     return str(secrets.randbelow(10**length)) # otp like 123456 (length = 6)
 
+# ---------- Password hashing executor ----------
+# Hash/verify cost tens of ms of CPU each. They run on a dedicated, size-capped
+# executor (processes by default, so they never hold the API process's GIL).
+# Callers block on (or await) the result; excess work waits in the executor queue.
+
+_hash_executor: Executor | None = None
+_hash_executor_lock = threading.Lock()
+
+
+class HashingStats:
+    """Queue-time and throughput counters for the hashing executor (exported at /metrics)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.in_flight = 0
+        self.queue_seconds_total = 0.0
+        self.queue_seconds_max = 0.0
+        self.queue_time = Histogram(
+            "password_hash_queue_seconds", "Time a hash / verify call waited for a hashing worker", buckets=HASH_QUEUE_BUCKETS,
+        )
+
+    def submitted(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, queue_seconds: float) -> None:
+        queue_seconds = max(0.0, queue_seconds)
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+            self.queue_seconds_total += queue_seconds
+            self.queue_seconds_max = max(self.queue_seconds_max, queue_seconds)
+        self.queue_time.observe(queue_seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "completed": self.completed,
+                "in_flight": self.in_flight,
+                "queue_seconds_avg": self.queue_seconds_total / self.completed if self.completed else 0.0,
+                "queue_seconds_max": self.queue_seconds_max,
+            }
+
+
+hashing_stats = HashingStats()
+
+
+def _get_hash_executor() -> Executor:
+    global _hash_executor
+    if _hash_executor is None:
+        with _hash_executor_lock:
+            if _hash_executor is None:
+                workers = settings.PASSWORD_HASH_WORKERS
+                if settings.PASSWORD_HASH_EXECUTOR == "thread":
+                    _hash_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+                else:
+                    # spawn: forking a process that already runs threads is unsafe
+                    _hash_executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _hash_executor
+
+
+def shutdown_hashing() -> None:
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+
+# Executed in the hashing workers; return the start time so the caller can compute queue time
+def _verify_in_worker(plain_password: str, hashed_password: str) -> tuple[float, bool]:
+    return time.time(), context.verify(plain_password, hashed_password)
+
+
+def _hash_in_worker(password: str) -> tuple[float, str]:
+    return time.time(), context.hash(password)
+
+
+def _submit(fn, *args) -> tuple[Future, float]:
+    hashing_stats.submitted()
+    return _get_hash_executor().submit(fn, *args), time.time()
+
+
+def _unwrap(outcome: tuple[float, object], submitted_at: float):
+    started_at, result = outcome
+    hashing_stats.finished(started_at - submitted_at)
+    return result
+
+
+def _run(fn, *args):
+    future, submitted_at = _submit(fn, *args)
+    try:
+        outcome = future.result()
+    except Exception:
+        hashing_stats.finished(0.0)
+        raise
+    return _unwrap(outcome, submitted_at)
+
+
+async def _run_async(fn, *args):
+    future, submitted_at = _submit(fn, *args)
+    try:
+        outcome = await asyncio.wrap_future(future)
+    except Exception:
+        hashing_stats.finished(0.0)
+        raise
+    return _unwrap(outcome, submitted_at)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
-    return context.verify(plain_password, hashed_password)
+    """Verify a password against its hash (runs on the hashing executor)."""
+    return _run(_verify_in_worker, plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password."""
-    return context.hash(password)
+    """Hash a password (runs on the hashing executor)."""
+    return _run(_hash_in_worker, password)
+
+
+def password_needs_update(hashed_password: str) -> bool:
+    """True if the hash uses a deprecated scheme or a cost other than the configured one."""
+    return context.needs_update(hashed_password)
+
+
+def rehash_password_in_background(password: str, on_done: Callable[[str], None]) -> None:
+    """
+    Hash on the hashing executor and hand the new hash to `on_done` without waiting for it.
+    `on_done` runs on a thread of its own: done-callbacks of a ProcessPoolExecutor run on its
+    management thread, and a blocking write there would stall every in-flight hash / verify.
+    """
+    future, submitted_at = _submit(_hash_in_worker, password)
+
+    def _store(new_hash: str) -> None:
+        try:
+            on_done(new_hash)
+        except Exception as e:
+            logger.error(f"Storing rehashed password failed: {str(e)}")
+
+    def _done(f: Future) -> None:
+        try:
+            new_hash = _unwrap(f.result(), submitted_at)
+        except Exception as e:
+            hashing_stats.finished(0.0)
+            logger.error(f"Background password rehash failed: {str(e)}")
+            return
+        threading.Thread(target=_store, args=(new_hash,), name="password-rehash-store", daemon=True).start()
+
+    future.add_done_callback(_done)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password without blocking the event loop."""
+    return await _run_async(_verify_in_worker, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password without blocking the event loop."""
+    return await _run_async(_hash_in_worker, password)
 
 
 def create_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -106,6 +283,9 @@ export_functions = {
     "generate_random_otp": generate_random_otp,
     "verify_password": verify_password,
     "get_password_hash": get_password_hash,
+    "password_needs_update": password_needs_update,
+    "verify_password_async": verify_password_async,
+    "get_password_hash_async": get_password_hash_async,
     "create_token": create_token,
     "verify_token": verify_token,
 }
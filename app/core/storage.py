@@ -0,0 +1,302 @@
+"""
+File storage behind one interface, with streaming, chunked I/O throughout.
+
+`get_storage()` returns the STORAGE_BACKEND singleton:
+- local: files under STORAGE_LOCAL_ROOT, served by GET /api/v1/files/{name}.
+  For tests and on-prem installs.
+- supabase: Supabase Storage over its REST API. See app.db.supabase.
+
+Uploads take an iterable of chunks (`upload_stream`) or a path
+(`upload_file`). Downloads yield chunks (`open_stream`) or write to a path
+(`download_file`). No file is ever held in memory whole: the most a backend
+buffers is one chunk, either STORAGE_CHUNK_SIZE or the 6 MiB Supabase
+resumable-upload part. Both upload methods accept
+`progress(bytes_done, total_or_None)`.
+
+`url_resolver()` turns many file names into URLs at once, for list
+responses. It caches them for STORAGE_URL_CACHE_TTL, capped at half the
+lifetime of signed URLs. ETags over bodies that contain URLs include
+`epoch`, which changes every TTL. A URL a client revalidates is then at
+most two TTLs, one lifetime, old. Misses go to the backend's
+`get_file_urls`, which signs a whole batch in one request on Supabase.
+
+`file_response(name)` is what routes return:
+- The local backend returns a FileResponse with Range support. It uses
+  `http.response.pathsend`, which is sendfile done by the server, when the
+  ASGI server offers it (Granian, Hypercorn). Otherwise it reads the file
+  in 64 KiB chunks.
+- Supabase returns a StreamingResponse that proxies the object body. For
+  a private bucket (SUPABASE_SIGNED_URLS) it raises FileNotFoundError, so
+  GET /files is a 404 and objects are only reachable through signed URLs.
+"""
+import asyncio
+import mimetypes
+import os
+import shutil
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator
+
+from fastapi import Response
+from fastapi.responses import FileResponse
+
+from app.config import settings
+from app.core.entity_cache import LocalTier
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+Progress = Callable[[int, int | None], None]
+
+
+def guess_content_type(file_name: str) -> str:
+    return mimetypes.guess_type(file_name)[0] or "application/octet-stream"
+
+
+def read_chunks(f: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    while chunk := f.read(chunk_size):
+        yield chunk
+
+
+def rechunk(chunks: Iterable[bytes], size: int) -> Iterator[bytes]:
+    """Regroup `chunks` into blocks of exactly `size` bytes (the last one may be shorter)."""
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= size:
+            yield bytes(buffer[:size])
+            del buffer[:size]
+    if buffer:
+        yield bytes(buffer)
+
+
+class StorageBackend(ABC):
+    """Streaming file storage; see the module docstring."""
+
+    chunk_size: int = settings.STORAGE_CHUNK_SIZE
+    url_expires: float | None = None  # lifetime of get_file_url results; None when they never expire
+
+    @abstractmethod
+    def upload_stream(
+        self,
+        file_name: str,
+        chunks: Iterable[bytes],
+        size: int | None = None,
+        content_type: str | None = None,
+        progress: Progress | None = None,
+    ) -> str:
+        """Store `chunks` as `file_name` (replacing it) and return its URL."""
+
+    @abstractmethod
+    def open_stream(self, file_name: str) -> Iterator[bytes]:
+        """Yield the stored bytes chunk by chunk; raises FileNotFoundError."""
+
+    @abstractmethod
+    def delete_file(self, file_name: str) -> None:
+        ...
+
+    @abstractmethod
+    def get_file_url(self, file_name: str) -> str:
+        ...
+
+    def get_file_urls(self, file_names: list[str]) -> dict[str, str]:
+        """URLs for many files; backends with a batch API override this. Missing files may be left out."""
+        return {file_name: self.get_file_url(file_name) for file_name in file_names}
+
+    @abstractmethod
+    def file_response(self, file_name: str) -> Response:
+        """Response serving the file; raises FileNotFoundError."""
+
+    def upload_file(self, file_path: str, file_name: str, content_type: str | None = None, progress: Progress | None = None) -> str:
+        """Upload a local file chunk by chunk and return its URL."""
+        size = os.path.getsize(file_path)
+        with open(file_path, "rb") as f:
+            return self.upload_stream(file_name, read_chunks(f, self.chunk_size), size, content_type or guess_content_type(file_name), progress)
+
+    def download_file(self, file_name: str, destination: str) -> None:
+        """Write the file to `destination` chunk by chunk; the destination only appears once complete."""
+        tmp = _temp_path(destination)
+        try:
+            with open(tmp, "wb") as f:
+                for chunk in self.open_stream(file_name):
+                    f.write(chunk)
+            os.replace(tmp, destination)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+
+def _temp_path(destination: str | Path) -> str:
+    directory = os.path.dirname(os.path.abspath(destination))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".upload-")
+    os.close(fd)
+    return tmp
+
+
+class LocalStorage(StorageBackend):
+    """Files under `root`; copies between paths go through shutil.copyfile (sendfile on Linux)."""
+
+    def __init__(self, root: str | None = None, chunk_size: int | None = None) -> None:
+        self.root = Path(root or settings.STORAGE_LOCAL_ROOT).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size or settings.STORAGE_CHUNK_SIZE
+
+    def path(self, file_name: str) -> Path:
+        path = (self.root / file_name.lstrip("/")).resolve()
+        if path == self.root or not path.is_relative_to(self.root):
+            raise ValueError(f"Invalid file name: {file_name}")
+        return path
+
+    def upload_stream(self, file_name, chunks, size=None, content_type=None, progress=None) -> str:
+        path = self.path(file_name)
+        tmp = _temp_path(path)
+        try:
+            done = 0
+            with open(tmp, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    done += len(chunk)
+                    if progress:
+                        progress(done, size)
+            os.replace(tmp, path)
+            return self.get_file_url(file_name)
+        except BaseException as e:
+            Path(tmp).unlink(missing_ok=True)
+            logger.error(f"Failed to upload file {file_name}: {str(e)}")
+            raise
+
+    def upload_file(self, file_path, file_name, content_type=None, progress=None) -> str:
+        if progress is not None:
+            return super().upload_file(file_path, file_name, content_type, progress)
+        path = self.path(file_name)
+        tmp = _temp_path(path)
+        try:
+            shutil.copyfile(file_path, tmp)
+            os.replace(tmp, path)
+            return self.get_file_url(file_name)
+        except BaseException as e:
+            Path(tmp).unlink(missing_ok=True)
+            logger.error(f"Failed to upload file {file_name}: {str(e)}")
+            raise
+
+    def open_stream(self, file_name: str) -> Iterator[bytes]:
+        f = open(self.path(file_name), "rb")  # FileNotFoundError before the first chunk is requested
+
+        def chunks() -> Iterator[bytes]:
+            with f:
+                yield from read_chunks(f, self.chunk_size)
+
+        return chunks()
+
+    def download_file(self, file_name: str, destination: str) -> None:
+        tmp = _temp_path(destination)
+        try:
+            shutil.copyfile(self.path(file_name), tmp)
+            os.replace(tmp, destination)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def delete_file(self, file_name: str) -> None:
+        self.path(file_name).unlink(missing_ok=True)
+
+    def get_file_url(self, file_name: str) -> str:
+        return f"{settings.api_v1_str}/files/{file_name.lstrip('/')}"
+
+    def file_response(self, file_name: str) -> Response:
+        path = self.path(file_name)
+        stat_result = os.stat(path)  # FileNotFoundError -> 404 in the route
+        return FileResponse(path, media_type=guess_content_type(file_name), stat_result=stat_result)
+
+
+class UrlResolver:
+    """Batch file name -> URL lookups through an LRU with expiry; see the module docstring."""
+
+    def __init__(self, backend: StorageBackend, max_size: int | None = None, ttl: float | None = None) -> None:
+        ttl = settings.STORAGE_URL_CACHE_TTL if ttl is None else ttl
+        if backend.url_expires is not None:
+            ttl = min(ttl, backend.url_expires / 2)
+        self.backend = backend
+        self.cache = LocalTier(settings.STORAGE_URL_CACHE_SIZE if max_size is None else max_size, ttl)
+        self.fetches = 0
+
+    @property
+    def epoch(self) -> int:
+        """Changes every cache TTL when URLs expire, so ETags over bodies holding URLs change with them."""
+        if self.backend.url_expires is None:
+            return 0
+        return int(time.time() // self.cache.ttl)
+
+    def _cached(self, file_names: Iterable[str]) -> tuple[dict[str, str], list[str]]:
+        urls, missing = {}, []
+        for file_name in set(file_names):
+            url = self.cache.get(file_name)
+            if url is None:
+                missing.append(file_name)
+            elif url:
+                urls[file_name] = url
+        return urls, missing
+
+    def _fetch(self, file_names: list[str]) -> dict[str, str]:
+        # Names are never invalidated; the generation only guards against a concurrent clear()
+        generations = {file_name: self.cache.generation(file_name) for file_name in file_names}
+        self.fetches += 1
+        urls = self.backend.get_file_urls(file_names)
+        for file_name in file_names:
+            # "" remembers a missing file, so rows referencing it don't each ask again
+            self.cache.put(file_name, urls.get(file_name, ""), generations[file_name])
+        return urls
+
+    def resolve(self, file_names: Iterable[str]) -> dict[str, str]:
+        """URL per file name; all cache misses are fetched with one backend call."""
+        urls, missing = self._cached(file_names)
+        if missing:
+            urls |= self._fetch(missing)
+        return urls
+
+    async def aresolve(self, file_names: Iterable[str]) -> dict[str, str]:
+        """resolve() that fetches misses off the event loop."""
+        urls, missing = self._cached(file_names)
+        if missing:
+            urls |= await asyncio.to_thread(self._fetch, missing)
+        return urls
+
+    def resolve_one(self, file_name: str) -> str | None:
+        return self.resolve((file_name,)).get(file_name)
+
+
+_storage: StorageBackend | None = None
+_storage_lock = threading.Lock()
+_url_resolver: UrlResolver | None = None
+
+
+def get_storage() -> StorageBackend:
+    """The process-wide backend selected by STORAGE_BACKEND, created on first use."""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            backend = settings.STORAGE_BACKEND.lower()
+            if backend == "local":
+                _storage = LocalStorage()
+            elif backend == "supabase":
+                from app.db.supabase import SupabaseStorage
+
+                _storage = SupabaseStorage()
+            else:
+                raise ValueError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}")
+        return _storage
+
+
+def url_resolver() -> UrlResolver:
+    """The process-wide URL cache in front of get_storage()."""
+    global _url_resolver
+    if _url_resolver is None:
+        backend = get_storage()
+        with _storage_lock:
+            if _url_resolver is None:
+                _url_resolver = UrlResolver(backend)
+    return _url_resolver
@@ -3,8 +3,11 @@ Optimized database session management for local Docker PostgreSQL.
 """
 from app.config import settings
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.logging import get_logger
+from app.core.metrics import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
 
 logger = get_logger(__name__)
 
@@ -13,6 +16,7 @@ try:
     logger.info(f"Creating database engine for local PostgreSQL: {settings.DATABASE_URL}")
     engine = create_engine(
         settings.DATABASE_URL,
+        poolclass=InstrumentedQueuePool,  # checkout wait / timeout metrics (app.core.metrics)
         # Optimized for local Docker PostgreSQL
         pool_size=5,            # Smaller pool for local development
         max_overflow=10,        # Reasonable overflow
@@ -43,6 +47,45 @@ except Exception as e:
     raise
 
 
+def _async_database_url() -> str:
+    """Async driver URL: ASYNC_DATABASE_URL if set, else DATABASE_URL rewritten for asyncpg."""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    return make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+# Async engine for `async def` routes; same pool sizing as the sync engine
+try:
+    async_engine = create_async_engine(
+        _async_database_url(),
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=5,
+        max_overflow=10,
+        pool_timeout=10,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        connect_args={
+            "timeout": 5,
+            "server_settings": {"application_name": "whenwework_backend_async"},
+            # Supabase pooler (pgbouncer, transaction mode) cannot keep prepared statements
+            "statement_cache_size": 0,
+        },
+        echo=False,
+    )
+
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+    logger.info("Async database engine created successfully")
+except Exception as e:
+    logger.error(f"Failed to create async database engine: {str(e)}")
+    raise
+
+
 def get_db():
     """Production database session with connection reuse."""
     db = SessionLocal()
@@ -53,4 +96,15 @@ def get_db():
         logger.error(f"Database session error: {str(e)}")
         raise
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    """Async database session for `async def` routes."""
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Async database session error: {str(e)}")
+            raise
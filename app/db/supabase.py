@@ -1,80 +1,197 @@
-from supabase import create_client, Client
+"""
+Supabase Storage backend (STORAGE_BACKEND=supabase), spoken over the Storage REST API with httpx.
+
+The supabase-py storage client reads every download fully into memory
+(`storage.download()` returns bytes). So this backend makes the HTTP calls
+itself, and streams in both directions:
+- Files larger than one part go up through the resumable (TUS) endpoint
+  in 6 MiB parts, which Supabase requires. Smaller ones go up as a single
+  POST.
+- Downloads and `file_response` stream the object body chunk by chunk.
+
+For a private bucket (SUPABASE_SIGNED_URLS), URLs are signed. A batch
+passed to `get_file_urls` is signed in one request per SIGN_BATCH_SIZE
+names.
+"""
+import base64
+from typing import Iterable, Iterator
+from urllib.parse import quote
+
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from app.config import settings
 from app.core.logging import get_logger
+from app.core.storage import StorageBackend, guess_content_type, rechunk
 
 logger = get_logger(__name__)
 
-from app.core.config import settings
+TUS_PART_SIZE = 6 * 1024 * 1024
+TUS_VERSION = "1.0.0"
+SIGN_BATCH_SIZE = 1000
+
 
-class SupabaseClient:
+def _tus_metadata(**values: str) -> str:
+    return ",".join(f"{key} {base64.b64encode(value.encode()).decode()}" for key, value in values.items())
+
+
+class SupabaseStorage(StorageBackend):
     def __init__(
         self,
-        url: str = settings.SUPABASE_URL,
-        key: str = settings.SUPABASE_KEY,
-        storage_bucket: str = "default",
-    ):
-        try:
-            self.client: Client = create_client(url, key)
-            self.storage = self.client.storage.from_(storage_bucket)
-        except Exception as e:
-            logger.error(f"Failed to initialize Supabase client: {str(e)}")
-            raise ConnectionError(f"Failed to connect to Supabase: {str(e)}")
-
-    def upload_file(self, file_path: str, file_name: str) -> str:
-        """Upload a file to Supabase storage.
-        
-        Args:
-            file_path: Path to the file to upload
-            file_name: Name to store the file as
-            
-        Returns:
-            Public URL of the uploaded file
-        """
+        url: str | None = None,
+        key: str | None = None,
+        storage_bucket: str | None = None,
+        client=None,
+    ) -> None:
+        url = url or settings.SUPABASE_URL
+        key = key or settings.SUPABASE_KEY
+        if client is None:
+            try:
+                import httpx
+            except ImportError as e:
+                raise RuntimeError("STORAGE_BACKEND=supabase requires the 'httpx' package") from e
+            if not url or not key:
+                raise ConnectionError("SUPABASE_URL and SUPABASE_KEY must be set for STORAGE_BACKEND=supabase")
+            client = httpx.Client(timeout=httpx.Timeout(settings.STORAGE_TIMEOUT, connect=10))
+        self.client = client
+        self.base_url = f"{url.rstrip('/')}/storage/v1"
+        self.bucket = storage_bucket or settings.SUPABASE_STORAGE_BUCKET
+        self.headers = {"Authorization": f"Bearer {key}", "apikey": key}
+        self.signed = settings.SUPABASE_SIGNED_URLS
+        self.url_expires = settings.SUPABASE_SIGNED_URL_EXPIRES if self.signed else None
+
+    def _object_url(self, file_name: str) -> str:
+        return f"{self.base_url}/object/{self.bucket}/{quote(file_name.lstrip('/'))}"
+
+    def upload_stream(self, file_name, chunks, size=None, content_type=None, progress=None) -> str:
+        content_type = content_type or guess_content_type(file_name)
         try:
-            with open(file_path, 'rb') as f:
-                self.storage.upload(file_name, f)
-            return self.storage.get_public_url(file_name)
+            if size is None or size > TUS_PART_SIZE:
+                self._upload_resumable(file_name, chunks, size, content_type, progress)
+            else:
+                body = b"".join(chunks)
+                response = self.client.post(
+                    self._object_url(file_name),
+                    content=body,
+                    headers=self.headers | {"Content-Type": content_type, "x-upsert": "true"},
+                )
+                response.raise_for_status()
+                if progress:
+                    progress(len(body), size)
+            return self.get_file_url(file_name)
         except Exception as e:
             logger.error(f"Failed to upload file {file_name}: {str(e)}")
             raise RuntimeError(f"Failed to upload file: {str(e)}")
 
-    def download_file(self, file_name: str, destination: str) -> None:
-        """Download a file from Supabase storage.
-        
-        Args:
-            file_name: Name of file to download
-            destination: Path where to save the downloaded file
-        """
-        try:
-            with open(destination, 'wb') as f:
-                data = self.storage.download(file_name)
-                f.write(data)
-        except Exception as e:
-            logger.error(f"Failed to download file {file_name}: {str(e)}")
-            raise RuntimeError(f"Failed to download file: {str(e)}")
+    def _upload_resumable(self, file_name: str, chunks: Iterable[bytes], size: int | None, content_type: str, progress) -> None:
+        headers = self.headers | {"Tus-Resumable": TUS_VERSION, "x-upsert": "true"}
+        create = headers | {
+            "Upload-Metadata": _tus_metadata(
+                bucketName=self.bucket, objectName=file_name.lstrip("/"), contentType=content_type, cacheControl="3600"
+            ),
+        }
+        # Unknown size: declare it with the last part (Upload-Defer-Length)
+        create |= {"Upload-Length": str(size)} if size is not None else {"Upload-Defer-Length": "1"}
+        response = self.client.post(f"{self.base_url}/upload/resumable", headers=create)
+        response.raise_for_status()
+        location = response.headers["Location"]
+
+        offset = 0
+        parts = rechunk(chunks, TUS_PART_SIZE)
+        part = next(parts, b"")
+        while True:
+            following = next(parts, None)
+            patch = headers | {
+                "Upload-Offset": str(offset),
+                "Content-Type": "application/offset+octet-stream",
+                "Content-Length": str(len(part)),
+            }
+            if following is None and size is None:
+                patch["Upload-Length"] = str(offset + len(part))
+            # A one-shot iterator, not bytes: httpx keeps each response (and its request body)
+            # alive in a reference cycle until the next GC, which would pile up sent parts
+            response = self.client.patch(location, content=iter((part,)), headers=patch)
+            response.raise_for_status()
+            offset = int(response.headers.get("Upload-Offset", offset + len(part)))
+            if progress:
+                progress(offset, size)
+            if following is None:
+                return
+            part = following
+
+    def _open(self, file_name: str):
+        request = self.client.build_request("GET", self._object_url(file_name), headers=self.headers)
+        response = self.client.send(request, stream=True)
+        if response.status_code in (400, 404):
+            response.close()
+            raise FileNotFoundError(file_name)
+        if response.is_error:
+            response.close()
+            response.raise_for_status()
+        return response
+
+    def open_stream(self, file_name: str) -> Iterator[bytes]:
+        response = self._open(file_name)
+
+        def chunks() -> Iterator[bytes]:
+            try:
+                yield from response.iter_bytes(self.chunk_size)
+            finally:
+                response.close()
+
+        return chunks()
 
     def delete_file(self, file_name: str) -> None:
-        """Delete a file from Supabase storage.
-        
-        Args:
-            file_name: Name of file to delete
-        """
         try:
-            self.storage.remove([file_name])
+            response = self.client.request(
+                "DELETE", f"{self.base_url}/object/{self.bucket}", json={"prefixes": [file_name.lstrip("/")]}, headers=self.headers
+            )
+            response.raise_for_status()
         except Exception as e:
             logger.error(f"Failed to delete file {file_name}: {str(e)}")
             raise RuntimeError(f"Failed to delete file: {str(e)}")
 
     def get_file_url(self, file_name: str) -> str:
-        """Get public URL for a file.
-        
-        Args:
-            file_name: Name of the file
-            
-        Returns:
-            Public URL of the file
-        """
+        if self.signed:
+            url = self.get_file_urls([file_name]).get(file_name)
+            if url is None:
+                raise FileNotFoundError(file_name)
+            return url
+        return f"{self.base_url}/object/public/{self.bucket}/{quote(file_name.lstrip('/'))}"
+
+    def get_file_urls(self, file_names: list[str]) -> dict[str, str]:
+        if not self.signed:
+            return super().get_file_urls(file_names)
+        urls = {}
         try:
-            return self.storage.get_public_url(file_name)
+            for start in range(0, len(file_names), SIGN_BATCH_SIZE):
+                batch = file_names[start:start + SIGN_BATCH_SIZE]
+                by_path = {file_name.lstrip("/"): file_name for file_name in batch}
+                response = self.client.post(
+                    f"{self.base_url}/object/sign/{self.bucket}",
+                    json={"expiresIn": self.url_expires, "paths": list(by_path)},
+                    headers=self.headers,
+                )
+                response.raise_for_status()
+                # Missing objects come back with an error and no signedURL
+                for item in response.json():
+                    if item.get("signedURL") and item.get("path") in by_path:
+                        urls[by_path[item["path"]]] = f"{self.base_url}{item['signedURL']}"
+            return urls
         except Exception as e:
-            logger.error(f"Failed to get URL for file {file_name}: {str(e)}")
-            raise RuntimeError(f"Failed to get file URL: {str(e)}")
+            logger.error(f"Failed to sign {len(file_names)} file URLs: {str(e)}")
+            raise RuntimeError(f"Failed to sign file URLs: {str(e)}")
+
+    def file_response(self, file_name: str) -> Response:
+        # A private bucket is only readable through signed URLs; proxying with the service key would bypass them
+        if self.signed:
+            raise FileNotFoundError(file_name)
+        response = self._open(file_name)
+        headers = {k: response.headers[k] for k in ("content-length", "etag", "last-modified") if k in response.headers}
+        return StreamingResponse(
+            response.iter_bytes(self.chunk_size),
+            media_type=response.headers.get("content-type", guess_content_type(file_name)),
+            headers=headers,
+            background=BackgroundTask(response.close),
+        )
@@ -4,15 +4,18 @@ import os
 
 # Import models to ensure metadata is populated where this package is imported
 from .user.modal import User  # noqa: F401
-from .jobs.model import Job  # noqa: F401
+from .jobs.model import Job, JobStatsSummary  # noqa: F401
 from .job_application.model import JobApplication  # noqa: F401
 from .business.model import Business  # noqa: F401
+from app.core.job_queue import BackgroundJob  # noqa: F401
 
 
 __all__ = [
     "Base",
     "User",
     "Job",
+    "JobStatsSummary",
     "JobApplication",
     "Business",
+    "BackgroundJob",
 ]
\ No newline at end of file
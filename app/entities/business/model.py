@@ -1,12 +1,16 @@
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, Integer, String, Enum as SQLAEnum, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Enum as SQLAEnum, Boolean, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import relationship
 from app.db.base import Base, BaseModel
 
 class Business(Base, BaseModel):
     __tablename__ = "business"
+    __table_args__ = (
+        Index("ix_business_email", "email"),
+        Index("ix_business_created_at_id", "created_at", "id"),
+    )
     
     business_name = Column(String, nullable=False)
     email = Column(String, nullable=False)
@@ -1,15 +1,36 @@
 from fastapi import HTTPException, status
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.entities.business.schema import BusinessCreate, BusinessRead, BusinessUpdate
 from app.entities.business.model import Business
+from app.core.entity_cache import entity_cache
 from app.core.logging import get_logger
+from app.core.pagination import Page, PageParams, keyset, split_page
 from app.core.security import generate_random_otp
 from app.core.email import EmailService
-from app.core.pending_registration import set_pending, pop_pending
+from app.core.job_queue import enqueue, register_task
+from app.core.pending_registration import get_pending, set_pending, pop_pending
 
 logger = get_logger(__name__)
 
+business_cache = entity_cache("business", BusinessRead)
+
+SEND_REGISTRATION_OTP_TASK = "send_registration_otp"
+
+
+# Background task: email the pending registration's OTP (queued by reference, the OTP never enters background_jobs)
+@register_task(SEND_REGISTRATION_OTP_TASK)
+def send_registration_otp(db: Session, payload: dict) -> None:
+    entry = get_pending(payload["email"])
+    if entry is not None:
+        EmailService().send_email(
+            payload["email"],
+            "Your OTP for WhenWeWork Business Registration",
+            f"Your verification code is: {entry['otp']}. It expires in 10 minutes.",
+        )
+
 
 class BusinessService:
     def __init__(self, db: Session) -> None:
@@ -24,13 +45,9 @@ class BusinessService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="A business with this email is already registered.",
             )
-        otp = generate_random_otp(6)
-        self.email_service.send_email(
-            payload.email,
-            "Your OTP for WhenWeWork Business Registration",
-            f"Your verification code is: {otp}. It expires in 10 minutes.",
-        )
-        set_pending(email, otp, payload.model_dump())
+        set_pending(email, generate_random_otp(6), payload.model_dump())
+        enqueue(self.db, SEND_REGISTRATION_OTP_TASK, {"email": email})
+        self.db.commit()
 
     # Verify OTP and only then create the business.
     def verify_and_register(self, email: str, otp: str) -> BusinessRead:
@@ -65,23 +82,24 @@ class BusinessService:
         except Exception as e:
             logger.error(f"Error creating a business: {str(e)}")
             
-    # Get a business by business_id
+    # Get a business by business_id (through the entity cache)
     def get_business_by_id(self, business_id: int) -> BusinessRead:
         try:
-            business = self.db.query(Business).filter(Business.id == business_id).first()
-            if business: 
-                return BusinessRead.model_validate(business)
-            return None
+            return business_cache.get_or_load(business_id, lambda: self._load_business(business_id))
         except Exception as e:
             logger.error(f"Error getting a business: {str(e)}")
 
+    def _load_business(self, business_id: int) -> BusinessRead | None:
+        business = self.db.query(Business).filter(Business.id == business_id).first()
+        return BusinessRead.model_validate(business) if business else None
+
     # Get all businesses
-    def get_all_businesses(self) -> list[BusinessRead]:
+    def get_all_businesses(self, page: PageParams | None = None) -> Page[BusinessRead]:
         try:
-            all_businesses = self.db.query(Business).all()
-            if all_businesses: 
-                return [BusinessRead.model_validate(business) for business in all_businesses]
-            return []
+            page = page or PageParams()
+            rows = self.db.scalars(keyset(select(Business), Business, page)).all()
+            rows, next_cursor = split_page(rows, page)
+            return Page([BusinessRead.model_validate(business) for business in rows], next_cursor)
         except Exception as e:
             logger.error(f"Error getting businesses: {str(e)}")
     
@@ -93,6 +111,7 @@ class BusinessService:
                 for key, value in payload.model_dump().items():
                     setattr(business, key, value)
                 self.db.commit()
+                business_cache.invalidate(business_id)
                 self.db.refresh(business)
                 return BusinessRead.model_validate(business)
             return None
@@ -107,7 +126,37 @@ class BusinessService:
             if business: 
                 self.db.delete(business)
                 self.db.commit()
+                business_cache.invalidate(business_id)
                 return True
             return False
         except Exception as e:
-            logger.error(f"Error deleting a business: {str(e)}")
\ No newline at end of file
+            logger.error(f"Error deleting a business: {str(e)}")
+
+
+# Async read-side variant of BusinessService for `async def` routes
+class AsyncBusinessService:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    # Get a business by business_id (through the entity cache)
+    async def get_business_by_id(self, business_id: int) -> BusinessRead:
+        try:
+            return await business_cache.aget_or_load(business_id, lambda: self._load_business(business_id))
+        except Exception as e:
+            logger.error(f"Error getting a business: {str(e)}")
+            raise
+
+    async def _load_business(self, business_id: int) -> BusinessRead | None:
+        business = await self.db.scalar(select(Business).where(Business.id == business_id))
+        return BusinessRead.model_validate(business) if business else None
+
+    # Get all businesses
+    async def get_all_businesses(self, page: PageParams | None = None) -> Page[BusinessRead]:
+        try:
+            page = page or PageParams()
+            rows = (await self.db.scalars(keyset(select(Business), Business, page))).all()
+            rows, next_cursor = split_page(rows, page)
+            return Page([BusinessRead.model_validate(business) for business in rows], next_cursor)
+        except Exception as e:
+            logger.error(f"Error getting businesses: {str(e)}")
+            raise
@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, Integer, String, Enum as SQLAEnum, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Enum as SQLAEnum, Boolean, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import relationship
 from app.db.base import Base, BaseModel
@@ -23,7 +23,11 @@ class PaymentStatus(str, Enum):
 
 class JobApplication(Base, BaseModel):
     __tablename__ = "job_applications"
-    __table_args__ = (UniqueConstraint('job_id', 'worker_id', name='uix_job_application_job_id_worker_id'),)
+    __table_args__ = (
+        UniqueConstraint('job_id', 'worker_id', name='uix_job_application_job_id_worker_id'),
+        Index('ix_job_applications_worker_id', 'worker_id'),
+        Index('ix_job_applications_job_id_payment_status', 'job_id', 'payment_status'),
+    )
     
     job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
     worker_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 from app.entities.job_application.model import JobApplicationStatus, WorkStatus, PaymentStatus
 from app.entities.user.schema import Gender, EmploymentType
 from app.entities.jobs.schema import JobBase, JobRead
@@ -61,3 +61,67 @@ class PaymentUpdate(BaseModel):
     worker_id: int
     payment_status: PaymentStatus
     model_config = ConfigDict(use_enum_values=True) 
+
+class ApprovalDecision(BaseModel):
+    id: int  # job application id
+    approved_status: JobApplicationStatus
+    model_config = ConfigDict(use_enum_values=True)
+
+    @field_validator("approved_status")
+    @classmethod
+    def _decided(cls, value: JobApplicationStatus) -> JobApplicationStatus:
+        if value == JobApplicationStatus.applied:
+            raise ValueError("approved_status must be 'approved' or 'rejected'")
+        return value
+
+class BulkApprovalRequest(BaseModel):
+    decisions: list[ApprovalDecision] = Field(min_length=1)
+
+class ApprovalOutcome(BaseModel):
+    id: int
+    job_id: int | None = None
+    # approved | rejected | capacity_exceeded (job already full) | not_pending (unknown, not yours or already decided)
+    outcome: str
+
+class BulkApprovalResult(BaseModel):
+    approved: int
+    rejected: int
+    capacity_exceeded: int
+    not_pending: int
+    outcomes: list[ApprovalOutcome]
+
+class PaymentPair(BaseModel):
+    job_id: int
+    worker_id: int
+
+class BulkPaymentUpdate(BaseModel):
+    """Either explicit `pairs`, or a filter over the admin's still-pending payments (`job_id` and/or `before`)."""
+    payment_status: PaymentStatus
+    pairs: list[PaymentPair] | None = None
+    job_id: int | None = None  # all pending for this job
+    before: datetime | None = None  # all pending for jobs that ended before this time
+    model_config = ConfigDict(use_enum_values=True)
+
+    @model_validator(mode="after")
+    def _one_selector(self) -> "BulkPaymentUpdate":
+        has_filter = self.job_id is not None or self.before is not None
+        if (self.pairs is not None) == has_filter:
+            raise ValueError("Provide either 'pairs' or a filter ('job_id' / 'before'), not both")
+        if self.pairs is not None and not self.pairs:
+            raise ValueError("'pairs' must not be empty")
+        return self
+
+class PaymentOutcome(BaseModel):
+    job_id: int
+    worker_id: int
+    id: int | None = None  # job application id
+    previous_status: PaymentStatus | None = None
+    # updated | unchanged (already had the status) | not_found (no such application on your jobs)
+    outcome: str
+    model_config = ConfigDict(use_enum_values=True)
+
+class BulkPaymentResult(BaseModel):
+    updated: int
+    unchanged: int
+    not_found: int
+    outcomes: list[PaymentOutcome]
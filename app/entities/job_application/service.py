@@ -1,11 +1,73 @@
+from collections import Counter
+from sqlalchemy import Select, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
-from app.entities.job_application.schema import JobApplicationCreate, JobApplicationRead, JobApplicationUpdate, JobApproval, JobApplicationWorkerStatus, Revenue, PendingRevenue, PaymentUpdate
+from app.entities.jobs.schema import JobRead
+from app.entities.job_application.schema import JobApplicationCreate, JobApplicationRead, JobApplicationUpdate, JobApproval, JobApplicationWorkerStatus, Revenue, PendingRevenue, PaymentUpdate, ApprovalDecision, ApprovalOutcome, BulkApprovalResult, BulkPaymentUpdate, PaymentOutcome, BulkPaymentResult
 from app.entities.job_application.model import JobApplication, JobApplicationStatus, WorkStatus, PaymentStatus
 from app.entities.jobs.model import Job
+from app.entities.jobs.service import job_cache
+from app.entities.jobs.stats import JobStatsDelta, apply_job_stats_delta
+from app.entities.user.modal import User
 from app.core.logging import get_logger
+from app.core.pagination import Page, PageParams, keyset, split_page
 
 logger = get_logger(__name__)
 
+# Raise workers_hired by n per job, only where the job still has room for all n
+_HIRE_SQL = """
+    UPDATE jobs SET workers_hired = coalesce(jobs.workers_hired, 0) + req.n, updated_at = now()
+    FROM unnest(CAST(:job_ids AS integer[]), CAST(:counts AS integer[])) AS req(job_id, n)
+    WHERE jobs.id = req.job_id AND coalesce(jobs.workers_hired, 0) + req.n <= jobs.workers_required
+    RETURNING jobs.id
+"""
+
+# Lock the targeted applications of the admin's jobs, then set their payment status in the same statement.
+# {source} optionally joins the requested (job_id, worker_id) pairs, {where} adds the filter conditions.
+_SETTLE_SQL = """
+    WITH target AS (
+        SELECT ja.id, ja.payment_status AS previous
+        FROM job_applications ja
+        JOIN jobs j ON j.id = ja.job_id
+        {source}
+        WHERE j.admin_id = :admin_id {where}
+        ORDER BY ja.id
+        FOR UPDATE OF ja
+    )
+    UPDATE job_applications ja
+    SET payment_status = CAST(:payment_status AS paymentstatus), updated_at = now()
+    FROM target
+    WHERE ja.id = target.id
+    RETURNING ja.id, ja.job_id, ja.worker_id, target.previous
+"""
+_SETTLE_PAIRS = (
+    "JOIN unnest(CAST(:job_ids AS integer[]), CAST(:worker_ids AS integer[])) AS p(job_id, worker_id) "
+    "ON p.job_id = ja.job_id AND p.worker_id = ja.worker_id"
+)
+
+
+# One page of an admin's applications awaiting payment, newest first
+def _pending_payment_query(admin_id: int, page: PageParams) -> Select:
+    stmt = (
+        select(JobApplication)
+        .join(Job, JobApplication.job_id == Job.id)
+        .where(Job.admin_id == admin_id, JobApplication.payment_status == PaymentStatus.pending)
+        .options(joinedload(JobApplication.job), joinedload(JobApplication.user))
+    )
+    return keyset(stmt, JobApplication, page)
+
+
+# One page of the admin's approval panel (applications still in `applied`), newest first
+def _approval_panel_query(admin_id: int, page: PageParams) -> Select:
+    stmt = (
+        select(JobApplication)
+        .join(User, JobApplication.worker_id == User.id)
+        .options(joinedload(JobApplication.job), joinedload(JobApplication.user))
+        .where(User.admin_id == admin_id, JobApplication.approved_status == JobApplicationStatus.applied)
+    )
+    return keyset(stmt, JobApplication, page)
+
+
 class JobApplicationService:
     def __init__(self, db: Session) -> None:
         self.db = db
@@ -34,12 +96,14 @@ class JobApplicationService:
             logger.error(f"Error getting a job application: {str(e)}")
     
     # Get all job applications
-    def get_all_job_applications(self, worker_id:int) -> list[JobApplicationRead]:
+    def get_all_job_applications(self, worker_id:int, page: PageParams | None = None) -> Page[JobApplicationRead]:
         try:
-            all_job_applications = self.db.query(JobApplication).filter(JobApplication.worker_id == worker_id).all()
-            if all_job_applications:
-                return [JobApplicationRead.model_validate(job_application) for job_application in all_job_applications]
-            return []
+            page = page or PageParams()
+            rows = self.db.scalars(
+                keyset(select(JobApplication).where(JobApplication.worker_id == worker_id), JobApplication, page)
+            ).all()
+            rows, next_cursor = split_page(rows, page)
+            return Page([JobApplicationRead.model_validate(job_application) for job_application in rows], next_cursor)
         except Exception as e:
             logger.error(f"Error getting all job applications: {str(e)}")
         
@@ -73,6 +137,7 @@ class JobApplicationService:
         try:
             job_applications = (
                 self.db.query(JobApplication)
+                .options(joinedload(JobApplication.job))
                 .filter(
                     JobApplication.worker_id == worker_id,
                     JobApplication.work_status == WorkStatus.completed
@@ -95,21 +160,13 @@ class JobApplicationService:
             logger.error(f"Error getting worker revenue: {str(e)}")
             raise
         
-    def get_pending_payment(self, admin_id: int) -> PendingRevenue:
+    def get_pending_payment(self, admin_id: int, page: PageParams | None = None) -> Page[PendingRevenue]:
         try:
+            page = page or PageParams()
             # Use join to filter by admin_id through the Job relationship
-            job_applications = (
-                self.db.query(JobApplication)
-                .join(Job, JobApplication.job_id == Job.id)
-                .filter(
-                    Job.admin_id == admin_id,
-                    JobApplication.payment_status == PaymentStatus.pending
-                )
-                .options(joinedload(JobApplication.job), joinedload(JobApplication.user))
-                .all()
-            )
-            
-            return [
+            job_applications = self.db.scalars(_pending_payment_query(admin_id, page)).all()
+            job_applications, next_cursor = split_page(job_applications, page)
+            return Page([
                 PendingRevenue(
                     job_id=ja.job_id,
                     job_name=ja.job.title,
@@ -122,11 +179,27 @@ class JobApplicationService:
                     payment_status=ja.payment_status
                 )
                 for ja in job_applications
-            ]
+            ], next_cursor)
             
         except Exception as e:
             logger.error(f"Error getting pending payment: {str(e)}")
             raise
+
+    # Columns of the admin's revenue export (app.core.export): PendingRevenue fields per application, newest first
+    @staticmethod
+    def revenue_export_query(admin_id: int, payment_status: PaymentStatus = PaymentStatus.pending) -> Select:
+        return (
+            select(
+                JobApplication.id, JobApplication.job_id, Job.title.label("job_name"), Job.salary,
+                Job.from_date_time, Job.to_date_time, JobApplication.worker_id,
+                (User.first_name + " " + User.last_name).label("worker_name"), User.email.label("worker_email"),
+                JobApplication.payment_status,
+            )
+            .join(Job, JobApplication.job_id == Job.id)
+            .join(User, JobApplication.worker_id == User.id)
+            .where(Job.admin_id == admin_id, JobApplication.payment_status == payment_status)
+            .order_by(JobApplication.id.desc())
+        )
         
     def update_payment_status(self, payload: PaymentUpdate) -> bool:
         try:
@@ -141,37 +214,179 @@ class JobApplicationService:
             logger.error(f"Error updating payment status: {str(e)}")
             raise
 
+    # Settle many payments with one UPDATE ... RETURNING: explicit (job_id, worker_id) pairs,
+    # or every pending payment of one job and/or of jobs that ended before a date
+    def settle_payments(self, admin_id: int, payload: BulkPaymentUpdate) -> BulkPaymentResult:
+        try:
+            params = {"admin_id": admin_id, "payment_status": PaymentStatus(payload.payment_status).name}
+            source, where = "", ""
+            if payload.pairs is not None:
+                pairs = list(dict.fromkeys((p.job_id, p.worker_id) for p in payload.pairs))
+                source = _SETTLE_PAIRS
+                params["job_ids"] = [job_id for job_id, _ in pairs]
+                params["worker_ids"] = [worker_id for _, worker_id in pairs]
+            else:
+                where = "AND ja.payment_status = 'pending'"
+                if payload.job_id is not None:
+                    where += " AND ja.job_id = :job_id"
+                    params["job_id"] = payload.job_id
+                if payload.before is not None:
+                    where += " AND j.to_date_time < :before"
+                    params["before"] = payload.before
+            rows = self.db.execute(text(_SETTLE_SQL.format(source=source, where=where)), params).all()
+            self.db.commit()
+
+            found = {
+                (row.job_id, row.worker_id): PaymentOutcome(
+                    id=row.id,
+                    job_id=row.job_id,
+                    worker_id=row.worker_id,
+                    previous_status=row.previous,
+                    outcome="unchanged" if row.previous == params["payment_status"] else "updated",
+                )
+                for row in rows
+            }
+            if payload.pairs is not None:
+                outcomes = [
+                    found.get(pair) or PaymentOutcome(job_id=pair[0], worker_id=pair[1], outcome="not_found")
+                    for pair in pairs
+                ]
+            else:
+                outcomes = sorted(found.values(), key=lambda o: o.id)
+            counts = Counter(o.outcome for o in outcomes)
+            return BulkPaymentResult(
+                updated=counts["updated"],
+                unchanged=counts["unchanged"],
+                not_found=counts["not_found"],
+                outcomes=outcomes,
+            )
+        except Exception as e:
+            logger.error(f"Error settling payments: {str(e)}")
+            raise
+
 # Approve Job application approval by admin
 class JobApplicationApprovalService:
     def __init__(self, db: Session) -> None:
         self.db = db
 
-    def approve_job_application(self, payload: JobApplicationRead) -> JobApplicationUpdate:
+    # Approve or reject one application; goes through the same capacity-checked path as the bulk decision
+    def approve_job_application(self, payload: JobApplicationRead, admin_id: int) -> JobApplicationUpdate | None:
         try:
-            job_application = self.db.query(JobApplication).filter(JobApplication.id == payload.id and JobApplication.worker_id == payload.worker_id).first()
-            if job_application:
-                job_application.approved_status = payload.approved_status
-                job_application.work_status = WorkStatus.assigned
-                # Initialize workers_hired to 0 if it's None
-                if job_application.job.workers_hired is None:
-                    job_application.job.workers_hired = 0
-                job_application.job.workers_hired += 1
-                self.db.commit()
-                self.db.refresh(job_application)
-                return JobApplicationUpdate.model_validate(job_application)
-            return None
+            decision = ApprovalDecision(id=payload.id, approved_status=payload.approved_status)
+            result = self.decide_job_applications(admin_id, [decision], worker_id=payload.worker_id)
+            if result.capacity_exceeded:
+                raise ValueError("Job has no open positions left")
+            if result.not_pending:
+                return None
+            job_application = self.db.get(JobApplication, payload.id, populate_existing=True)
+            return JobApplicationUpdate.model_validate(job_application, from_attributes=True)
         except Exception as e:
             logger.error(f"Error approving a job application: {str(e)}")
-            
-    def get_all_job_applications(self, admin_id: int) -> list[JobApproval]:
+            raise
+
+    # Approve / reject many applications of the admin's jobs in one transaction.
+    # Applications are locked (id order) and must still be `applied`, so two admins deciding the
+    # same application cannot both count it. Each job's workers_hired is raised with a guarded
+    # UPDATE (hired + n <= required); approvals past a job's remaining capacity stay `applied`
+    # and are reported as capacity_exceeded, in request order.
+    def decide_job_applications(self, admin_id: int, decisions: list[ApprovalDecision], worker_id: int | None = None) -> BulkApprovalResult:
         try:
-            rows = (
-                self.db.query(JobApplication)
-                .options(joinedload(JobApplication.job), joinedload(JobApplication.user))
-                .filter(JobApplication.user.has(admin_id=admin_id), JobApplication.approved_status == JobApplicationStatus.applied)
-                .all()
+            wanted: dict[int, str] = {}
+            for decision in decisions:
+                wanted.setdefault(decision.id, decision.approved_status)
+
+            stmt = (
+                select(JobApplication.id, JobApplication.job_id)
+                .join(Job, JobApplication.job_id == Job.id)
+                .where(
+                    JobApplication.id.in_(wanted),
+                    Job.admin_id == admin_id,
+                    JobApplication.approved_status == JobApplicationStatus.applied,
+                )
+                .order_by(JobApplication.id)
+                .with_for_update(of=JobApplication)
             )
-            return [
+            if worker_id is not None:
+                stmt = stmt.where(JobApplication.worker_id == worker_id)
+            pending = dict(self.db.execute(stmt).tuples().all())
+
+            # Approvals per job, in request order
+            requested: dict[int, list[int]] = {}
+            for application_id, status in wanted.items():
+                if application_id in pending and status == JobApplicationStatus.approved:
+                    requested.setdefault(pending[application_id], []).append(application_id)
+
+            granted: dict[int, list[int]] = {}
+            if requested:
+                jobs = self.db.execute(
+                    select(Job.id, Job.workers_required, Job.workers_hired)
+                    .where(Job.id.in_(requested))
+                    .order_by(Job.id)
+                    .with_for_update()
+                ).all()
+                for job_id, required, hired in jobs:
+                    room = max((required or 0) - (hired or 0), 0)
+                    if room:
+                        granted[job_id] = requested[job_id][:room]
+                if granted:
+                    updated = set(self.db.execute(
+                        text(_HIRE_SQL),
+                        {"job_ids": list(granted), "counts": [len(ids) for ids in granted.values()]},
+                    ).scalars())
+                    granted = {job_id: ids for job_id, ids in granted.items() if job_id in updated}
+
+            approved_ids = [application_id for ids in granted.values() for application_id in ids]
+            rejected_ids = [
+                application_id for application_id, status in wanted.items()
+                if application_id in pending and status == JobApplicationStatus.rejected
+            ]
+            if approved_ids:
+                self.db.execute(
+                    update(JobApplication)
+                    .where(JobApplication.id.in_(approved_ids))
+                    .values(approved_status=JobApplicationStatus.approved, work_status=WorkStatus.assigned)
+                    .execution_options(synchronize_session=False)
+                )
+                apply_job_stats_delta(self.db, admin_id, JobStatsDelta(workers_hired=len(approved_ids)))
+            if rejected_ids:
+                self.db.execute(
+                    update(JobApplication)
+                    .where(JobApplication.id.in_(rejected_ids))
+                    .values(approved_status=JobApplicationStatus.rejected)
+                    .execution_options(synchronize_session=False)
+                )
+            self.db.commit()
+            job_cache.invalidate(*granted)
+
+            approved, rejected = set(approved_ids), set(rejected_ids)
+            outcomes = []
+            for application_id in wanted:
+                if application_id in approved:
+                    outcome = "approved"
+                elif application_id in rejected:
+                    outcome = "rejected"
+                elif application_id in pending:
+                    outcome = "capacity_exceeded"
+                else:
+                    outcome = "not_pending"
+                outcomes.append(ApprovalOutcome(id=application_id, job_id=pending.get(application_id), outcome=outcome))
+            return BulkApprovalResult(
+                approved=len(approved),
+                rejected=len(rejected),
+                capacity_exceeded=sum(o.outcome == "capacity_exceeded" for o in outcomes),
+                not_pending=sum(o.outcome == "not_pending" for o in outcomes),
+                outcomes=outcomes,
+            )
+        except Exception as e:
+            logger.error(f"Error deciding job applications: {str(e)}")
+            raise
+
+    def get_all_job_applications(self, admin_id: int, page: PageParams | None = None) -> Page[JobApproval]:
+        try:
+            page = page or PageParams()
+            rows = self.db.scalars(_approval_panel_query(admin_id, page)).all()
+            rows, next_cursor = split_page(rows, page)
+            return Page([
                 JobApproval(
                     id=ja.id,
                     job_id=ja.job_id,
@@ -186,7 +401,7 @@ class JobApplicationApprovalService:
                     workers_hired=ja.job.workers_hired,
                 )
                 for ja in rows
-            ]
+            ], next_cursor)
         except Exception as e:
             logger.error(f"Error getting all job applications: {str(e)}")
             raise
@@ -200,4 +415,135 @@ class JobApplicationApprovalService:
             ) for ja in rows]
         except Exception as e:
             logger.error(f"Error getting job applications by worker id: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+
+# Async read-side variant of JobApplicationService for `async def` routes.
+# Relationships are always eager-loaded here: lazy loads are not allowed on AsyncSession.
+class AsyncJobApplicationService:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    # Get job application by id
+    async def get_job_application_by_id(self, job_application_id: int) -> JobApplicationRead:
+        try:
+            job_application = await self.db.scalar(select(JobApplication).where(JobApplication.id == job_application_id))
+            if job_application:
+                return JobApplicationRead.model_validate(job_application)
+            return None
+        except Exception as e:
+            logger.error(f"Error getting a job application: {str(e)}")
+            raise
+
+    # Get all job applications
+    async def get_all_job_applications(self, worker_id: int, page: PageParams | None = None) -> Page[JobApplicationRead]:
+        try:
+            page = page or PageParams()
+            rows = (
+                await self.db.scalars(
+                    keyset(select(JobApplication).where(JobApplication.worker_id == worker_id), JobApplication, page)
+                )
+            ).all()
+            rows, next_cursor = split_page(rows, page)
+            return Page([JobApplicationRead.model_validate(ja) for ja in rows], next_cursor)
+        except Exception as e:
+            logger.error(f"Error getting all job applications: {str(e)}")
+            raise
+
+    async def get_worker_revenue(self, worker_id: int) -> list[Revenue]:
+        try:
+            rows = (
+                await self.db.scalars(
+                    select(JobApplication)
+                    .options(joinedload(JobApplication.job))
+                    .where(
+                        JobApplication.worker_id == worker_id,
+                        JobApplication.work_status == WorkStatus.completed,
+                    )
+                )
+            ).all()
+            return [
+                Revenue(
+                    job_id=ja.job_id,
+                    job_name=ja.job.title,
+                    salary=ja.job.salary,
+                    from_date_time=ja.job.from_date_time,
+                    to_date_time=ja.job.to_date_time,
+                    payment_status=ja.payment_status
+                )
+                for ja in rows
+            ]
+        except Exception as e:
+            logger.error(f"Error getting worker revenue: {str(e)}")
+            raise
+
+    async def get_pending_payment(self, admin_id: int, page: PageParams | None = None) -> Page[PendingRevenue]:
+        try:
+            page = page or PageParams()
+            rows = (await self.db.scalars(_pending_payment_query(admin_id, page))).all()
+            rows, next_cursor = split_page(rows, page)
+            return Page([
+                PendingRevenue(
+                    job_id=ja.job_id,
+                    job_name=ja.job.title,
+                    salary=ja.job.salary,
+                    from_date_time=ja.job.from_date_time,
+                    to_date_time=ja.job.to_date_time,
+                    worker_id=ja.worker_id,
+                    worker_name=f"{ja.user.first_name} {ja.user.last_name}",
+                    worker_email=ja.user.email,
+                    payment_status=ja.payment_status
+                )
+                for ja in rows
+            ], next_cursor)
+        except Exception as e:
+            logger.error(f"Error getting pending payment: {str(e)}")
+            raise
+
+
+# Async read-side variant of JobApplicationApprovalService
+class AsyncJobApplicationApprovalService:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def get_all_job_applications(self, admin_id: int, page: PageParams | None = None) -> Page[JobApproval]:
+        try:
+            page = page or PageParams()
+            rows = (await self.db.scalars(_approval_panel_query(admin_id, page))).all()
+            rows, next_cursor = split_page(rows, page)
+            return Page([
+                JobApproval(
+                    id=ja.id,
+                    job_id=ja.job_id,
+                    job_name=ja.job.title,
+                    worker_id=ja.worker_id,
+                    worker_name=f"{ja.user.first_name} {ja.user.last_name}".strip(),
+                    worker_email=ja.user.email,
+                    availability=ja.user.availability or False,
+                    gender=ja.user.gender,
+                    employment_type=ja.user.employment_type,
+                    workers_required=ja.job.workers_required,
+                    workers_hired=ja.job.workers_hired,
+                )
+                for ja in rows
+            ], next_cursor)
+        except Exception as e:
+            logger.error(f"Error getting all job applications: {str(e)}")
+            raise
+
+    async def get_job_applications_by_worker_id(self, worker_id: int) -> list[JobApplicationWorkerStatus]:
+        try:
+            rows = (
+                await self.db.scalars(
+                    select(JobApplication)
+                    .options(joinedload(JobApplication.job))
+                    .where(JobApplication.worker_id == worker_id)
+                )
+            ).all()
+            return [JobApplicationWorkerStatus(
+                approved_status=ja.approved_status,
+                job_details=JobRead.model_validate(ja.job)
+            ) for ja in rows]
+        except Exception as e:
+            logger.error(f"Error getting job applications by worker id: {str(e)}")
+            raise
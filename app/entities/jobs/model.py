@@ -1,7 +1,7 @@
 from enum import Enum
-from sqlalchemy import Column, Integer, String, Enum as SQLAEnum, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import ARRAY
-from sqlalchemy.orm import relationship
+from sqlalchemy import DDL, Column, Computed, Integer, String, Enum as SQLAEnum, DateTime, ForeignKey, Index, event
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.db.base import Base, BaseModel
 
@@ -28,8 +28,30 @@ class SalaryType(str, Enum):
     hourly = "hourly"
     fixed = "fixed"
     
+# Full-text search (GET /jobs/search). Generated columns only accept IMMUTABLE functions and
+# array_to_string is STABLE, so characteristics go through an immutable wrapper.
+SEARCH_CONFIG = "english"
+SEARCH_ARRAY_FUNCTION = DDL(
+    "CREATE OR REPLACE FUNCTION immutable_array_to_string(text[], text) RETURNS text "
+    "LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$ SELECT array_to_string($1, $2) $$"
+)
+JOB_SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(immutable_array_to_string(characteristics, ' '), '')), 'C')"
+)
+
 class Job(Base, BaseModel):
     __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_admin_id_created_at_id", "admin_id", "created_at", "id"),
+        Index("ix_jobs_admin_id_stats", "admin_id", postgresql_include=["id", "status", "workers_required", "workers_hired"]),
+        Index("ix_jobs_admin_id_status_created_at_id", "admin_id", "status", "created_at", "id"),
+        Index("ix_jobs_admin_id_from_date_time", "admin_id", "from_date_time"),
+        Index("ix_jobs_admin_id_updated_at", "admin_id", "updated_at"),
+        Index("ix_jobs_admin_id_facets", "admin_id", postgresql_include=["status", "job_category", "salary_type", "salary"]),
+        Index("ix_jobs_search_vector", "search_vector", postgresql_using="gin"),
+    )
     
     title = Column(String, nullable=False)
     description = Column(String, nullable=False)
@@ -51,6 +73,26 @@ class Job(Base, BaseModel):
     
     admin_id = Column(Integer, ForeignKey("users.id"), nullable=False) # foreign key of user.id
 
+    # title (A) + description (B) + characteristics (C); deferred so plain job loads never fetch it
+    search_vector = deferred(Column(TSVECTOR, Computed(JOB_SEARCH_VECTOR, persisted=True)))
+
     # relationship for easy data access and retrieval
     user = relationship("User")  # backref automatically creates user.jobs
-    
\ No newline at end of file
+    
+
+event.listen(Job.__table__, "before_create", SEARCH_ARRAY_FUNCTION)
+
+
+class JobStatsSummary(Base):
+    """
+    Per-admin job totals behind GET /jobs/stats, maintained by the job services
+    (see app.entities.jobs.stats) instead of aggregating the jobs table per call.
+    """
+    __tablename__ = "job_stats"
+
+    admin_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total_jobs = Column(Integer, nullable=False, default=0)
+    active_jobs = Column(Integer, nullable=False, default=0)
+    workers_required = Column(Integer, nullable=False, default=0)
+    workers_hired = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from app.entities.jobs.model import JobCategory, JobStatus, SalaryType
 
 class JobBase(BaseModel):
@@ -30,10 +30,48 @@ class JobRead(JobBase):
 
     model_config = ConfigDict(from_attributes=True, use_enum_values=True)
     
+class JobSearchResult(JobRead):
+    """A GET /jobs/search hit. Highlights are HTML-escaped text with matches in <mark>...</mark>."""
+    rank: float
+    title_highlight: str
+    description_highlight: str
+
 class JobStats(BaseModel):
     model_config = ConfigDict(use_enum_values=True)
     
     workers_required: int
     workers_hired: int
     total_jobs: int
-    active_jobs: int
\ No newline at end of file
+    active_jobs: int
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class SalaryBucketCount(BaseModel):
+    """Jobs of one salary_type with min <= salary < max (open-ended when null)."""
+    salary_type: SalaryType
+    min: int | None
+    max: int | None
+    count: int
+
+    model_config = ConfigDict(use_enum_values=True)
+
+class JobFacets(BaseModel):
+    """Job counts per facet value for GET /jobs/facets; enum facets list every value, zeros included."""
+    total: int
+    status: list[FacetCount]
+    job_category: list[FacetCount]
+    salary_type: list[FacetCount]
+    salary: list[SalaryBucketCount]
+
+class JobFilters(BaseModel):
+    """Query filters for GET /jobs; from/to bound the shift window."""
+    status: JobStatus | None = None
+    job_category: JobCategory | None = None
+    from_date: datetime | None = None
+    to_date: datetime | None = None
+
+class JobSearchParams(JobFilters):
+    """Query for GET /jobs/search: the search text plus the GET /jobs filters."""
+    q: str = Field(min_length=1, max_length=200, description='Words, "quoted phrases", or, -excluded words')
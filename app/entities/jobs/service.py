@@ -1,13 +1,155 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
-from app.entities.jobs.schema import JobCreate, JobRead, JobStats, JobUpdate
-from app.entities.jobs.model import Job, JobStatus
+from sqlalchemy.ext.asyncio import AsyncSession
+import html
+from sqlalchemy import Select, func, insert, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import array
+from app.entities.jobs.schema import (
+    FacetCount, JobCreate, JobFacets, JobFilters, JobRead, JobSearchResult, JobStats, JobUpdate, SalaryBucketCount,
+)
+from app.entities.jobs.model import SEARCH_CONFIG, Job, JobCategory, JobStatsSummary, JobStatus, SalaryType
+from app.entities.jobs.stats import JobStatsDelta, apply_job_stats_delta, job_contribution, read_job_stats, read_job_stats_async
 from app.entities.job_application.model import WorkStatus, PaymentStatus
 from app.entities.job_application.model import JobApplication
+from app.config import settings
+from app.core.job_queue import enqueue, register_task
+from app.core.entity_cache import LocalTier, entity_cache
+from app.core.etag import table_version
+from app.core.pagination import Page, PageParams, RankedPageParams, keyset, ranked_keyset, split_page, split_ranked_page
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+COMPLETE_JOB_APPLICATIONS_TASK = "complete_job_applications"
+
+job_cache = entity_cache("job", JobRead)
+
+# GET /jobs/facets results keyed by (admin_id, jobs version, filters); a changed job changes the version,
+# so entries are never invalidated and just age out
+facet_cache = LocalTier(settings.JOB_FACETS_CACHE_SIZE, settings.JOB_FACETS_CACHE_TTL)
+
+
+# Background task: mark every application of a completed job as completed / payment pending
+@register_task(COMPLETE_JOB_APPLICATIONS_TASK)
+def complete_job_applications(db: Session, payload: dict) -> None:
+    db.query(JobApplication).filter(JobApplication.job_id == payload["job_id"]).update(
+        {JobApplication.work_status: WorkStatus.completed, JobApplication.payment_status: PaymentStatus.pending}
+    )
+
+def _apply_job_filters(stmt: Select, filters: JobFilters | None) -> Select:
+    if filters is not None:
+        if filters.status is not None:
+            stmt = stmt.where(Job.status == filters.status)
+        if filters.job_category is not None:
+            stmt = stmt.where(Job.job_category == filters.job_category)
+        if filters.from_date is not None:
+            stmt = stmt.where(Job.from_date_time >= filters.from_date)
+        if filters.to_date is not None:
+            stmt = stmt.where(Job.to_date_time <= filters.to_date)
+    return stmt
+
+
+# One page of an admin's jobs, newest first, with the optional filters applied
+def _jobs_page_query(admin_id: int, page: PageParams, filters: JobFilters | None = None) -> Select:
+    stmt = _apply_job_filters(select(Job).where(Job.admin_id == admin_id), filters)
+    return keyset(stmt, Job, page)
+
+
+# ts_headline marks matches with control characters; the text is HTML-escaped before they become <mark>
+_HEADLINE_START, _HEADLINE_STOP = "\x02", "\x03"
+_TITLE_HEADLINE = f"HighlightAll=true, StartSel={_HEADLINE_START}, StopSel={_HEADLINE_STOP}"
+_DESCRIPTION_HEADLINE = f"MaxFragments=2, MaxWords=24, MinWords=8, StartSel={_HEADLINE_START}, StopSel={_HEADLINE_STOP}"
+
+
+def _highlight(headline: str) -> str:
+    return html.escape(headline).replace(_HEADLINE_START, "<mark>").replace(_HEADLINE_STOP, "</mark>")
+
+
+# One page of an admin's jobs matching `q` (web search syntax: words, "phrases", or, -exclusions), best match first.
+# The GIN index finds the matches; ranks are computed for those only, headlines for the page only.
+def _jobs_search_query(admin_id: int, q: str, page: RankedPageParams, filters: JobFilters | None = None) -> Select:
+    config = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+    query = func.websearch_to_tsquery(config, q)
+    rank = func.ts_rank_cd(Job.search_vector, query)
+    hits = _apply_job_filters(
+        select(Job.id.label("id"), rank.label("rank")).where(Job.admin_id == admin_id, Job.search_vector.op("@@")(query)),
+        filters,
+    )
+    hits = ranked_keyset(hits, rank, Job.id, page).subquery()
+    return (
+        select(
+            Job,
+            hits.c.rank,
+            func.ts_headline(config, Job.title, query, _TITLE_HEADLINE),
+            func.ts_headline(config, Job.description, query, _DESCRIPTION_HEADLINE),
+        )
+        .join(hits, Job.id == hits.c.id)
+        .order_by(hits.c.rank.desc(), hits.c.id.desc())
+    )
+
+
+# Every facet count in one pass over the admin's (filtered) jobs:
+# GROUP BY GROUPING SETS ((status), (job_category), (salary_type), (salary_type, salary_bucket), ()).
+# Salary buckets are per salary_type so hourly and fixed amounts are never mixed.
+def _jobs_facets_query(admin_id: int, filters: JobFilters | None = None) -> Select:
+    jobs = _apply_job_filters(
+        select(
+            Job.status,
+            Job.job_category,
+            Job.salary_type,
+            func.width_bucket(Job.salary, array(settings.JOB_FACET_SALARY_BOUNDS)).label("salary_bucket"),
+        ).where(Job.admin_id == admin_id),
+        filters,
+    ).subquery("jobs")
+    columns = (jobs.c.status, jobs.c.job_category, jobs.c.salary_type, jobs.c.salary_bucket)
+    return select(*columns, func.grouping(*columns), func.count()).group_by(
+        func.grouping_sets(
+            jobs.c.status,
+            jobs.c.job_category,
+            jobs.c.salary_type,
+            tuple_(jobs.c.salary_type, jobs.c.salary_bucket),
+            tuple_(),
+        )
+    )
+
+
+# GROUPING(status, job_category, salary_type, salary_bucket) per grouping set; a set bit is a column left out
+_FACET_STATUS, _FACET_CATEGORY, _FACET_SALARY_TYPE, _FACET_SALARY, _FACET_TOTAL = 0b0111, 0b1011, 0b1101, 0b1100, 0b1111
+
+
+def _facet_counts(counts: dict, values: type) -> list[FacetCount]:
+    return [FacetCount(value=v.value, count=counts.get(v, 0)) for v in values]
+
+
+def _build_job_facets(rows) -> JobFacets:
+    bounds = settings.JOB_FACET_SALARY_BOUNDS
+    total, by_status, by_category, by_salary_type, salary = 0, {}, {}, {}, []
+    for status, category, salary_type, bucket, grouping, count in rows:
+        if grouping == _FACET_TOTAL:
+            total = count
+        elif grouping == _FACET_STATUS:
+            by_status[status] = count
+        elif grouping == _FACET_CATEGORY:
+            by_category[category] = count
+        elif grouping == _FACET_SALARY_TYPE:
+            by_salary_type[salary_type] = count
+        elif grouping == _FACET_SALARY:
+            # width_bucket: 0 below the first edge, len(bounds) at or above the last
+            salary.append(SalaryBucketCount(
+                salary_type=salary_type,
+                min=bounds[bucket - 1] if bucket > 0 else None,
+                max=bounds[bucket] if bucket < len(bounds) else None,
+                count=count,
+            ))
+    salary.sort(key=lambda b: (b.salary_type, -1 if b.min is None else b.min))
+    return JobFacets(
+        total=total,
+        status=_facet_counts(by_status, JobStatus),
+        job_category=_facet_counts(by_category, JobCategory),
+        salary_type=_facet_counts(by_salary_type, SalaryType),
+        salary=salary,
+    )
+
+
 class JobService:
     def __init__(self, db: Session) -> None:
         self.db = db
@@ -18,6 +160,7 @@ class JobService:
             data = payload.model_dump() | {"admin_id": admin_id}
             job = Job(**data)
             self.db.add(job)
+            apply_job_stats_delta(self.db, admin_id, job_contribution(job))
             self.db.commit()
             self.db.refresh(job)
             return JobRead.model_validate(job)
@@ -25,24 +168,42 @@ class JobService:
             logger.error(f"Error creating job: {str(e)}")
             raise
         
-    # Get a job by job_id
+    # Create many jobs in one transaction (multi-row INSERT ... RETURNING, rows come back in input order)
+    def create_jobs(self, payloads: list[JobCreate], admin_id: int) -> list[JobRead]:
+        try:
+            if not payloads:
+                return []
+            rows = [payload.model_dump() | {"admin_id": admin_id} for payload in payloads]
+            jobs = self.db.scalars(insert(Job).returning(Job, sort_by_parameter_order=True), rows).all()
+            delta = sum((job_contribution(job) for job in jobs), JobStatsDelta())
+            apply_job_stats_delta(self.db, admin_id, delta)
+            # Build the response before commit expires the instances (avoids a SELECT per job)
+            created = [JobRead.model_validate(job) for job in jobs]
+            self.db.commit()
+            return created
+        except Exception as e:
+            logger.error(f"Error creating jobs in batch: {str(e)}")
+            raise
+
+    # Get a job by job_id (through the entity cache)
     def get_job_by_id(self, job_id: int) -> JobRead:
         try:
-            job = self.db.query(Job).filter(Job.id == job_id).first()
-            if (job):
-                return JobRead.model_validate(job)
-            return None
+            return job_cache.get_or_load(job_id, lambda: self._load_job(job_id))
         except Exception as e:
             logger.error(f"Error getting job by id: {str(e)}")
             raise
+
+    def _load_job(self, job_id: int) -> JobRead | None:
+        job = self.db.query(Job).filter(Job.id == job_id).first()
+        return JobRead.model_validate(job) if job else None
         
-    # Get all jobs by admin_id
-    def get_all_jobs(self, admin_id: int) -> list[JobRead]:
+    # Get one page of jobs by admin_id
+    def get_all_jobs(self, admin_id: int, page: PageParams | None = None, filters: JobFilters | None = None) -> Page[JobRead]:
         try:
-            all_jobs = self.db.query(Job).filter(Job.admin_id == admin_id).all()
-            if (all_jobs):
-                return [JobRead.model_validate(job) for job in all_jobs]
-            return []
+            page = page or PageParams()
+            rows = self.db.scalars(_jobs_page_query(admin_id, page, filters)).all()
+            rows, next_cursor = split_page(rows, page)
+            return Page([JobRead.model_validate(job) for job in rows], next_cursor)
         except Exception as e:
             logger.error(f"Error getting all jobs: {str(e)}")
             raise
@@ -50,13 +211,17 @@ class JobService:
     # Update a job by job_id
     def update_job(self, job_id: int, payload: JobUpdate) -> JobRead:
         try:
-            job = self.db.query(Job).filter(Job.id == job_id).first()
+            # Row lock: concurrent updates / approvals must not compute their stats deltas from the same snapshot
+            job = self.db.query(Job).filter(Job.id == job_id).populate_existing().with_for_update().first()
             if (job):
+                before = job_contribution(job)
                 for key, value in payload.model_dump().items():
                     setattr(job, key, value)
+                apply_job_stats_delta(self.db, job.admin_id, job_contribution(job) - before)
                 if payload.status == JobStatus.completed:
-                    self.db.query(JobApplication).filter(JobApplication.job_id == job_id).update({JobApplication.work_status: WorkStatus.completed, JobApplication.payment_status: PaymentStatus.pending})
+                    enqueue(self.db, COMPLETE_JOB_APPLICATIONS_TASK, {"job_id": job_id})
                 self.db.commit()
+                job_cache.invalidate(job_id)
                 self.db.refresh(job)
                 return JobRead.model_validate(job)
             return None
@@ -67,39 +232,117 @@ class JobService:
     # Delete a job by job_id
     def delete_job(self, job_id: int) -> bool:
         try:
-            job = self.db.query(Job).filter(Job.id == job_id).first()
+            job = self.db.query(Job).filter(Job.id == job_id).populate_existing().with_for_update().first()
             if (job):
+                apply_job_stats_delta(self.db, job.admin_id, -job_contribution(job))
                 self.db.delete(job)
                 self.db.commit()
+                job_cache.invalidate(job_id)
                 return True
             return False
         except Exception as e:
             logger.error(f"Error deleting job: {str(e)}")
             raise
         
+    # Columns of the admin's job history export (app.core.export), newest first
+    @staticmethod
+    def export_query(admin_id: int) -> Select:
+        return (
+            select(
+                Job.id, Job.title, Job.description, Job.status, Job.minimum_education, Job.job_category,
+                Job.characteristics, Job.workers_required, Job.workers_hired, Job.salary, Job.salary_type,
+                Job.from_date_time, Job.to_date_time, Job.created_at,
+            )
+            .where(Job.admin_id == admin_id)
+            .order_by(Job.created_at.desc(), Job.id.desc())
+        )
+
     # Get job stats (totals of workers_required / workers_hired across all jobs for this admin)
     def get_jobs_stats(self, admin_id: int) -> JobStats:
         try:
-            row = (
-                self.db.query(
-                    func.count(Job.id).label("total_jobs"),
-                    func.coalesce(func.sum(Job.workers_required), 0).label("workers_required"),
-                    func.coalesce(func.sum(Job.workers_hired), 0).label("workers_hired"),
-                    func.sum(case((Job.status == JobStatus.active, 1), else_=0)).label("active_jobs"),
+            return read_job_stats(self.db, admin_id)
+        except Exception as e:
+            logger.error(f"Error getting job stats: {str(e)}")
+            raise
+
+    # Version of the admin's job stats for ETags (the summary row's updated_at)
+    def get_jobs_stats_version(self, admin_id: int) -> tuple:
+        return (self.db.scalar(select(JobStatsSummary.updated_at).where(JobStatsSummary.admin_id == admin_id)),)
+
+
+# Async read-side variant of JobService for `async def` routes
+class AsyncJobService:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    # Get a job by job_id (through the entity cache)
+    async def get_job_by_id(self, job_id: int) -> JobRead:
+        try:
+            return await job_cache.aget_or_load(job_id, lambda: self._load_job(job_id))
+        except Exception as e:
+            logger.error(f"Error getting job by id: {str(e)}")
+            raise
+
+    async def _load_job(self, job_id: int) -> JobRead | None:
+        job = await self.db.scalar(select(Job).where(Job.id == job_id))
+        return JobRead.model_validate(job) if job else None
+
+    # Version of the admin's jobs for ETags (count / max / sum of updated_at)
+    async def get_jobs_version(self, admin_id: int) -> tuple:
+        return tuple((await self.db.execute(table_version(Job, Job.admin_id == admin_id))).one())
+
+    # Get one page of jobs by admin_id
+    async def get_all_jobs(self, admin_id: int, page: PageParams | None = None, filters: JobFilters | None = None) -> Page[JobRead]:
+        try:
+            page = page or PageParams()
+            rows = (await self.db.scalars(_jobs_page_query(admin_id, page, filters))).all()
+            rows, next_cursor = split_page(rows, page)
+            return Page([JobRead.model_validate(job) for job in rows], next_cursor)
+        except Exception as e:
+            logger.error(f"Error getting all jobs: {str(e)}")
+            raise
+
+    # Full-text search over the admin's jobs, ranked, one page at a time
+    async def search_jobs(
+        self, admin_id: int, q: str, page: RankedPageParams | None = None, filters: JobFilters | None = None
+    ) -> Page[JobSearchResult]:
+        try:
+            page = page or RankedPageParams()
+            rows = (await self.db.execute(_jobs_search_query(admin_id, q, page, filters))).all()
+            rows, next_cursor = split_ranked_page(rows, page, key=lambda row: (row[1], row[0].id))
+            items = [
+                JobSearchResult(
+                    **dict(JobRead.model_validate(job)),
+                    rank=rank,
+                    title_highlight=_highlight(title),
+                    description_highlight=_highlight(description),
                 )
-                .filter(Job.admin_id == admin_id)
-                .first()
-            )
-            total_jobs = row.total_jobs or 0
-            workers_required = int(row.workers_required)
-            workers_hired = int(row.workers_hired) if row.workers_hired else 0
-            active_jobs = int(row.active_jobs or 0)
-            return JobStats(
-                workers_required=workers_required,
-                workers_hired=workers_hired,
-                total_jobs=total_jobs,
-                active_jobs=active_jobs,
-            )
+                for job, rank, title, description in rows
+            ]
+            return Page(items, next_cursor)
+        except Exception as e:
+            logger.error(f"Error searching jobs: {str(e)}")
+            raise
+
+    # Facet counts of the admin's jobs (one GROUPING SETS aggregate, cached per jobs version and filters)
+    async def get_job_facets(self, admin_id: int, filters: JobFilters | None = None, version: tuple | None = None) -> JobFacets:
+        try:
+            version = version if version is not None else await self.get_jobs_version(admin_id)
+            key = (admin_id, version, tuple(filters.model_dump().values()) if filters is not None else None)
+            facets = facet_cache.get(key)
+            if facets is None:
+                generation = facet_cache.generation(key)
+                facets = _build_job_facets((await self.db.execute(_jobs_facets_query(admin_id, filters))).all())
+                facet_cache.put(key, facets, generation)
+            return facets
+        except Exception as e:
+            logger.error(f"Error getting job facets: {str(e)}")
+            raise
+
+    # Get job stats (primary-key read of the job_stats summary row)
+    async def get_jobs_stats(self, admin_id: int) -> JobStats:
+        try:
+            return await read_job_stats_async(self.db, admin_id)
         except Exception as e:
             logger.error(f"Error getting job stats: {str(e)}")
-            raise
\ No newline at end of file
+            raise
@@ -0,0 +1,201 @@
+"""
+Incrementally maintained per-admin job statistics (`job_stats` table).
+
+Every service write that changes a job's contribution to the totals calls
+`apply_job_stats_delta()` before its own commit, so the summary row changes in
+the same transaction as the job. The delta is an `INSERT ... ON CONFLICT DO
+UPDATE` that adds to the current values, so concurrent writers for the same
+admin serialize on the summary row instead of overwriting each other.
+
+`reconcile_job_stats()` recomputes the table from `jobs` (after bulk imports,
+manual SQL or to verify drift):
+
+    python -m app.entities.jobs.stats              # all admins
+    python -m app.entities.jobs.stats --admin-id 7
+    python -m app.entities.jobs.stats --check      # report drift, change nothing
+"""
+import argparse
+from dataclasses import dataclass
+
+from sqlalchemy import case, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.entities.jobs.model import Job, JobStatsSummary, JobStatus
+from app.entities.jobs.schema import JobStats
+
+
+@dataclass(frozen=True)
+class JobStatsDelta:
+    total_jobs: int = 0
+    active_jobs: int = 0
+    workers_required: int = 0
+    workers_hired: int = 0
+
+    def __add__(self, other: "JobStatsDelta") -> "JobStatsDelta":
+        return JobStatsDelta(
+            self.total_jobs + other.total_jobs,
+            self.active_jobs + other.active_jobs,
+            self.workers_required + other.workers_required,
+            self.workers_hired + other.workers_hired,
+        )
+
+    def __sub__(self, other: "JobStatsDelta") -> "JobStatsDelta":
+        return JobStatsDelta(
+            self.total_jobs - other.total_jobs,
+            self.active_jobs - other.active_jobs,
+            self.workers_required - other.workers_required,
+            self.workers_hired - other.workers_hired,
+        )
+
+    def __neg__(self) -> "JobStatsDelta":
+        return JobStatsDelta() - self
+
+    def __bool__(self) -> bool:
+        return any((self.total_jobs, self.active_jobs, self.workers_required, self.workers_hired))
+
+
+def job_contribution(job: Job) -> JobStatsDelta:
+    """What one job adds to its admin's totals."""
+    return JobStatsDelta(
+        total_jobs=1,
+        active_jobs=1 if job.status == JobStatus.active else 0,
+        workers_required=job.workers_required or 0,
+        workers_hired=job.workers_hired or 0,
+    )
+
+
+def apply_job_stats_delta(db: Session, admin_id: int, delta: JobStatsDelta) -> None:
+    """Add `delta` to the admin's summary row inside the caller's transaction (no commit)."""
+    if not delta:
+        return
+    table = JobStatsSummary.__table__
+    stmt = insert(table).values(
+        admin_id=admin_id,
+        total_jobs=delta.total_jobs,
+        active_jobs=delta.active_jobs,
+        workers_required=delta.workers_required,
+        workers_hired=delta.workers_hired,
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[table.c.admin_id],
+            set_={
+                "total_jobs": table.c.total_jobs + stmt.excluded.total_jobs,
+                "active_jobs": table.c.active_jobs + stmt.excluded.active_jobs,
+                "workers_required": table.c.workers_required + stmt.excluded.workers_required,
+                "workers_hired": table.c.workers_hired + stmt.excluded.workers_hired,
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+def _to_schema(row: JobStatsSummary | None) -> JobStats:
+    if row is None:
+        return JobStats(workers_required=0, workers_hired=0, total_jobs=0, active_jobs=0)
+    return JobStats(
+        workers_required=row.workers_required,
+        workers_hired=row.workers_hired,
+        total_jobs=row.total_jobs,
+        active_jobs=row.active_jobs,
+    )
+
+
+def read_job_stats(db: Session, admin_id: int) -> JobStats:
+    """Primary-key read of the summary row; zeros for an admin without jobs."""
+    return _to_schema(db.get(JobStatsSummary, admin_id, populate_existing=True))
+
+
+async def read_job_stats_async(db: AsyncSession, admin_id: int) -> JobStats:
+    return _to_schema(await db.get(JobStatsSummary, admin_id, populate_existing=True))
+
+
+def compute_job_stats(db: Session, admin_id: int) -> JobStats:
+    """Full aggregate over the admin's jobs (the pre-summary query; used for checks and benchmarks)."""
+    row = db.execute(
+        select(
+            func.count(Job.id).label("total_jobs"),
+            func.coalesce(func.sum(Job.workers_required), 0).label("workers_required"),
+            func.coalesce(func.sum(Job.workers_hired), 0).label("workers_hired"),
+            func.coalesce(func.sum(case((Job.status == JobStatus.active, 1), else_=0)), 0).label("active_jobs"),
+        ).where(Job.admin_id == admin_id)
+    ).one()
+    return JobStats(
+        workers_required=int(row.workers_required),
+        workers_hired=int(row.workers_hired),
+        total_jobs=row.total_jobs,
+        active_jobs=int(row.active_jobs),
+    )
+
+
+_RECOMPUTE_SQL = """
+    INSERT INTO job_stats (admin_id, total_jobs, active_jobs, workers_required, workers_hired, updated_at)
+    SELECT admin_id, count(*), count(*) FILTER (WHERE status = 'active'),
+           coalesce(sum(workers_required), 0), coalesce(sum(workers_hired), 0), now()
+    FROM jobs {where}
+    GROUP BY admin_id
+    ON CONFLICT (admin_id) DO UPDATE SET
+        total_jobs = excluded.total_jobs, active_jobs = excluded.active_jobs,
+        workers_required = excluded.workers_required, workers_hired = excluded.workers_hired,
+        updated_at = excluded.updated_at
+"""
+
+_DRIFT_SQL = """
+    SELECT coalesce(a.admin_id, s.admin_id) AS admin_id
+    FROM (SELECT admin_id, count(*) AS total_jobs, count(*) FILTER (WHERE status = 'active') AS active_jobs,
+                 coalesce(sum(workers_required), 0) AS workers_required, coalesce(sum(workers_hired), 0) AS workers_hired
+          FROM jobs {where} GROUP BY admin_id) a
+    FULL JOIN (SELECT * FROM job_stats {where}) s ON s.admin_id = a.admin_id
+    WHERE (a.total_jobs, a.active_jobs, a.workers_required, a.workers_hired)
+          IS DISTINCT FROM (s.total_jobs, s.active_jobs, s.workers_required, s.workers_hired)
+      AND coalesce(a.total_jobs, s.total_jobs) IS DISTINCT FROM 0
+"""
+
+
+def job_stats_drift(db: Session, admin_id: int | None = None) -> list[int]:
+    """Admin ids whose summary row does not match the jobs table."""
+    where = "WHERE admin_id = :admin_id" if admin_id is not None else ""
+    return list(db.execute(text(_DRIFT_SQL.format(where=where)), {"admin_id": admin_id}).scalars())
+
+
+def reconcile_job_stats(db: Session, admin_id: int | None = None) -> int:
+    """
+    Recompute summary rows from `jobs` in one statement and commit; returns the number of rows written.
+
+    The SHARE ROW EXCLUSIVE lock blocks concurrent delta upserts until commit, so a
+    job written while the aggregate runs is either in the aggregate or applied on top of it.
+    """
+    where = "WHERE admin_id = :admin_id" if admin_id is not None else ""
+    params = {"admin_id": admin_id}
+    db.execute(text("LOCK TABLE job_stats IN SHARE ROW EXCLUSIVE MODE"))
+    written = db.execute(text(_RECOMPUTE_SQL.format(where=where)), params).rowcount
+    # Admins whose last job is gone
+    stale = "AND admin_id = :admin_id" if admin_id is not None else ""
+    db.execute(
+        text(f"DELETE FROM job_stats WHERE NOT EXISTS (SELECT 1 FROM jobs WHERE jobs.admin_id = job_stats.admin_id) {stale}"),
+        params,
+    )
+    db.commit()
+    return written
+
+
+def main() -> None:
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Recompute the job_stats summary table from jobs.")
+    parser.add_argument("--admin-id", type=int, default=None, help="Only this admin (default: all)")
+    parser.add_argument("--check", action="store_true", help="Report admins whose totals drifted; change nothing")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        drifted = job_stats_drift(db, args.admin_id)
+        print(f"{len(drifted)} admin(s) out of sync" + (f": {drifted[:20]}" if drifted else ""))
+        if not args.check:
+            written = reconcile_job_stats(db, args.admin_id)
+            print(f"Recomputed job_stats for {written} admin(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, Integer, String, Enum as SQLAEnum, Boolean, ForeignKey
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import Column, Integer, String, Enum as SQLAEnum, Boolean, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import relationship
+from app.config import settings
+from app.core.photos import FULL, variant_url
 from app.db.base import Base, BaseModel
 
 class UserRoleEnum(str, Enum):
@@ -22,6 +24,12 @@ class EmploymentType(str, Enum):
 
 class User(Base, BaseModel):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_email", "email"),
+        Index("ix_users_admin_id_workers", "admin_id", postgresql_where=text("user_role = 'worker'")),
+        Index("ix_users_admin_id_updated_at_workers", "admin_id", "updated_at", postgresql_where=text("user_role = 'worker'")),
+        Index("ix_users_photo_hash", "photo_hash", postgresql_where=text("photo_hash IS NOT NULL")),
+    )
     
     first_name = Column(String, nullable=False)
     last_name = Column(String, nullable=False)
@@ -32,7 +40,9 @@ class User(Base, BaseModel):
     address = Column(String, nullable=True)
     
     emergency_contact = Column(String, nullable=True)
-    photo = Column(String, nullable=True)
+    photo = Column(String, nullable=True)  # URL set directly; uploaded photos live in photo_variants
+    photo_hash = Column(String(64), nullable=True)  # sha256 of the uploaded photo (app.core.photos)
+    photo_variants = Column(JSONB, nullable=True)  # {"full" | "<px>": storage key}
     
     gender = Column(SQLAEnum(Gender), nullable=False)
     availability = Column(Boolean, default=True)
@@ -46,4 +56,14 @@ class User(Base, BaseModel):
     business_id = Column(Integer, ForeignKey("business.id"), nullable=True) # foreign key to business.id
     
     # relationship for easy data access and retrieval
-    business = relationship("Business")  # backref automatically creates business.users
\ No newline at end of file
+    business = relationship("Business")  # backref automatically creates business.users
+
+    @property
+    def photo_url(self) -> str | None:
+        """URL of the uploaded photo's full variant, else the directly set `photo`."""
+        return variant_url(self.photo_variants, FULL) or self.photo
+
+    @property
+    def photo_thumbnail(self) -> str | None:
+        """URL of the PHOTO_LIST_SIZE square, for lists that render small avatars."""
+        return variant_url(self.photo_variants, str(settings.PHOTO_LIST_SIZE))
@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from pydantic import BaseModel, EmailStr
+from pydantic import AliasChoices, BaseModel, EmailStr, Field
 from app.entities.user.modal import UserRoleEnum, Gender, EmploymentType    
 
 class UserBase(BaseModel):
@@ -60,6 +60,9 @@ class UserLogin(BaseModel):
 
 class UserRead(UserBase):
     id: int
+    # From ORM rows: User.photo_url resolves an uploaded photo's stored key
+    photo: str | None = Field(default=None, validation_alias=AliasChoices("photo_url", "photo"))
+    photo_thumbnail: str | None = None  # small square of an uploaded photo; `photo` is the full size
     admin_id: int | None = None
     business_id: int | None = None
 
@@ -1,15 +1,65 @@
+from sqlalchemy import Select, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.entities.user.modal import User, UserRoleEnum as UserUserRoleEnum
 from app.entities.user.schema import ForgotPassword, UserCreate, UserRead, UserCreateResponse, UserUpdate, UserLogin, UserTokenResponse
 from app.core.logging import get_logger
+from app.core.entity_cache import entity_cache
+from app.core.etag import table_version
+from app.core.pagination import Page, PageParams, keyset, split_page
+from app.core.photos import PhotoUpload, aprefetch_photo_urls, prefetch_photo_urls, store_photo
 from app.core.email import EmailService
-from app.core.security import generate_random_otp, get_password_hash, generate_random_password, verify_password, create_token
+from app.core.job_queue import after_commit, enqueue, register_task
+from app.core.pending_registration import get_pending, pop_pending, set_pending
+from app.core.security import generate_random_otp, get_password_hash, generate_random_password, verify_password, create_token, password_needs_update, rehash_password_in_background
+from app.db.session import SessionLocal
+from app.entities.business.service import BusinessService
 from email_validator import validate_email, EmailNotValidError
 from fastapi import HTTPException
 from datetime import datetime, timezone
+from functools import lru_cache
 
 logger = get_logger(__name__)
 
+user_cache = entity_cache("user", UserRead)
+
+# Emails carrying a secret are queued by reference; the task produces or looks up the secret,
+# so no password or OTP is ever written to background_jobs
+SEND_PASSWORD_EMAIL_TASK = "send_password_email"
+SEND_USER_OTP_EMAIL_TASK = "send_user_otp_email"
+
+
+def _otp_key(email: str) -> str:
+    return "user:" + email
+
+
+# Background task: set a fresh random password for the user and email it
+@register_task(SEND_PASSWORD_EMAIL_TASK)
+def send_password_email(db: Session, payload: dict) -> None:
+    user = db.get(User, payload["user_id"])
+    if user is None:
+        return
+    password = generate_random_password(15)
+    user.password = get_password_hash(password)
+    email = user.email
+    # Emailed only once the new hash is committed, so the user never gets a password that was not stored.
+    # A failed send queues the task again, which sets (and sends) another password.
+    after_commit(db, lambda: EmailService().send_email(email, "Your Password for WhenWeWork", "Your password is: " + password))
+
+
+# Background task: email the OTP held in the pending store (nothing to send once it was used or expired)
+@register_task(SEND_USER_OTP_EMAIL_TASK)
+def send_user_otp_email(db: Session, payload: dict) -> None:
+    entry = get_pending(_otp_key(payload["email"]))
+    if entry is not None:
+        EmailService().send_email(payload["email"], "Your OTP for WhenWeWork", "Your OTP is: " + entry["otp"])
+
+
+@lru_cache(maxsize=1)
+def _unusable_password_hash() -> str:
+    """Hash of a random secret nobody knows: the password of a user until the emailed one is set."""
+    return get_password_hash(generate_random_password(32))
+
 # ---------- UserService (single User table, RBAC via user_role) ----------
 
 
@@ -20,16 +70,9 @@ class UserService:
         self.db = db
         self.email_service = EmailService()
 
-    def _send_user_email_with_password(self, email: str) -> str:
-        """Generate password, hash it, email plain password to user; return hash."""
-        random_password = generate_random_password(15)
-        hashed = get_password_hash(random_password)
-        self.email_service.send_email(
-            email,
-            "Your Password for WhenWeWork",
-            "Your password is: " + random_password,
-        )
-        return hashed
+    def _send_user_email_with_password(self, user_id: int) -> None:
+        """Queue, in this transaction, a job that sets a random password for the user and emails it."""
+        enqueue(self.db, SEND_PASSWORD_EMAIL_TASK, {"user_id": user_id})
     
     def check_user_email_exists(self, email: str) -> bool:
         already_exists = self.db.query(User).filter(User.email == email).first()
@@ -48,15 +91,16 @@ class UserService:
         data = payload.model_dump(exclude_unset=True)
         if admin_id is not None:
             data["admin_id"] = admin_id
-        if data.get("password"):
-            data["password"] = get_password_hash(data["password"])
-        else:
-            data["password"] = self._send_user_email_with_password(payload.email)
+        email_password = not data.get("password")
+        data["password"] = _unusable_password_hash() if email_password else get_password_hash(data["password"])
         if data.get("worker_roles") is None:
             data["worker_roles"] = []
 
         user = User(**data)
         self.db.add(user)
+        if email_password:
+            self.db.flush()
+            self._send_user_email_with_password(user.id)
         self.db.commit()
         self.db.refresh(user)
 
@@ -69,16 +113,34 @@ class UserService:
         )
 
     def get_user_by_id(self, user_id: int) -> UserRead | None:
+        """Read through the entity cache; update_user / delete_user invalidate it."""
+        return user_cache.get_or_load(user_id, lambda: self._load_user(user_id))
+
+    def _load_user(self, user_id: int) -> UserRead | None:
         user = self.db.query(User).filter(User.id == user_id).first()
         return UserRead.model_validate(user) if user else None
 
-    def get_all_workers_by_admin(self, admin_id: int) -> list[UserRead]:
-        users = (
-            self.db.query(User)
-            .filter(User.admin_id == admin_id, User.user_role == UserUserRoleEnum.worker)
-            .all()
+    def get_all_workers_by_admin(self, admin_id: int, page: PageParams | None = None) -> Page[UserRead]:
+        page = page or PageParams()
+        users = self.db.scalars(
+            keyset(select(User).where(User.admin_id == admin_id, User.user_role == UserUserRoleEnum.worker), User, page)
+        ).all()
+        users, next_cursor = split_page(users, page)
+        prefetch_photo_urls(users)
+        return Page([UserRead.model_validate(u) for u in users], next_cursor)
+
+    # Columns of the admin's worker export (app.core.export), newest first; never the password hash
+    @staticmethod
+    def workers_export_query(admin_id: int) -> Select:
+        return (
+            select(
+                User.id, User.first_name, User.last_name, User.email, User.phone, User.address,
+                User.emergency_contact, User.gender, User.availability, User.employment_type,
+                User.worker_roles, User.remarks, User.created_at,
+            )
+            .where(User.admin_id == admin_id, User.user_role == UserUserRoleEnum.worker)
+            .order_by(User.created_at.desc(), User.id.desc())
         )
-        return [UserRead.model_validate(u) for u in users] if users else []
 
     def update_user(self, user_id: int, payload: UserUpdate) -> UserRead | None:
         user = self.db.query(User).filter(User.id == user_id).first()
@@ -87,20 +149,67 @@ class UserService:
         data = payload.model_dump(exclude_unset=True)
         if data.get("password"):
             data["password"] = get_password_hash(data["password"])
+        if "photo" in data:
+            # A photo URL set directly replaces any uploaded photo
+            user.photo_hash = None
+            user.photo_variants = None
         for key, value in data.items():
             setattr(user, key, value)
         self.db.commit()
+        user_cache.invalidate(user_id)
         self.db.refresh(user)
         return UserRead.model_validate(user)
 
+    # Uploaded photo: variants are content-addressed, so bytes any user already uploaded are not rendered again
+    def set_photo(self, user_id: int, upload: PhotoUpload) -> UserRead | None:
+        try:
+            variants = self.db.scalar(
+                select(User.photo_variants)
+                .where(User.photo_hash == upload.digest, User.photo_variants.is_not(None))
+                .limit(1)
+            )
+            if variants is None:
+                # Don't sit idle in a transaction while the photo workers render
+                self.db.rollback()
+                variants = store_photo(upload)
+            user = self.db.query(User).filter(User.id == user_id).first()
+            if not user:
+                return None
+            user.photo = None
+            user.photo_hash = upload.digest
+            user.photo_variants = variants
+            self.db.commit()
+            user_cache.invalidate(user_id)
+            self.db.refresh(user)
+            return UserRead.model_validate(user)
+        except Exception as e:
+            logger.error(f"Error storing photo for user {user_id}: {str(e)}")
+            raise
+
     def delete_user(self, user_id: int) -> bool:
         user = self.db.query(User).filter(User.id == user_id).first()
         if not user:
             return False
         self.db.delete(user)
         self.db.commit()
+        user_cache.invalidate(user_id)
         return True
 
+    @staticmethod
+    def _rehash_password(user_id: int, plain_password: str, old_hash: str) -> None:
+        """Upgrade a hash to the configured scheme/cost off the request path."""
+        def store(new_hash: str) -> None:
+            # Compare-and-set: skip if the password changed while we were hashing
+            with SessionLocal() as db:
+                db.execute(
+                    update(User)
+                    .where(User.id == user_id, User.password == old_hash)
+                    .values(password=new_hash)
+                )
+                db.commit()
+
+        rehash_password_in_background(plain_password, store)
+
     def login_user(self, payload: UserLogin) -> UserTokenResponse:
         """Login any user (admin or worker); token includes role."""
         try:
@@ -109,11 +218,15 @@ class UserService:
                 raise HTTPException(status_code=401, detail="User not found")
             if not verify_password(payload.password, user.password):
                 raise HTTPException(status_code=401, detail="Invalid password")
+            if password_needs_update(user.password):
+                self._rehash_password(user.id, payload.password, user.password)
             role_val = user.user_role.value if hasattr(user.user_role, "value") else str(user.user_role)
+            # Business name from the entity cache instead of loading user.business on every login
+            business = BusinessService(self.db).get_business_by_id(user.business_id) if user.business_id else None
             user_data = {
                 "id": user.id,
                 "name": f"{user.first_name} {user.last_name}",
-                "business_name": user.business.business_name if user.business else None,
+                "business_name": business.business_name if business else None,
                 "email": user.email,
                 "user_role": user.user_role,
                 "last_login_at": datetime.now(timezone.utc),
@@ -134,10 +247,8 @@ class UserService:
             user = self.db.query(User).filter(User.email == payload.email).first()
             if not user:
                 return False
-            new_password = self._send_user_email_with_password(payload.email)
-            user.password = new_password
+            self._send_user_email_with_password(user.id)
             self.db.commit()
-            self.db.refresh(user)
             return True
         except Exception as e:
             logger.error(f"Error during forgot password for {payload.email}: {str(e)}")
@@ -145,8 +256,9 @@ class UserService:
         
     def send_otp(self, email: str) -> bool:
         try:
-            otp = generate_random_otp(6)
-            self.email_service.send_email(email, "Your OTP for WhenWeWork", "Your OTP is: " + otp)
+            set_pending(_otp_key(email), generate_random_otp(6), {})
+            enqueue(self.db, SEND_USER_OTP_EMAIL_TASK, {"email": email})
+            self.db.commit()
             return True
         except Exception as e:
             logger.error(f"Error during sending OTP to {email}: {str(e)}")
@@ -154,13 +266,60 @@ class UserService:
     
     def verify_otp(self, email: str, otp: str) -> bool:
         try:
-            user = self.db.query(User).filter(User.email == email).first()
-            if not user:
-                return False
-            if user.otp != otp:
+            entry = get_pending(_otp_key(email))
+            if entry is None or entry["otp"] != otp:
                 return False
+            pop_pending(_otp_key(email))
             return True
         except Exception as e:
             logger.error(f"Error during verifying OTP for {email}: {str(e)}")
             raise HTTPException(status_code=500, detail="Unable to verify OTP at this time.")
-            
\ No newline at end of file
+
+
+class AsyncUserService:
+    """Async read-side variant of UserService for `async def` routes."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    # Check if a user with this email exists
+    async def check_user_email_exists(self, email: str) -> bool:
+        try:
+            already_exists = await self.db.scalar(select(User.id).where(User.email == email).limit(1))
+            return already_exists is not None
+        except Exception as e:
+            logger.error(f"Error checking user email: {str(e)}")
+            raise
+
+    # Get a user by user_id (through the entity cache)
+    async def get_user_by_id(self, user_id: int) -> UserRead | None:
+        try:
+            return await user_cache.aget_or_load(user_id, lambda: self._load_user(user_id))
+        except Exception as e:
+            logger.error(f"Error getting user by id: {str(e)}")
+            raise
+
+    async def _load_user(self, user_id: int) -> UserRead | None:
+        user = await self.db.scalar(select(User).where(User.id == user_id))
+        return UserRead.model_validate(user) if user else None
+
+    async def get_workers_version(self, admin_id: int) -> tuple:
+        """Version of the admin's worker list for ETags (count / max / sum of updated_at)."""
+        stmt = table_version(User, User.admin_id == admin_id, User.user_role == UserUserRoleEnum.worker)
+        return tuple((await self.db.execute(stmt)).one())
+
+    # Get one page of the admin's workers
+    async def get_all_workers_by_admin(self, admin_id: int, page: PageParams | None = None) -> Page[UserRead]:
+        try:
+            page = page or PageParams()
+            users = (
+                await self.db.scalars(
+                    keyset(select(User).where(User.admin_id == admin_id, User.user_role == UserUserRoleEnum.worker), User, page)
+                )
+            ).all()
+            users, next_cursor = split_page(users, page)
+            await aprefetch_photo_urls(users)
+            return Page([UserRead.model_validate(u) for u in users], next_cursor)
+        except Exception as e:
+            logger.error(f"Error getting workers for admin {admin_id}: {str(e)}")
+            raise
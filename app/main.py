@@ -1,14 +1,34 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
+from app.core.email import shutdown_email
+from app.core.job_queue import start_workers, stop_workers
+from app.core.metrics import install_metrics
+from app.core.photos import shutdown_photos
+from app.core.query_counter import install_query_counter
+from app.core.security import shutdown_hashing
 from app.routes import router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_workers()
+    yield
+    stop_workers()
+    # Flush queued mail and close pooled SMTP sessions
+    shutdown_email()
+    shutdown_hashing()
+    shutdown_photos()
+
+
 # Create FastAPI app instance
 app = FastAPI(
     title=settings.app_name,
     version=settings.version,
     description=settings.description,
     debug=settings.debug,
+    lifespan=lifespan,
 )
 
 # CORS (allow_credentials must be False when origins is ["*"])
@@ -20,6 +40,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request query counts / N+1 warnings (X-DB-* headers in debug mode)
+install_query_counter(app)
+
+# Route latency histograms, status codes, in-flight requests and DB pool telemetry at /metrics
+install_metrics(app)
+
 # Include the API router
 app.include_router(router)
 
@@ -2,13 +2,15 @@ from typing import List
 from fastapi import APIRouter, HTTPException, status, Depends
 from sqlalchemy.orm import Session
 from app.db.session import get_db
-from app.core.response import APIResponse, ok, fail
+from app.core.response import APIResponse, FastJSONRoute, ok, fail
+from app.core.pagination import PageParams, page_params
 from app.entities.business.service import BusinessService
 from app.entities.business.schema import BusinessCreate, BusinessRead, BusinessUpdate, VerifyBusinessRegister
 
 router = APIRouter(
     prefix="/business",
     tags=["Business"],
+    route_class=FastJSONRoute,
 )
 
 # Step 1: Submit business details → OTP sent to business email (business not created yet)
@@ -57,11 +59,11 @@ def get_business_by_id(business_id: int, db: Session = Depends(get_db)):
     
 # Get All Businesses
 @router.get("", response_model=APIResponse[List[BusinessRead]])
-def get_all_businesses(db:Session = Depends(get_db)):
-    """ Get All Businesses """
+def get_all_businesses(db:Session = Depends(get_db), page: PageParams = Depends(page_params)):
+    """ Get All Businesses (newest first, paginated with ?cursor=&limit=) """
     try:
-        all_businesses = BusinessService(db).get_all_businesses()
-        return ok(data=all_businesses, message="All Businesses Found Successfully")
+        result = BusinessService(db).get_all_businesses(page=page)
+        return ok(data=result.items, message="All Businesses Found Successfully", next_cursor=result.next_cursor)
     except Exception as e:
         return fail(message=str(e))
     
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, HTTPException, status
+from app.core.response import FastJSONRoute
+from app.core.storage import get_storage
+
+router = APIRouter(
+    prefix="/files",
+    tags=["Files"],
+    route_class=FastJSONRoute,
+)
+
+# Serve a stored file (local backend: FileResponse with Range support; public supabase bucket: streamed through;
+# private bucket: 404, clients use the signed URLs)
+@router.get("/{file_name:path}", response_model=None)
+def get_file(file_name: str):
+    """ Stream a stored file by name """
+    try:
+        return get_storage().file_response(file_name)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except FileNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
@@ -1,15 +1,22 @@
 from typing import List
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.core.response import APIResponse, ok, fail
-from app.entities.job_application.service import JobApplicationService, JobApplicationApprovalService
-from app.entities.job_application.schema import JobApplicationCreate, JobApplicationRead, JobApplicationUpdate, JobApproval, JobApplicationWorkerStatus, PaymentUpdate, Revenue, PendingRevenue
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.db.session import get_db, get_async_db
+from app.core.response import APIResponse, FastJSONRoute, ok, fail
+from app.entities.job_application.model import PaymentStatus
+from app.entities.job_application.service import JobApplicationService, JobApplicationApprovalService, AsyncJobApplicationApprovalService
+from app.entities.job_application.schema import JobApplicationCreate, JobApplicationRead, JobApplicationUpdate, JobApproval, JobApplicationWorkerStatus, PaymentUpdate, Revenue, PendingRevenue, BulkApprovalRequest, BulkApprovalResult, BulkPaymentUpdate, BulkPaymentResult
 from app.core.auth import get_current_worker_id, get_current_admin_id   
+from app.core.pagination import PageParams, page_params
+from app.core.export import ExportFormat, export_response
 
 router = APIRouter(
     prefix = "/job_applications",
-    tags = ["Job Applications"]
+    tags = ["Job Applications"],
+    route_class = FastJSONRoute,
 )
 
 # Create Job Application --- WORKER PANEL ---
@@ -24,11 +31,11 @@ def create_job_application(job_application: JobApplicationCreate, db: Session =
 
 # Get All Job Applications by Admin ID --- ADMIN PANEL ---
 @router.get("/approval-panel", response_model=APIResponse[List[JobApproval]])
-def get_all_job_applications_by_admin(db: Session = Depends(get_db), admin_id: int = Depends(get_current_admin_id)):
-    """ Get All Job Applications by Admin ID """
+async def get_all_job_applications_by_admin(db: AsyncSession = Depends(get_async_db), admin_id: int = Depends(get_current_admin_id), page: PageParams = Depends(page_params)):
+    """ Get All Job Applications by Admin ID (newest first, paginated with ?cursor=&limit=) """
     try:
-        all_job_applications = JobApplicationApprovalService(db).get_all_job_applications(admin_id=admin_id)
-        return ok(data=all_job_applications, message="All Job Applications Found Successfully")
+        result = await AsyncJobApplicationApprovalService(db).get_all_job_applications(admin_id=admin_id, page=page)
+        return ok(data=result.items, message="All Job Applications Found Successfully", next_cursor=result.next_cursor)
     except Exception as e:
         return fail(message=str(e))
     
@@ -37,10 +44,24 @@ def get_all_job_applications_by_admin(db: Session = Depends(get_db), admin_id: i
 def approve_job_application(job_application: JobApplicationRead, db: Session = Depends(get_db), admin_id: int = Depends(get_current_admin_id)):
     """ Approve a job application """
     try:
-        approved_job_application = JobApplicationApprovalService(db).approve_job_application(payload=job_application)
+        approved_job_application = JobApplicationApprovalService(db).approve_job_application(payload=job_application, admin_id=admin_id)
+        if approved_job_application is None:
+            return fail(message="Job Application not found or already decided")
         return ok(data=approved_job_application, message="Job Application Approved Successfully")
     except Exception as e:
         return fail(message=str(e))
+
+# Approve / Reject Job Applications in bulk --- ADMIN PANEL ---
+@router.put("/approval-panel/bulk", response_model=APIResponse[BulkApprovalResult])
+def decide_job_applications(payload: BulkApprovalRequest, db: Session = Depends(get_db), admin_id: int = Depends(get_current_admin_id)):
+    """ Approve / reject many job applications in one transaction; approvals beyond a job's open positions are reported as capacity_exceeded """
+    try:
+        if len(payload.decisions) > settings.BULK_UPDATE_MAX_ITEMS:
+            return fail(message=f"At most {settings.BULK_UPDATE_MAX_ITEMS} decisions per request")
+        result = JobApplicationApprovalService(db).decide_job_applications(admin_id=admin_id, decisions=payload.decisions)
+        return ok(data=result, message=f"{result.approved} approved, {result.rejected} rejected, {result.capacity_exceeded} over capacity")
+    except Exception as e:
+        return fail(message=str(e))
     
 # Get All Job Applications by Worker ID --- WORKER PANEL ---
 @router.get("/job-application-status-panel", response_model=APIResponse[List[JobApplicationWorkerStatus]])
@@ -64,11 +85,11 @@ def get_job_application_by_id(job_application_id: int, db: Session = Depends(get
     
 # Get All Job Applications by Worker ID --- WORKER PANEL ---
 @router.get("", response_model=APIResponse[List[JobApplicationRead]])
-def get_all_job_applications(db:Session = Depends(get_db), worker_id: int = Depends(get_current_worker_id)):
-    """ Get All Job Applications by Worker ID """
+def get_all_job_applications(db:Session = Depends(get_db), worker_id: int = Depends(get_current_worker_id), page: PageParams = Depends(page_params)):
+    """ Get All Job Applications by Worker ID (newest first, paginated with ?cursor=&limit=) """
     try:
-        all_job_applications = JobApplicationService(db).get_all_job_applications(worker_id=worker_id)
-        return ok(data=all_job_applications, message="All Job Applications Found Successfully")
+        result = JobApplicationService(db).get_all_job_applications(worker_id=worker_id, page=page)
+        return ok(data=result.items, message="All Job Applications Found Successfully", next_cursor=result.next_cursor)
     except Exception as e:
         return fail(message=str(e))
     
@@ -90,14 +111,26 @@ def get_worker_revenue(
 def get_pending_payment(
     db: Session = Depends(get_db),
     admin_id: int = Depends(get_current_admin_id),
+    page: PageParams = Depends(page_params),
 ):
-    """Get admin's pending payment revenue with list of workers awaiting payment."""
+    """Get admin's pending payment revenue with list of workers awaiting payment (newest first, paginated)."""
     try:
-        revenue = JobApplicationService(db).get_pending_payment(admin_id)
-        return ok(data=revenue, message="Pending Payment Found Successfully")
+        result = JobApplicationService(db).get_pending_payment(admin_id, page=page)
+        return ok(data=result.items, message="Pending Payment Found Successfully", next_cursor=result.next_cursor)
     except Exception as e:
         return fail(message=str(e))
 
+# Export Revenue as CSV / NDJSON --- ADMIN PANEL ---
+@router.get("/admin/revenue/export", response_model=None, response_class=StreamingResponse)
+def export_revenue(
+    format: ExportFormat = ExportFormat.csv,
+    payment_status: PaymentStatus = PaymentStatus.pending,
+    admin_id: int = Depends(get_current_admin_id),
+):
+    """Stream the admin's applications with `payment_status` (pending by default), newest first (?format=csv|ndjson)."""
+    query = JobApplicationService.revenue_export_query(admin_id, payment_status)
+    return export_response(query, format, f"revenue-{payment_status.value}")
+
 # Update Payment Status --- ADMIN PANEL ---
 @router.put("/admin/revenue", response_model=APIResponse[bool])
 def update_payment_status(
@@ -119,6 +152,22 @@ def update_payment_status(
     except Exception as e:
         return fail(message=str(e))
     
+# Settle Payments in bulk --- ADMIN PANEL ---
+@router.put("/admin/revenue/bulk", response_model=APIResponse[BulkPaymentResult])
+def settle_payments(
+    payload: BulkPaymentUpdate,
+    db: Session = Depends(get_db),
+    admin_id: int = Depends(get_current_admin_id),
+):
+    """Set the payment status of many applications at once: a list of (job_id, worker_id) pairs, or all pending for `job_id` and/or jobs ended `before` a date."""
+    try:
+        if payload.pairs is not None and len(payload.pairs) > settings.BULK_UPDATE_MAX_ITEMS:
+            return fail(message=f"At most {settings.BULK_UPDATE_MAX_ITEMS} pairs per request")
+        result = JobApplicationService(db).settle_payments(admin_id, payload)
+        return ok(data=result, message=f"{result.updated} payments updated, {result.not_found} not found")
+    except Exception as e:
+        return fail(message=str(e))
+
 # Update Job Application --- WORKER PANEL ---
 @router.put("/{job_application_id}", response_model=APIResponse[JobApplicationRead])
 def update_job_application(job_application_id: int, job_application: JobApplicationUpdate, db: Session = Depends(get_db)):
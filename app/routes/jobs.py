@@ -1,11 +1,19 @@
+from datetime import datetime
 from typing import List
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, Body, HTTPException, Query, status, Depends
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.core.response import APIResponse, ok, fail
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_db, get_async_db
+from app.core.response import APIResponse, FastJSONRoute, ok, fail
 from app.core.auth import get_current_admin_id, get_admin_id_for_jobs, get_current_worker_id
-from app.entities.jobs.service import JobService
-from app.entities.jobs.schema import JobCreate, JobRead, JobUpdate, JobStats
+from app.core.etag import ConditionalRequest
+from app.core.export import ExportFormat, export_response
+from app.core.pagination import PageParams, RankedPageParams, page_params, ranked_page_params
+from app.entities.jobs.service import JobService, AsyncJobService
+from app.entities.jobs.model import JobCategory, JobStatus
+from app.entities.jobs.schema import JobCreate, JobFacets, JobFilters, JobRead, JobSearchParams, JobSearchResult, JobUpdate, JobStats
+from app.config import settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -13,8 +21,27 @@ logger = get_logger(__name__)
 router = APIRouter(
     prefix="/jobs",
     tags=["Jobs"],
+    route_class=FastJSONRoute,
 )
 
+
+def job_filters(
+    status: JobStatus | None = Query(default=None),
+    job_category: JobCategory | None = Query(default=None),
+    from_date: datetime | None = Query(default=None, description="Shifts starting at or after this time"),
+    to_date: datetime | None = Query(default=None, description="Shifts ending at or before this time"),
+) -> JobFilters:
+    """FastAPI dependency for the GET /jobs filters (one query param per field)."""
+    return JobFilters(status=status, job_category=job_category, from_date=from_date, to_date=to_date)
+
+
+def job_search_params(
+    q: str = Query(min_length=1, max_length=200, description='Words, "quoted phrases", or, -excluded words'),
+    filters: JobFilters = Depends(job_filters),
+) -> JobSearchParams:
+    """FastAPI dependency for GET /jobs/search: ?q= plus the GET /jobs filters."""
+    return JobSearchParams(q=q, **filters.model_dump())
+
 # Create Job (requires admin; admin_id from token, not from frontend)
 @router.post("", response_model=APIResponse[JobRead])
 def create_job(
@@ -30,20 +57,102 @@ def create_job(
         return fail(message=str(e))
 
 
+# Create Jobs in batch (requires admin; one transaction, all-or-nothing)
+@router.post("/batch", response_model=APIResponse[List[JobRead]])
+def create_jobs_batch(
+    jobs: list[JobCreate] = Body(..., max_length=settings.JOB_BATCH_MAX_ITEMS, description="Array of JobCreate objects"),
+    db: Session = Depends(get_db),
+    admin_id: int = Depends(get_current_admin_id),
+):
+    """
+    Create up to JOB_BATCH_MAX_ITEMS jobs in one request. Admin only.
+    Every item is validated first; if any is invalid (or the batch is too
+    large) nothing is created and the 422 detail has a `loc` of
+    ["body", index, field] for each error.
+    """
+    try:
+        created = JobService(db).create_jobs(jobs, admin_id=admin_id)
+        return ok(data=created, message=f"{len(created)} Jobs Created Successfully")
+    except Exception as e:
+        return fail(message=str(e))
+
+
 # Get Job Stats (requires admin; uses admin_id from token)
 @router.get("/stats", response_model=APIResponse[JobStats])
 def get_job_stats(
     db: Session = Depends(get_db),
     admin_id: int = Depends(get_current_admin_id),
+    conditional: ConditionalRequest = Depends(),
 ):
-    """Get job stats for the logged-in admin."""
+    """Get job stats for the logged-in admin (304 when If-None-Match has the current ETag)."""
     try:
-        job_stats = JobService(db).get_jobs_stats(admin_id)
+        service = JobService(db)
+        if conditional.enabled and conditional.matches(f"job_stats:{admin_id}", service.get_jobs_stats_version(admin_id)):
+            return conditional.not_modified()
+        job_stats = service.get_jobs_stats(admin_id)
+        conditional.send_etag()
         return ok(data=job_stats, message="Job Stats Found Successfully")
     except Exception as e:
         return fail(message=str(e))
 
 
+# Export Job History as CSV / NDJSON (requires admin; streamed from a server-side cursor)
+@router.get("/export", response_model=None, response_class=StreamingResponse)
+def export_jobs(
+    format: ExportFormat = ExportFormat.csv,
+    admin_id: int = Depends(get_current_admin_id),
+):
+    """Stream every job of the logged-in admin, newest first (?format=csv|ndjson)."""
+    return export_response(JobService.export_query(admin_id), format, "jobs")
+
+
+# Get Job Facets (admin and workers, scoped like GET /jobs)
+@router.get("/facets", response_model=APIResponse[JobFacets])
+async def get_job_facets(
+    db: AsyncSession = Depends(get_async_db),
+    admin_id: int = Depends(get_admin_id_for_jobs),
+    filters: JobFilters = Depends(job_filters),
+    conditional: ConditionalRequest = Depends(),
+):
+    """
+    Job counts per status, job_category, salary_type and salary bucket (per salary_type), plus the total.
+    - Optional filters as GET /jobs; they narrow every facet
+    - ETag / If-None-Match: 304 while the admin's jobs are unchanged
+    """
+    try:
+        service = AsyncJobService(db)
+        version = await service.get_jobs_version(admin_id)
+        if conditional.enabled and conditional.matches(f"job_facets:{admin_id}", version):
+            return conditional.not_modified()
+        facets = await service.get_job_facets(admin_id, filters=filters, version=version)
+        conditional.send_etag()
+        return ok(data=facets, message="Job Facets Found Successfully")
+    except Exception as e:
+        return fail(message=str(e))
+
+
+# Search Jobs (admin and workers, scoped like GET /jobs; Postgres full-text search)
+@router.get("/search", response_model=APIResponse[List[JobSearchResult]])
+async def search_jobs(
+    params: JobSearchParams = Depends(job_search_params),
+    db: AsyncSession = Depends(get_async_db),
+    admin_id: int = Depends(get_admin_id_for_jobs),
+    page: RankedPageParams = Depends(ranked_page_params),
+):
+    """
+    Search the jobs of the admin (workers: their admin) by title, description and characteristics.
+    - ?q= in web search syntax: words, "quoted phrases", or, -excluded words
+    - Best match first (title > description > characteristics), with highlighted title / description
+    - Same optional filters as GET /jobs
+    - Paginated with ?cursor=&limit=; pass back next_cursor for the next page
+    """
+    try:
+        result = await AsyncJobService(db).search_jobs(admin_id, params.q, page=page, filters=params)
+        return ok(data=result.items, message="Jobs Found Successfully", next_cursor=result.next_cursor)
+    except Exception as e:
+        return fail(message=str(e))
+
+
 # Get Job by Job ID (requires admin)
 @router.get("/{job_id}", response_model=APIResponse[JobRead])
 def get_job_by_id(
@@ -63,18 +172,28 @@ def get_job_by_id(
 # Workers can view jobs posted by their admin (admin_id stored in worker token)
 # Admins can view their own jobs
 @router.get("", response_model=APIResponse[List[JobRead]])
-def get_all_jobs(
-    db: Session = Depends(get_db),
+async def get_all_jobs(
+    db: AsyncSession = Depends(get_async_db),
     admin_id: int = Depends(get_admin_id_for_jobs),  # Returns admin_id for both admin and worker roles
+    filters: JobFilters = Depends(job_filters),
+    page: PageParams = Depends(page_params),
+    conditional: ConditionalRequest = Depends(),
 ):
     """
-    Get all jobs filtered by admin_id.
+    Get all jobs filtered by admin_id, newest first.
     - Admins see their own jobs
     - Workers see jobs posted by their associated admin
+    - Optional filters: status, job_category, from_date, to_date
+    - Paginated with ?cursor=&limit=; pass back next_cursor for the next page
+    - ETag / If-None-Match: 304 while the admin's jobs are unchanged
     """
     try:
-        all_jobs = JobService(db).get_all_jobs(admin_id)
-        return ok(data=all_jobs, message="Jobs Found Successfully")
+        service = AsyncJobService(db)
+        if conditional.enabled and conditional.matches(f"jobs:{admin_id}", await service.get_jobs_version(admin_id)):
+            return conditional.not_modified()
+        result = await service.get_all_jobs(admin_id, page=page, filters=filters)
+        conditional.send_etag()
+        return ok(data=result.items, message="Jobs Found Successfully", next_cursor=result.next_cursor)
     except Exception as e:
         return fail(message=str(e))
 
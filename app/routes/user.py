@@ -1,15 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from app.entities.user.service import UserService
+from fastapi.responses import StreamingResponse
+from app.entities.user.service import UserService, AsyncUserService
 from app.entities.user.schema import ForgotPassword, UserCreate, UserRead, UserCreateResponse, UserUpdate, UserUpdateByWorker, UserUpdateByAdmin, UserLogin, UserTokenResponse
-from app.core.response import APIResponse, ok, fail
+from app.core.response import APIResponse, FastJSONRoute, ok, fail
 from app.core.auth import get_current_admin_id, get_current_admin_id_optional, get_current_worker_id
-from app.db.session import get_db
+from app.core.etag import ConditionalRequest
+from app.core.export import ExportFormat, export_response
+from app.core.pagination import PageParams, page_params
+from app.core.photos import PhotoUpload, read_photo
+from app.core.storage import url_resolver
+from app.db.session import get_db, get_async_db
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.entities.user.modal import UserRoleEnum
 
 router = APIRouter(
     prefix="/users",
     tags=["Users"],
+    route_class=FastJSONRoute,
 )
 
 # Create User (admin can be created without auth for bootstrap; worker requires admin token)
@@ -34,6 +42,12 @@ def create_user(
     except Exception as e:
         return fail(message=str(e))
 
+# Export Workers as CSV / NDJSON (requires admin; streamed from a server-side cursor)
+@router.get("/export", response_model=None, response_class=StreamingResponse)
+def export_workers(format: ExportFormat = ExportFormat.csv, admin_id: int = Depends(get_current_admin_id)):
+    """ Stream every worker of the logged-in admin, newest first (?format=csv|ndjson) """
+    return export_response(UserService.workers_export_query(admin_id), format, "workers")
+
 # Get User by ID
 @router.get("/{user_id}", response_model=APIResponse[UserRead])
 def get_user(user_id: int, db: Session = Depends(get_db)):
@@ -46,11 +60,17 @@ def get_user(user_id: int, db: Session = Depends(get_db)):
     
 # Get All Workers by Admin
 @router.get("", response_model=APIResponse[list[UserRead]])
-def get_all_users(db: Session = Depends(get_db), admin_id: int = Depends(get_current_admin_id)):
-    """ Get all workers by admin """
+async def get_all_users(db: AsyncSession = Depends(get_async_db), admin_id: int = Depends(get_current_admin_id), page: PageParams = Depends(page_params), conditional: ConditionalRequest = Depends()):
+    """ Get all workers by admin (newest first, paginated with ?cursor=&limit=; 304 when If-None-Match has the current ETag) """
     try:
-        users = UserService(db).get_all_workers_by_admin(admin_id=admin_id)
-        return ok(data=users, message="Workers Retrieved Successfully")
+        service = AsyncUserService(db)
+        # Photo URLs in the body can expire (signed URLs), so the URL epoch is part of the version
+        version = (*await service.get_workers_version(admin_id), url_resolver().epoch)
+        if conditional.enabled and conditional.matches(f"workers:{admin_id}", version):
+            return conditional.not_modified()
+        result = await service.get_all_workers_by_admin(admin_id=admin_id, page=page)
+        conditional.send_etag()
+        return ok(data=result.items, message="Workers Retrieved Successfully", next_cursor=result.next_cursor)
     except Exception as e:
         return fail(message=str(e))
     
@@ -109,6 +129,45 @@ def update_worker_profile(
         return fail(message=str(e))
 
 
+# Upload own photo (worker; raw image body, e.g. Content-Type: image/jpeg)
+@router.put("/worker/me/photo", response_model=APIResponse[UserRead])
+def upload_worker_photo(
+    worker_id: int = Depends(get_current_worker_id),
+    db: Session = Depends(get_db),
+    photo: PhotoUpload = Depends(read_photo)
+):
+    """ Store the request body as the worker's photo; `photo_thumbnail` is the small square for lists """
+    try:
+        updated_user = UserService(db).set_photo(user_id=worker_id, upload=photo)
+        if not updated_user:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        return ok(data=updated_user, message="Photo Updated Successfully")
+    except HTTPException:
+        raise
+    except Exception as e:
+        return fail(message=str(e))
+
+
+# Upload a user's photo by Admin
+@router.put("/admin/{user_id}/photo", response_model=APIResponse[UserRead])
+def upload_user_photo_by_admin(
+    user_id: int,
+    admin_id: int = Depends(get_current_admin_id),
+    db: Session = Depends(get_db),
+    photo: PhotoUpload = Depends(read_photo)
+):
+    """ Store the request body as the user's photo """
+    try:
+        updated_user = UserService(db).set_photo(user_id=user_id, upload=photo)
+        if not updated_user:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        return ok(data=updated_user, message="Photo Updated Successfully by Admin")
+    except HTTPException:
+        raise
+    except Exception as e:
+        return fail(message=str(e))
+
+
 # Delete User  
 @router.delete("/{user_id}", response_model=APIResponse[bool])
 def delete_user(user_id: int, db: Session = Depends(get_db), admin_id: int = Depends(get_current_admin_id)):
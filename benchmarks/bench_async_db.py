@@ -0,0 +1,90 @@
+"""
+Sync vs async database path for the hot read endpoints.
+
+Mounts a sync twin of each async read route (same service query, blocking
+Session from get_db) and drives both through the ASGI app with httpx at the
+same concurrency, reporting req/s and latency percentiles.
+
+    python -m benchmarks.bench_async_db --jobs 2000 --requests 2000 --concurrency 64
+"""
+import argparse
+import asyncio
+
+import httpx
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_admin_id_for_jobs, get_current_admin_id
+from app.core.pagination import PageParams, page_params
+from app.core.response import ok
+from app.core.security import create_token
+from app.db.session import SessionLocal, async_engine, get_db
+from app.entities.job_application.service import JobApplicationApprovalService
+from app.entities.jobs.service import JobService
+from app.entities.user.service import UserService
+from app.main import app
+from benchmarks.common import print_table, run_concurrent, summarize
+from benchmarks.seed import drop_bench_rows, seed_tenant
+
+SYNC_PREFIX = "/__bench_sync"
+
+
+@app.get(f"{SYNC_PREFIX}/jobs", include_in_schema=False)
+def _sync_jobs(db: Session = Depends(get_db), admin_id: int = Depends(get_admin_id_for_jobs), page: PageParams = Depends(page_params)):
+    result = JobService(db).get_all_jobs(admin_id, page=page)
+    return ok(data=result.items, next_cursor=result.next_cursor)
+
+
+@app.get(f"{SYNC_PREFIX}/users", include_in_schema=False)
+def _sync_users(db: Session = Depends(get_db), admin_id: int = Depends(get_current_admin_id), page: PageParams = Depends(page_params)):
+    result = UserService(db).get_all_workers_by_admin(admin_id=admin_id, page=page)
+    return ok(data=result.items, next_cursor=result.next_cursor)
+
+
+@app.get(f"{SYNC_PREFIX}/approval-panel", include_in_schema=False)
+def _sync_approval_panel(db: Session = Depends(get_db), admin_id: int = Depends(get_current_admin_id), page: PageParams = Depends(page_params)):
+    result = JobApplicationApprovalService(db).get_all_job_applications(admin_id=admin_id, page=page)
+    return ok(data=result.items, next_cursor=result.next_cursor)
+
+
+ENDPOINTS = {
+    "jobs": ("/api/v1/jobs", f"{SYNC_PREFIX}/jobs"),
+    "users": ("/api/v1/users", f"{SYNC_PREFIX}/users"),
+    "approval-panel": ("/api/v1/job_applications/approval-panel", f"{SYNC_PREFIX}/approval-panel"),
+}
+
+
+async def bench(admin_id: int, requests: int, concurrency: int) -> list[dict]:
+    headers = {"Authorization": f"Bearer {create_token({'sub': str(admin_id), 'role': 'admin'})}"}
+    transport = httpx.ASGITransport(app=app)
+    rows = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        for name, (async_path, sync_path) in ENDPOINTS.items():
+            for mode, path in (("sync", sync_path), ("async", async_path)):
+                await client.get(path)  # warm the pools
+                latencies, elapsed = await run_concurrent(lambda: client.get(path), requests, concurrency)
+                rows.append(summarize(f"{name} [{mode}]", latencies, elapsed))
+    await async_engine.dispose()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=200)
+    parser.add_argument("--applications-per-job", type=int, default=1)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        admin_id = seed_tenant(db, jobs=args.jobs, workers=args.workers, applications_per_job=args.applications_per_job)
+    try:
+        print_table(asyncio.run(bench(admin_id, args.requests, args.concurrency)))
+    finally:
+        with SessionLocal() as db:
+            drop_bench_rows(db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Auth dependency overhead per request, with and without the verified-JWT cache.
+
+Mounts three trivial routes (no auth, admin auth, admin + worker-style
+dependency chain) and reports the added latency over the unauthenticated route.
+
+    python -m benchmarks.bench_auth --requests 5000
+"""
+import argparse
+import asyncio
+
+import httpx
+from fastapi import Depends
+
+from app.core.auth import get_admin_id_for_jobs, get_current_admin_id, token_cache
+from app.core.security import create_token
+from app.main import app
+from benchmarks.common import print_table, run_concurrent, summarize
+
+
+@app.get("/__bench_auth/none", include_in_schema=False)
+async def _none():
+    return {}
+
+
+@app.get("/__bench_auth/admin", include_in_schema=False)
+async def _admin(admin_id: int = Depends(get_current_admin_id)):
+    return {"id": admin_id}
+
+
+@app.get("/__bench_auth/chain", include_in_schema=False)
+async def _chain(admin_id: int = Depends(get_current_admin_id), job_admin_id: int = Depends(get_admin_id_for_jobs)):
+    return {"id": admin_id}
+
+
+async def bench(requests: int) -> list[dict]:
+    headers = {"Authorization": f"Bearer {create_token({'sub': '1', 'role': 'admin'})}"}
+    rows = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        for cache_size in (0, token_cache.max_size or 10000):
+            token_cache.max_size = cache_size
+            token_cache.clear()
+            for path in ("none", "admin", "chain"):
+                url = f"/__bench_auth/{path}"
+                await client.get(url)
+                latencies, elapsed = await run_concurrent(lambda: client.get(url), requests, 1)
+                rows.append(summarize(f"{path} [cache={'on' if cache_size else 'off'}]", latencies, elapsed))
+    print("token cache:", token_cache.stats())
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    print_table(asyncio.run(bench(args.requests)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+SMTP delivery: connection per message (previous EmailService) vs pooled vs one session per job batch.
+
+Runs against a local aiosmtpd sink, so numbers reflect protocol round trips and
+connection setup rather than a real provider's throttling.
+
+    python -m benchmarks.bench_email --messages 500
+"""
+import argparse
+import smtplib
+import socket
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.handlers import Sink
+
+from app.core.email import SMTPConnectionPool
+from benchmarks.common import percentile, print_table
+
+
+def _message(i: int) -> MIMEMultipart:
+    msg = MIMEMultipart()
+    msg["From"] = "bench@whenwework.local"
+    msg["To"] = f"worker{i}@whenwework.local"
+    msg["Subject"] = "Your OTP for WhenWeWork"
+    msg.attach(MIMEText(f"Your OTP is: {i:06d}", "plain"))
+    return msg
+
+
+def send_per_connection(host: str, port: int, msg: MIMEMultipart) -> None:
+    """The old EmailService.send_email: connect, EHLO, send, QUIT for every message."""
+    server = smtplib.SMTP(host, port)
+    server.ehlo()
+    server.send_message(msg)
+    server.quit()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def row(name: str, latencies: list[float], elapsed: float) -> dict:
+    return {
+        "mode": name,
+        "messages": len(latencies),
+        "msg_per_s": round(len(latencies) / elapsed, 1),
+        "caller_p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "caller_p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=500)
+    args = parser.parse_args()
+
+    sink = Sink()
+    host, port = "127.0.0.1", _free_port()
+    controller = Controller(sink, hostname=host, port=port)
+    controller.start()
+    messages = [_message(i) for i in range(args.messages)]
+    rows = []
+    try:
+        latencies = []
+        started = time.perf_counter()
+        for msg in messages:
+            t = time.perf_counter()
+            send_per_connection(host, port, msg)
+            latencies.append(time.perf_counter() - t)
+        rows.append(row("connection per message", latencies, time.perf_counter() - started))
+
+        pool = SMTPConnectionPool(host, port, "", "", size=2, require_tls=False)  # the sink offers no TLS or AUTH
+        latencies = []
+        started = time.perf_counter()
+        for msg in messages:
+            t = time.perf_counter()
+            pool.send([msg])
+            latencies.append(time.perf_counter() - t)
+        rows.append(row("pooled send_email", latencies, time.perf_counter() - started))
+
+        # What a job worker does: every email of a claimed batch over one session
+        latencies = []
+        started = time.perf_counter()
+        for i in range(0, len(messages), 50):
+            with pool.session():
+                for msg in messages[i:i + 50]:
+                    t = time.perf_counter()
+                    pool.send([msg])
+                    latencies.append(time.perf_counter() - t)
+        rows.append(row("job batch, one session", latencies, time.perf_counter() - started))
+
+        pool.close()
+    finally:
+        controller.stop()
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Polling fleet with and without ETags: bandwidth, DB statements and DB time.
+
+`--clients` dashboards poll GET /jobs, /jobs/stats and /users once per tick for
+`--ticks` ticks; every `--change-every` ticks the admin edits one job. The
+fleet runs twice: with ETAGS_ENABLED off (the old behaviour), then with ETags
+on and every client sending back If-None-Match.
+
+    python -m benchmarks.bench_etag --jobs 500 --workers 200 --clients 50 --ticks 20
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from sqlalchemy import text
+
+from app.config import settings
+from app.core.query_counter import observe_requests
+from app.core.security import create_token
+from app.db.session import SessionLocal
+from app.entities.jobs.stats import reconcile_job_stats
+from app.main import app
+from benchmarks.common import print_table
+from benchmarks.seed import drop_bench_rows, seed_tenant
+
+POLLED = ("/api/v1/jobs", "/api/v1/jobs/stats", "/api/v1/users")
+
+
+def _edit_one_job(admin_id: int, tick: int) -> None:
+    with SessionLocal() as db:
+        db.execute(
+            text("UPDATE jobs SET title = :title, updated_at = now() WHERE id = (SELECT min(id) FROM jobs WHERE admin_id = :a)"),
+            {"title": f"Edited at tick {tick}", "a": admin_id},
+        )
+        db.commit()
+
+
+async def fleet(admin_id: int, clients: int, ticks: int, change_every: int, use_etags: bool) -> dict:
+    headers = {"Authorization": f"Bearer {create_token({'sub': str(admin_id), 'role': 'admin'})}"}
+    settings.ETAGS_ENABLED = use_etags
+    etags = [{} for _ in range(clients)]
+    sent = not_modified = 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers, timeout=120) as client:
+        async def poll(cache: dict) -> tuple[int, int]:
+            size = hits = 0
+            for path in POLLED:
+                extra = {"If-None-Match": cache[path]} if path in cache else {}
+                response = await client.get(path, headers=extra)
+                size += len(response.content)
+                hits += response.status_code == 304
+                if response.status_code == 200 and "etag" in response.headers:
+                    cache[path] = response.headers["etag"]
+            return size, hits
+
+        with observe_requests() as requests:
+            started = time.perf_counter()
+            for tick in range(ticks):
+                if tick and tick % change_every == 0:
+                    _edit_one_job(admin_id, tick)
+                for size, hits in await asyncio.gather(*(poll(cache) for cache in etags)):
+                    sent += size
+                    not_modified += hits
+            elapsed = time.perf_counter() - started
+
+    total = clients * ticks * len(POLLED)
+    return {
+        "mode": "ETags on" if use_etags else "ETags off",
+        "requests": total,
+        "304s": not_modified,
+        "body_mb": round(sent / 2**20, 2),
+        "db_statements": sum(r.count for r in requests),
+        "db_ms": round(sum(r.seconds for r in requests) * 1000, 1),
+        "seconds": round(elapsed, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--change-every", type=int, default=5)
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        drop_bench_rows(db)
+        admin_id = seed_tenant(db, jobs=args.jobs, workers=args.workers, tag="etag")
+        reconcile_job_stats(db, admin_id)
+        db.execute(text("ANALYZE jobs, users"))
+        db.commit()
+    async def both() -> list[dict]:
+        # One event loop for both runs: the async engine's pooled connections belong to it
+        return [await fleet(admin_id, args.clients, args.ticks, args.change_every, use_etags) for use_etags in (False, True)]
+
+    try:
+        rows = asyncio.run(both())
+    finally:
+        with SessionLocal() as db:
+            drop_bench_rows(db)
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
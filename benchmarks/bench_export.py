@@ -0,0 +1,91 @@
+"""
+Streaming exports: GET /jobs/export for a tenant with millions of jobs, with the server's peak RSS.
+
+Seeds one admin with `--rows` jobs, starts the app under uvicorn in a
+subprocess and downloads the export over HTTP in every format, discarding
+the body as it arrives. The server's peak RSS (VmHWM) is read after a warm-up
+request and again after each export, so any growth with the row count shows
+up as a jump.
+
+    python -m benchmarks.bench_export --rows 5000000
+"""
+import argparse
+import time
+
+import httpx
+from sqlalchemy import text
+
+from app.core.security import create_token
+from app.db.session import SessionLocal
+from benchmarks.common import print_table, start_uvicorn
+from benchmarks.seed import drop_bench_rows, seed_tenant
+
+
+def _peak_rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError("VmHWM not available (Linux only)")
+
+
+def download(client: httpx.Client, path: str) -> tuple[int, int, float, float]:
+    """Stream `path` to nowhere; returns (bytes, lines, seconds to first byte, total seconds)."""
+    size = lines = 0
+    first_byte = None
+    started = time.perf_counter()
+    with client.stream("GET", path) as response:
+        response.raise_for_status()
+        for chunk in response.iter_bytes():
+            if first_byte is None:
+                first_byte = time.perf_counter() - started
+            size += len(chunk)
+            lines += chunk.count(b"\n")
+    return size, lines, first_byte or 0.0, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        drop_bench_rows(db)
+        started = time.perf_counter()
+        admin_id = seed_tenant(db, jobs=args.rows, workers=1, tag="export")
+        db.execute(text("ANALYZE jobs"))
+        db.commit()
+        print(f"seeded {args.rows} jobs in {time.perf_counter() - started:.1f}s")
+
+    server = start_uvicorn(args.port)
+    headers = {"Authorization": f"Bearer {create_token({'sub': str(admin_id), 'role': 'admin'})}"}
+    rows = []
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{args.port}/api/v1", headers=headers, timeout=None) as client:
+            client.get("/jobs", params={"limit": 1}).raise_for_status()
+            rows.append({"export": "(warm-up)", "rows": 0, "mb": 0, "first_byte_ms": 0, "seconds": 0, "rows_per_s": 0,
+                         "server_peak_rss_mb": round(_peak_rss_mb(server.pid), 1)})
+            for format in ("csv", "ndjson"):
+                size, lines, first_byte, elapsed = download(client, f"/jobs/export?format={format}")
+                exported = lines - (format == "csv")
+                assert exported == args.rows, f"{format}: exported {exported} of {args.rows} rows"
+                rows.append({
+                    "export": f"/jobs/export?format={format}",
+                    "rows": exported,
+                    "mb": round(size / 2**20, 1),
+                    "first_byte_ms": round(first_byte * 1000, 1),
+                    "seconds": round(elapsed, 1),
+                    "rows_per_s": round(exported / elapsed),
+                    "server_peak_rss_mb": round(_peak_rss_mb(server.pid), 1),
+                })
+    finally:
+        server.terminate()
+        server.wait()
+        with SessionLocal() as db:
+            drop_bench_rows(db)
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Job creation throughput: N x POST /jobs vs one POST /jobs/batch.
+
+    python -m benchmarks.bench_job_batch --jobs 1000 --concurrency 8
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from app.core.security import create_token
+from app.db.session import SessionLocal
+from app.main import app
+from benchmarks.common import print_table, run_concurrent
+from benchmarks.seed import drop_bench_rows, seed_tenant
+
+
+def _job(i: int) -> dict:
+    return {
+        "title": f"Bench shift {i}",
+        "description": "Created by bench_job_batch",
+        "status": "active",
+        "minimum_education": "none",
+        "job_category": "part_time",
+        "workers_required": 1 + i % 5,
+        "salary": 15 + i % 10,
+        "from_date_time": "2030-01-01T08:00:00Z",
+        "to_date_time": "2030-01-01T16:00:00Z",
+    }
+
+
+async def bench(admin_id: int, jobs: int, concurrency: int) -> list[dict]:
+    headers = {"Authorization": f"Bearer {create_token({'sub': str(admin_id), 'role': 'admin'})}"}
+    payloads = [_job(i) for i in range(jobs)]
+    rows = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers, timeout=300) as client:
+        await client.post("/api/v1/jobs", json=_job(-1))  # warm the pools
+
+        for label, workers in (("POST /jobs x N", 1), (f"POST /jobs x N (concurrency {concurrency})", concurrency)):
+            items = iter(payloads)
+            _, elapsed = await run_concurrent(lambda: client.post("/api/v1/jobs", json=next(items)), jobs, workers)
+            rows.append({"mode": label, "jobs": jobs, "seconds": round(elapsed, 3), "jobs_per_s": round(jobs / elapsed, 1)})
+
+        started = time.perf_counter()
+        response = await client.post("/api/v1/jobs/batch", json=payloads)
+        elapsed = time.perf_counter() - started
+        assert response.json()["success"], response.text[:500]
+        rows.append({"mode": "POST /jobs/batch x 1", "jobs": jobs, "seconds": round(elapsed, 3), "jobs_per_s": round(jobs / elapsed, 1)})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    with SessionLocal() as db:
+        admin_id = seed_tenant(db, jobs=0, workers=0, tag="batch")
+    try:
+        print_table(asyncio.run(bench(admin_id, args.jobs, args.concurrency)))
+    finally:
+        with SessionLocal() as db:
+            drop_bench_rows(db)
+
+
+if __name__ == "__main__":
+    main()
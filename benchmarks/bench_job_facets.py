@@ -0,0 +1,157 @@
+"""
+Job board facet counts: GET /jobs/facets vs counting client-side over the full job list.
+
+Seeds one tenant per `--sizes` entry (jobs per tenant). Requests go in-process
+through httpx's ASGI transport as that tenant's admin.
+- full fetch: what the UIs do today. They page through GET /jobs at
+  PAGE_MAX_LIMIT per request and count status / category / salary bucket
+  locally. JobRead has no salary_type, so that facet is not available to
+  them at all.
+- 4 GROUP BY queries: one aggregate per facet, straight SQL, as the
+  alternative to GROUPING SETS.
+- facets, cold: GET /jobs/facets with the facet cache cleared, which
+  means the version query plus one GROUPING SETS aggregate.
+- facets, warm: the version query and a cache hit.
+- facets, 304: If-None-Match with the current ETag.
+- facets, filtered: ?status=active, cold.
+
+    python -m benchmarks.bench_job_facets --sizes 1000,10000,100000
+"""
+import argparse
+import asyncio
+import bisect
+import time
+from collections import Counter
+
+import httpx
+from sqlalchemy import func, select, text
+
+from app.config import settings
+from app.core.security import create_token, get_password_hash
+from app.db.session import SessionLocal
+from app.entities.jobs.model import Job
+from app.entities.jobs.service import facet_cache
+from benchmarks.common import percentile, print_table
+from benchmarks.seed import BENCH_PASSWORD, drop_bench_rows, seed_tenant
+
+FACETS = "/api/v1/jobs/facets"
+
+
+def seed(sizes: list[int]) -> list[int]:
+    password_hash = get_password_hash(BENCH_PASSWORD)
+    with SessionLocal() as db:
+        drop_bench_rows(db)
+        admin_ids = [
+            seed_tenant(db, jobs=jobs, workers=1, tag=f"facets{jobs}", password_hash=password_hash) for jobs in sizes
+        ]
+        db.commit()
+        # VACUUM sets the visibility map so the covering indexes serve index-only scans, as autovacuum would
+        with db.get_bind().connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM (ANALYZE) jobs"))
+    return admin_ids
+
+
+def separate_group_bys(admin_id: int) -> None:
+    bucket = func.width_bucket(Job.salary, text(f"ARRAY{settings.JOB_FACET_SALARY_BOUNDS}"))
+    with SessionLocal() as db:
+        for columns in ((Job.status,), (Job.job_category,), (Job.salary_type,), (Job.salary_type, bucket)):
+            db.execute(select(*columns, func.count()).where(Job.admin_id == admin_id).group_by(*columns)).all()
+
+
+async def full_fetch(client: httpx.AsyncClient) -> tuple[float, int, int]:
+    """(seconds, requests, bytes) for paging through GET /jobs and counting every facet locally."""
+    started = time.perf_counter()
+    counts, requests, size, cursor = Counter(), 0, 0, None
+    bounds = settings.JOB_FACET_SALARY_BOUNDS
+    while True:
+        params = {"limit": settings.PAGE_MAX_LIMIT} | ({"cursor": cursor} if cursor else {})
+        response = await client.get("/api/v1/jobs", params=params)
+        requests += 1
+        size += len(response.content)
+        body = response.json()
+        for job in body["data"]:
+            counts.update((
+                ("status", job["status"]),
+                ("job_category", job["job_category"]),
+                ("salary_type", job.get("salary_type")),
+                ("salary", job.get("salary_type"), bisect.bisect_right(bounds, job["salary"])),
+            ))
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    return time.perf_counter() - started, requests, size
+
+
+async def timed_get(client: httpx.AsyncClient, repeat: int, params=None, headers=None, cold=False) -> tuple[list[float], httpx.Response]:
+    samples = []
+    for _ in range(repeat):
+        if cold:
+            facet_cache.clear()
+        started = time.perf_counter()
+        response = await client.get(FACETS, params=params, headers=headers)
+        samples.append(time.perf_counter() - started)
+    return samples, response
+
+
+async def run_tenant(app, admin_id: int, jobs: int, repeat: int) -> list[dict]:
+    token = create_token({"sub": str(admin_id), "role": "admin"})
+    transport = httpx.ASGITransport(app=app)
+    rows = []
+
+    def row(name: str, samples: list[float], requests: int, size: int) -> None:
+        rows.append({
+            "jobs": jobs,
+            "how": name,
+            "requests": requests,
+            "kb": round(size / 1024, 1),
+            "p50_ms": round(percentile(samples, 50) * 1e3, 1),
+            "p95_ms": round(percentile(samples, 95) * 1e3, 1) if len(samples) > 1 else "-",
+        })
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers={"Authorization": f"Bearer {token}"}, timeout=600) as client:
+        seconds, requests, size = await full_fetch(client)
+        row("full fetch + client counts", [seconds], requests, size)
+
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            separate_group_bys(admin_id)
+            samples.append(time.perf_counter() - started)
+        row("4 GROUP BY queries (SQL only)", samples, 4, 0)
+
+        samples, response = await timed_get(client, repeat, cold=True)
+        assert response.json()["data"]["total"] == jobs, response.text
+        row("facets, cold", samples, 1, len(response.content))
+        samples, response = await timed_get(client, repeat)
+        row("facets, warm", samples, 1, len(response.content))
+        etag = response.headers["etag"]
+        samples, response = await timed_get(client, repeat, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        row("facets, 304", samples, 1, 0)
+        samples, response = await timed_get(client, repeat, params={"status": "active"}, cold=True)
+        row("facets, ?status=active, cold", samples, 1, len(response.content))
+    return rows
+
+
+async def run(admin_ids: list[int], sizes: list[int], repeat: int) -> list[dict]:
+    from app.main import app
+
+    rows = []
+    for admin_id, jobs in zip(admin_ids, sizes):
+        rows += await run_tenant(app, admin_id, jobs, repeat)
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Jobs per tenant, comma separated")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    admin_ids = seed(sizes)
+    print_table(asyncio.run(run(admin_ids, sizes, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Background job queue: enqueue/dequeue throughput and a restart durability check.
+
+    python -m benchmarks.bench_job_queue --jobs 5000 --workers 4
+
+The durability check enqueues jobs from a child process, lets that process claim
+one of them, SIGKILLs it mid-job, and then shows a fresh worker pool finishing
+every job, including the one that was in flight.
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import time
+
+from sqlalchemy import delete, func, select
+
+from app.core.job_queue import BackgroundJob, JobWorkerPool, enqueue, process_next, register_task
+from app.db.session import SessionLocal
+from benchmarks.common import print_table
+
+NOOP_TASK = "bench_noop"
+HANG_TASK = "bench_hang"
+
+
+@register_task(NOOP_TASK)
+def _noop(db, payload) -> None:
+    pass
+
+
+@register_task(HANG_TASK)
+def _hang(db, payload) -> None:
+    if payload.get("hang"):
+        time.sleep(3600)
+
+
+def _pending(tasks: tuple[str, ...]) -> int:
+    with SessionLocal() as db:
+        return db.scalar(select(func.count()).select_from(BackgroundJob).where(BackgroundJob.task.in_(tasks)))
+
+
+def _clear() -> None:
+    with SessionLocal() as db:
+        db.execute(delete(BackgroundJob).where(BackgroundJob.task.in_((NOOP_TASK, HANG_TASK))))
+        db.commit()
+
+
+def bench_enqueue(jobs: int) -> list[dict]:
+    rows = []
+    with SessionLocal() as db:
+        started = time.perf_counter()
+        for i in range(jobs):
+            enqueue(db, NOOP_TASK, {"i": i})
+            db.commit()
+        elapsed = time.perf_counter() - started
+        rows.append({"phase": "enqueue (commit per job)", "jobs": jobs, "jobs_per_s": round(jobs / elapsed, 1)})
+
+        started = time.perf_counter()
+        for i in range(jobs):
+            enqueue(db, NOOP_TASK, {"i": i})
+        db.commit()
+        elapsed = time.perf_counter() - started
+        rows.append({"phase": "enqueue (one transaction)", "jobs": jobs, "jobs_per_s": round(jobs / elapsed, 1)})
+    return rows
+
+
+def bench_dequeue(workers: int) -> dict:
+    total = _pending((NOOP_TASK,))
+    pool = JobWorkerPool(SessionLocal, workers, poll_interval=0.05)
+    started = time.perf_counter()
+    pool.start()
+    while _pending((NOOP_TASK,)):
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - started
+    pool.stop()
+    return {"phase": f"dequeue ({workers} workers)", "jobs": total, "jobs_per_s": round(total / elapsed, 1)}
+
+
+def _crashing_producer(jobs: int) -> None:
+    with SessionLocal() as db:
+        enqueue(db, HANG_TASK, {"hang": True})
+        db.commit()  # earliest run_at, so it is the job this process claims
+        for i in range(jobs):
+            enqueue(db, HANG_TASK, {"i": i})
+        db.commit()
+        process_next(db)  # claims the hanging job and blocks inside its handler
+
+
+def durability_check(jobs: int) -> None:
+    child = multiprocessing.get_context("spawn").Process(target=_crashing_producer, args=(jobs,))
+    child.start()
+    while _pending((HANG_TASK,)) < jobs + 1:
+        time.sleep(0.1)
+    time.sleep(1)
+    os.kill(child.pid, signal.SIGKILL)
+    child.join()
+    print(f"producer killed with {_pending((HANG_TASK,))} jobs in the table (one was mid-run)")
+
+    # The in-flight job would hang again, so the restarted pool treats it as a normal job
+    with SessionLocal() as db:
+        for job in db.scalars(select(BackgroundJob).where(BackgroundJob.task == HANG_TASK)):
+            job.payload = {"restarted": True}
+        db.commit()
+    pool = JobWorkerPool(SessionLocal, 2, poll_interval=0.05)
+    pool.start()
+    deadline = time.monotonic() + 60
+    while _pending((HANG_TASK,)) and time.monotonic() < deadline:
+        time.sleep(0.1)
+    pool.stop()
+    left = _pending((HANG_TASK,))
+    print("durability check:", "all jobs processed after restart" if not left else f"{left} jobs left")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    _clear()
+    try:
+        rows = bench_enqueue(args.jobs)
+        rows.append(bench_dequeue(args.workers))
+        print_table(rows)
+        durability_check(min(args.jobs, 100))
+    finally:
+        _clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Keyword search over a large jobs table: GET /jobs/search vs downloading every job and filtering client-side.
+
+Seeds `--tenants` tenants of `--jobs-per-tenant` jobs each (the defaults
+give 1M jobs). Requests go in-process through httpx's ASGI transport as
+one tenant's admin.
+- full fetch: what clients do today. They page through GET /jobs at
+  PAGE_MAX_LIMIT per request, then keep the jobs whose text contains the
+  keyword.
+- search: the first page (`--limit`) of GET /jobs/search, from queries
+  with very different selectivity. The seed gives titles five role words
+  (20% each), descriptions three of JOB_WORDS (~8%) and a permit<n> token
+  (0.02%).
+
+`matches` is the tenant's total match count. `plan` shows whether
+Postgres used the GIN index.
+
+    python -m benchmarks.bench_job_search --tenants 10 --jobs-per-tenant 100000
+    python -m benchmarks.bench_job_search --skip-seed   # reuse seeded rows
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+
+import httpx
+from sqlalchemy import func, select, text
+
+from app.config import settings
+from app.core.pagination import RankedPageParams
+from app.core.security import create_token, get_password_hash
+from app.db.session import SessionLocal
+from app.entities.jobs.model import Job
+from app.entities.jobs.service import _jobs_search_query
+from app.entities.user.modal import User
+from benchmarks.common import percentile, print_table
+from benchmarks.seed import BENCH_EMAIL_DOMAIN, BENCH_PASSWORD, drop_bench_rows, seed_tenant
+
+QUERIES = {
+    "rare token": "permit417",
+    "one description word": "forklift",
+    "title word": "barista",
+    "two words": "forklift overnight",
+    "phrase": '"forklift warehouse"',
+    "word minus word": "forklift -overnight",
+}
+
+
+def seed(tenants: int, jobs: int) -> None:
+    password_hash = get_password_hash(BENCH_PASSWORD)
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        drop_bench_rows(db)
+        for i in range(tenants):
+            seed_tenant(db, jobs=jobs, workers=1, tag=f"search{i}", password_hash=password_hash)
+        db.execute(text("ANALYZE jobs"))
+        db.commit()
+    print(f"seeded {tenants * jobs} jobs in {time.perf_counter() - started:.1f}s")
+
+
+def tenant() -> tuple[int, int]:
+    """(admin_id, job count) of the first seeded search tenant."""
+    with SessionLocal() as db:
+        admin_id = db.scalar(select(User.id).where(User.email == f"admin-search0@{BENCH_EMAIL_DOMAIN}"))
+        if admin_id is None:
+            raise SystemExit("No seeded search tenant; run without --skip-seed first")
+        jobs = db.scalar(select(func.count()).select_from(Job).where(Job.admin_id == admin_id))
+        return admin_id, jobs
+
+
+def query_facts(admin_id: int, q: str) -> tuple[int, str]:
+    """(match count, index used by the search plan)."""
+    stmt = _jobs_search_query(admin_id, q, RankedPageParams(limit=settings.PAGE_DEFAULT_LIMIT))
+    with SessionLocal() as db:
+        matches = db.scalar(
+            select(func.count()).select_from(Job)
+            .where(Job.admin_id == admin_id, Job.search_vector.op("@@")(func.websearch_to_tsquery(text("'english'::regconfig"), q)))
+        )
+        compiled = stmt.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+        plan = json.dumps(db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar())
+    return matches, "gin" if "ix_jobs_search_vector" in plan else "no index"
+
+
+async def full_fetch(client: httpx.AsyncClient, keyword: str) -> tuple[float, int, int, int]:
+    """(seconds, requests, bytes, client-side matches) for paging through GET /jobs and filtering."""
+    started = time.perf_counter()
+    jobs, requests, size, cursor = [], 0, 0, None
+    while True:
+        params = {"limit": settings.PAGE_MAX_LIMIT} | ({"cursor": cursor} if cursor else {})
+        response = await client.get("/api/v1/jobs", params=params)
+        requests += 1
+        size += len(response.content)
+        body = response.json()
+        jobs.extend(body["data"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    word = re.compile(rf"\b{re.escape(keyword)}\b", re.IGNORECASE)
+    matches = [j for j in jobs if word.search(j["title"]) or word.search(j["description"])]
+    return time.perf_counter() - started, requests, size, len(matches)
+
+
+async def run(args) -> None:
+    from app.main import app
+
+    admin_id, jobs = tenant()
+    token = create_token({"sub": str(admin_id), "role": "admin"})
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers={"Authorization": f"Bearer {token}"}, timeout=600) as client:
+        await client.get("/api/v1/jobs/search", params={"q": "warmup"})
+        rows = []
+        for name, q in QUERIES.items():
+            samples, size = [], 0
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                response = await client.get("/api/v1/jobs/search", params={"q": q, "limit": args.limit})
+                samples.append(time.perf_counter() - started)
+                size = len(response.content)
+                assert response.json()["success"], response.text
+            matches, plan = query_facts(admin_id, q)
+            rows.append({
+                "request": f"search {name}: {q}",
+                "matches": matches,
+                "plan": plan,
+                "requests": 1,
+                "kb": round(size / 1024, 1),
+                "p50_ms": round(percentile(samples, 50) * 1e3, 1),
+                "p95_ms": round(percentile(samples, 95) * 1e3, 1),
+            })
+        for keyword in ("forklift", "permit417"):
+            seconds, requests, size, matches = await full_fetch(client, keyword)
+            rows.insert(0, {
+                "request": f"full fetch + client filter: {keyword}",
+                "matches": matches,
+                "plan": "-",
+                "requests": requests,
+                "kb": round(size / 1024, 1),
+                "p50_ms": round(seconds * 1e3, 1),
+                "p95_ms": "-",
+            })
+    print(f"tenant with {jobs} jobs; search pages of {args.limit}")
+    print_table(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tenants", type=int, default=10)
+    parser.add_argument("--jobs-per-tenant", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=20, help="Search page size")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+    if not args.skip_seed:
+        seed(args.tenants, args.jobs_per_tenant)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
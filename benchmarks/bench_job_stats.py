@@ -0,0 +1,83 @@
+"""
+GET /jobs/stats: full aggregate over the admin's jobs vs the job_stats summary row.
+
+Seeds `--admins` tenants with `--jobs` jobs each (100k by default), rebuilds
+job_stats with the reconciliation command, then times the old aggregate
+(compute_job_stats) against the primary-key read (read_job_stats) and the
+endpoint itself. Also reports the cost the summary adds to create_job.
+
+    python -m benchmarks.bench_job_stats --admins 3 --jobs 100000 --repeat 200
+"""
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.db.session import SessionLocal
+from app.entities.jobs.model import JobCategory, JobStatus
+from app.entities.jobs.schema import JobCreate
+from app.entities.jobs.service import JobService
+from app.entities.jobs.stats import compute_job_stats, job_stats_drift, read_job_stats, reconcile_job_stats
+from benchmarks.common import print_table, summarize, timed
+from benchmarks.seed import drop_bench_rows, seed_tenant
+
+
+def _job() -> JobCreate:
+    now = datetime.now(timezone.utc)
+    return JobCreate(
+        title="Bench shift",
+        description="Created by bench_job_stats",
+        status=JobStatus.active,
+        minimum_education="none",
+        job_category=JobCategory.part_time,
+        workers_required=2,
+        salary=20,
+        from_date_time=now,
+        to_date_time=now + timedelta(hours=4),
+    )
+
+
+def bench(admins: int, jobs: int, repeat: int) -> list[dict]:
+    rows = []
+    with SessionLocal() as db:
+        admin_ids = [seed_tenant(db, jobs=jobs, workers=10, tag=f"stats{i}") for i in range(admins)]
+        started = time.perf_counter()
+        reconcile_job_stats(db)
+        print(f"reconcile_job_stats: {time.perf_counter() - started:.2f}s for {admins * jobs} jobs")
+
+        admin_id = admin_ids[-1]
+        assert compute_job_stats(db, admin_id) == read_job_stats(db, admin_id)
+        for name, fn in (
+            ("aggregate (COUNT/SUM over jobs)", lambda: compute_job_stats(db, admin_id)),
+            ("job_stats primary-key read", lambda: read_job_stats(db, admin_id)),
+            ("JobService.get_jobs_stats", lambda: JobService(db).get_jobs_stats(admin_id)),
+        ):
+            fn()
+            samples = timed(fn, repeat)
+            rows.append(summarize(name, samples, sum(samples)))
+            db.rollback()
+
+        # Write-side cost: create_job now also upserts the summary row
+        service = JobService(db)
+        samples = timed(lambda: service.create_job(_job(), admin_id=admin_id), repeat)
+        rows.append(summarize("create_job (+ summary upsert)", samples, sum(samples)))
+        drifted = job_stats_drift(db)
+        print(f"admins out of sync after writes: {len(drifted)}")
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--admins", type=int, default=3)
+    parser.add_argument("--jobs", type=int, default=100_000, help="Jobs per admin")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    try:
+        print_table(bench(args.admins, args.jobs, args.repeat))
+    finally:
+        with SessionLocal() as db:
+            drop_bench_rows(db)
+            reconcile_job_stats(db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Login throughput and collateral latency while a login storm runs.
+
+Drives POST /users/login at high concurrency and, at the same time, a steady
+trickle of GET /jobs; reports login req/s and the /jobs percentiles, plus the
+hashing executor's queue-time stats. Compare executors with:
+
+    python -m benchmarks.bench_login_storm --executor process
+    python -m benchmarks.bench_login_storm --executor thread
+"""
+import argparse
+import asyncio
+import os
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--executor", choices=("process", "thread"), default="process")
+    parser.add_argument("--hash-workers", type=int, default=2)
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--login-concurrency", type=int, default=64)
+    parser.add_argument("--probe-concurrency", type=int, default=4)
+    return parser.parse_args()
+
+
+async def storm(args: argparse.Namespace, admin_id: int) -> list[dict]:
+    import httpx
+
+    from app.core.security import create_token, hashing_stats
+    from app.main import app
+    from benchmarks.common import run_concurrent, summarize
+    from benchmarks.seed import BENCH_EMAIL_DOMAIN, BENCH_PASSWORD
+
+    token = create_token({"sub": str(admin_id), "role": "admin"})
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        login = {"email": f"admin-storm@{BENCH_EMAIL_DOMAIN}", "password": BENCH_PASSWORD}
+        await client.post("/api/v1/users/login", json=login)  # start the hashing workers
+        probe_latencies: list[float] = []
+        done = asyncio.Event()
+
+        async def probe() -> None:
+            headers = {"Authorization": f"Bearer {token}"}
+            while not done.is_set():
+                latencies, _ = await run_concurrent(lambda: client.get("/api/v1/jobs", headers=headers), 1, 1)
+                probe_latencies.extend(latencies)
+
+        probes = [asyncio.create_task(probe()) for _ in range(args.probe_concurrency)]
+        latencies, elapsed = await run_concurrent(
+            lambda: client.post("/api/v1/users/login", json=login), args.logins, args.login_concurrency
+        )
+        done.set()
+        await asyncio.gather(*probes)
+    rows = [
+        summarize(f"login [{args.executor}]", latencies, elapsed),
+        summarize(f"GET /jobs during storm [{args.executor}]", probe_latencies, elapsed),
+    ]
+    print("hashing executor:", hashing_stats.snapshot())
+    return rows
+
+
+def main() -> None:
+    args = parse_args()
+    os.environ["PASSWORD_HASH_EXECUTOR"] = args.executor
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.hash_workers)
+
+    from app.core.security import shutdown_hashing
+    from app.db.session import SessionLocal
+    from benchmarks.common import print_table
+    from benchmarks.seed import drop_bench_rows, seed_tenant
+
+    with SessionLocal() as db:
+        admin_id = seed_tenant(db, jobs=200, workers=10, tag="storm")
+    try:
+        print_table(asyncio.run(storm(args, admin_id)))
+    finally:
+        shutdown_hashing()
+        with SessionLocal() as db:
+            drop_bench_rows(db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Instrumentation overhead of app.core.metrics: MetricsMiddleware per request and the instrumented pool per checkout.
+
+Middleware: a bare ASGI app that only matches a route and sends a 200 is
+called `--requests` times directly, with and without MetricsMiddleware
+around it. The difference per call is what the middleware adds to every
+request. The fastest of `--repeat` runs is reported, so scheduler noise does
+not count against either side.
+
+Pool: `--checkouts` checkouts and checkins on a QueuePool and on an
+InstrumentedQueuePool, both against DATABASE_URL with reset-on-return off,
+so neither side makes a database round trip once the connection is open.
+
+    python -m benchmarks.bench_metrics --requests 200000 --checkouts 50000
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from app.config import settings
+from app.core.metrics import REQUEST_LATENCY, InstrumentedQueuePool, MetricsMiddleware
+from benchmarks.common import print_table
+
+BUDGET_US = 20.0
+
+
+class _Route:
+    path = "/api/v1/jobs/{job_id}"
+
+
+async def bare_app(scope, receive, send):
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message):
+    pass
+
+
+async def drive(app, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app({"type": "http", "method": "GET", "path": "/api/v1/jobs/1"}, _receive, _send)
+    return time.perf_counter() - started
+
+
+def checkouts(poolclass, count: int) -> float:
+    engine = create_engine(settings.DATABASE_URL, poolclass=poolclass, pool_size=1, max_overflow=0, pool_reset_on_return=None)
+    try:
+        engine.pool.connect().close()
+        started = time.perf_counter()
+        for _ in range(count):
+            engine.pool.connect().close()
+        return time.perf_counter() - started
+    finally:
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--checkouts", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    instrumented = MetricsMiddleware(bare_app)
+
+    async def middleware_runs() -> tuple[float, float]:
+        bare = min([await drive(bare_app, args.requests) for _ in range(args.repeat)])
+        wrapped = min([await drive(instrumented, args.requests) for _ in range(args.repeat)])
+        return bare, wrapped
+
+    bare, wrapped = asyncio.run(middleware_runs())
+    assert REQUEST_LATENCY.count("GET", _Route.path) == args.requests * args.repeat
+    # Interleaved so both pool classes see the same machine conditions
+    pool_runs = [(checkouts(QueuePool, args.checkouts), checkouts(InstrumentedQueuePool, args.checkouts)) for _ in range(args.repeat)]
+    plain_pool = min(plain for plain, _ in pool_runs)
+    instrumented_pool = min(instrumented for _, instrumented in pool_runs)
+
+    def row(what: str, count: int, base: float, measured: float) -> dict:
+        return {
+            "what": what,
+            "calls": count,
+            "base_us": round(base / count * 1e6, 2),
+            "instrumented_us": round(measured / count * 1e6, 2),
+            "overhead_us": round((measured - base) / count * 1e6, 2),
+        }
+
+    rows = [
+        row("ASGI request (MetricsMiddleware)", args.requests, bare, wrapped),
+        row("pool checkout + checkin", args.checkouts, plain_pool, instrumented_pool),
+    ]
+    print_table(rows)
+    total = sum(max(0.0, r["overhead_us"]) for r in rows)
+    if total > BUDGET_US:
+        sys.exit(f"Instrumentation adds {total:.2f} us per request with one checkout (budget {BUDGET_US} us)")
+    print(f"OK: {total:.2f} us per request with one checkout (budget {BUDGET_US} us)")
+
+
+if __name__ == "__main__":
+    main()
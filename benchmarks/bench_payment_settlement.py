@@ -0,0 +1,99 @@
+"""
+Payroll settlement: one PUT /admin/revenue per worker vs PUT /admin/revenue/bulk.
+
+Seeds `--rows` pending payments, times the per-pair endpoint on a sample of
+`--single-rows` (and projects it to all rows), then settles every row with one
+bulk request by pairs and one by filter.
+
+    python -m benchmarks.bench_payment_settlement --rows 10000 --single-rows 1000
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from sqlalchemy import text
+
+from app.core.security import create_token
+from app.db.session import SessionLocal
+from app.main import app
+from benchmarks.common import print_table
+from benchmarks.seed import drop_bench_rows, seed_tenant
+
+PENDING_SQL = (
+    "UPDATE job_applications SET work_status = 'completed', payment_status = 'pending' "
+    "WHERE job_id IN (SELECT id FROM jobs WHERE admin_id = :a)"
+)
+
+
+def _reset_pending(admin_id: int) -> list[tuple[int, int]]:
+    with SessionLocal() as db:
+        db.execute(text(PENDING_SQL), {"a": admin_id})
+        db.commit()
+        return [tuple(row) for row in db.execute(
+            text("SELECT ja.job_id, ja.worker_id FROM job_applications ja JOIN jobs j ON j.id = ja.job_id WHERE j.admin_id = :a ORDER BY ja.id"),
+            {"a": admin_id},
+        )]
+
+
+async def bench(admin_id: int, single_rows: int) -> list[dict]:
+    headers = {"Authorization": f"Bearer {create_token({'sub': str(admin_id), 'role': 'admin'})}"}
+    rows = []
+
+    def row(mode: str, count: int, elapsed: float, projected: float | None = None) -> dict:
+        return {
+            "mode": mode,
+            "rows": count,
+            "seconds": round(elapsed, 3),
+            "rows_per_s": round(count / elapsed, 1),
+            "seconds_for_all": round(projected if projected is not None else elapsed, 2),
+        }
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers, timeout=600) as client:
+        pairs = _reset_pending(admin_id)
+        sample = pairs[:single_rows]
+        started = time.perf_counter()
+        for job_id, worker_id in sample:
+            response = await client.put("/api/v1/job_applications/admin/revenue", json={"job_id": job_id, "worker_id": worker_id, "payment_status": "paid"})
+            assert response.json()["success"], response.text[:300]
+        elapsed = time.perf_counter() - started
+        rows.append(row("PUT /admin/revenue x N", len(sample), elapsed, elapsed / len(sample) * len(pairs)))
+
+        pairs = _reset_pending(admin_id)
+        body = {"payment_status": "paid", "pairs": [{"job_id": j, "worker_id": w} for j, w in pairs]}
+        started = time.perf_counter()
+        response = await client.put("/api/v1/job_applications/admin/revenue/bulk", json=body)
+        elapsed = time.perf_counter() - started
+        result = response.json()
+        assert result["success"] and result["data"]["updated"] == len(pairs), response.text[:300]
+        rows.append(row("PUT /admin/revenue/bulk (pairs)", len(pairs), elapsed))
+
+        pairs = _reset_pending(admin_id)
+        started = time.perf_counter()
+        response = await client.put("/api/v1/job_applications/admin/revenue/bulk", json={"payment_status": "paid", "before": "2100-01-01T00:00:00Z"})
+        elapsed = time.perf_counter() - started
+        result = response.json()
+        assert result["success"] and result["data"]["updated"] == len(pairs), response.text[:300]
+        rows.append(row("PUT /admin/revenue/bulk (filter)", len(pairs), elapsed))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000, help="Pending payments to settle")
+    parser.add_argument("--single-rows", type=int, default=1000, help="Sample size for the per-pair endpoint")
+    args = parser.parse_args()
+    per_job = 10
+    with SessionLocal() as db:
+        drop_bench_rows(db)
+        admin_id = seed_tenant(db, jobs=-(-args.rows // per_job), workers=max(per_job, 100), applications_per_job=per_job, tag="payroll")
+    try:
+        print_table(asyncio.run(bench(admin_id, args.single_rows)))
+    finally:
+        with SessionLocal() as db:
+            drop_bench_rows(db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Photo pipeline (app.core.photos): render CPU, event-loop stalls, dedupe cost and list image payload.
+
+The input is a synthetic 12 MP phone JPEG (4032x3024).
+- CPU: `render_variants`, which uses draft-mode decode and cascaded
+  squares, against a naive pass that fully decodes the original and
+  resizes it once per variant.
+- Loop lag: the worst delay of a 5 ms asyncio ticker while `--uploads`
+  photos are rendered either inline on the event loop or on the photo
+  process pool.
+- Dedupe: SHA-256 of the upload, which is all a repeat upload costs
+  besides one indexed lookup, against a render.
+- Payload: image bytes a client downloads to draw one list page of
+  `--page` worker avatars, from the original upload down to the list
+  thumbnail.
+
+    python -m benchmarks.bench_photos --uploads 8 --page 50
+"""
+import argparse
+import asyncio
+import hashlib
+import io
+import time
+
+from app.config import settings
+from app.core import photos
+from benchmarks.common import percentile, print_table, timed
+
+
+def phone_photo(width: int = 4032, height: int = 3024) -> bytes:
+    from PIL import Image
+
+    scene = Image.effect_mandelbrot((width, height), (-2.2, -1.2, 1.0, 1.2), 80).convert("RGB")
+    grain = Image.effect_noise((width, height), 24).convert("RGB")
+    buffer = io.BytesIO()
+    Image.blend(scene, grain, 0.25).save(buffer, "JPEG", quality=92)
+    return buffer.getvalue()
+
+
+def render(data: bytes) -> dict[str, bytes]:
+    return photos.render_variants(
+        data, tuple(settings.PHOTO_SIZES), settings.PHOTO_MAX_DIMENSION, settings.PHOTO_QUALITY, settings.PHOTO_MAX_PIXELS
+    )
+
+
+def render_naive(data: bytes) -> dict[str, bytes]:
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as source:
+        image = ImageOps.exif_transpose(source).convert("RGB")
+    full = image.resize((settings.PHOTO_MAX_DIMENSION, settings.PHOTO_MAX_DIMENSION * image.height // image.width), Image.Resampling.LANCZOS)
+    variants = {photos.FULL: photos._encode(full, settings.PHOTO_QUALITY)}
+    for size in settings.PHOTO_SIZES:
+        variants[str(size)] = photos._encode(ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS), settings.PHOTO_QUALITY)
+    return variants
+
+
+async def loop_lag(work, uploads: int, data: bytes) -> list[float]:
+    """Delays of a 5 ms ticker while `work` renders `uploads` photos."""
+    lags = []
+    stop = asyncio.Event()
+
+    async def ticker() -> None:
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lags.append(time.perf_counter() - started - 0.005)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.02)
+    await asyncio.gather(*(work(data) for _ in range(uploads)))
+    stop.set()
+    await task
+    return lags
+
+
+async def inline(data: bytes) -> None:
+    render(data)
+
+
+async def on_pool(data: bytes) -> None:
+    await asyncio.get_running_loop().run_in_executor(None, photos.render_photo, data)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--uploads", type=int, default=8, help="Photos rendered per loop-lag run")
+    parser.add_argument("--repeat", type=int, default=5, help="Iterations for the CPU timings")
+    parser.add_argument("--page", type=int, default=50, help="Avatars on one list page")
+    args = parser.parse_args()
+
+    data = phone_photo()
+    photos.render_photo(data)  # start the executor workers
+
+    variants = render(data)
+    rows = []
+    for name, fn in (("naive (full decode)", render_naive), ("render_variants", render), ("sha256 (dedupe hit)", lambda d: hashlib.sha256(d).digest())):
+        samples = timed(lambda: fn(data), args.repeat)
+        rows.append({"cpu": name, "p50_ms": round(percentile(samples, 50) * 1e3, 1), "max_ms": round(max(samples) * 1e3, 1)})
+    print(f"input {len(data) / 1e6:.1f} MB JPEG, workers={settings.PHOTO_WORKERS}")
+    print_table(rows)
+
+    rows = []
+    for name, work in (("inline on the event loop", inline), ("photo process pool", on_pool)):
+        lags = asyncio.run(loop_lag(work, args.uploads, data))
+        rows.append({
+            "render": name,
+            "uploads": args.uploads,
+            "ticks": len(lags),
+            "p99_lag_ms": round(percentile(lags, 99) * 1e3, 1),
+            "max_lag_ms": round(max(lags) * 1e3, 1),
+        })
+    print_table(rows)
+
+    sources = [("original upload", len(data))] + [(f"variant {name}", len(blob)) for name, blob in variants.items()]
+    print_table([
+        {"list avatar": name, "bytes_each": size, f"page_of_{args.page}_kb": round(size * args.page / 1024, 1)}
+        for name, size in sources
+    ])
+    photos.shutdown_photos()
+
+
+if __name__ == "__main__":
+    main()
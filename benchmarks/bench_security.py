@@ -0,0 +1,51 @@
+"""
+Micro-benchmarks for app.core.security.
+
+Hashing is measured both in-process (raw passlib cost for the configured
+scheme/rounds) and through the hashing executor (what request handlers pay).
+
+    python -m benchmarks.bench_security --repeat 20 --token-repeat 20000
+"""
+import argparse
+
+from app.core import security
+from benchmarks.common import percentile, print_table, timed
+
+
+def row(name: str, samples: list[float]) -> dict:
+    total = sum(samples)
+    return {
+        "op": name,
+        "calls": len(samples),
+        "ops_per_s": round(len(samples) / total, 1) if total else 0.0,
+        "p50_us": round(percentile(samples, 50) * 1e6, 1),
+        "p99_us": round(percentile(samples, 99) * 1e6, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20, help="Iterations for hash/verify")
+    parser.add_argument("--token-repeat", type=int, default=20000, help="Iterations for JWT ops")
+    args = parser.parse_args()
+
+    password = "bench-Passw0rd!"
+    hashed = security.context.hash(password)
+    token = security.create_token({"sub": "1", "role": "admin"})
+    security.verify_password(password, hashed)  # start the executor workers
+
+    rows = [
+        row("hash (in-process)", timed(lambda: security.context.hash(password), args.repeat)),
+        row("verify (in-process)", timed(lambda: security.context.verify(password, hashed), args.repeat)),
+        row("get_password_hash (executor)", timed(lambda: security.get_password_hash(password), args.repeat)),
+        row("verify_password (executor)", timed(lambda: security.verify_password(password, hashed), args.repeat)),
+        row("create_token", timed(lambda: security.create_token({"sub": "1", "role": "admin"}), args.token_repeat)),
+        row("verify_token", timed(lambda: security.verify_token(token), args.token_repeat)),
+    ]
+    security.shutdown_hashing()
+    print(f"scheme={security.context.default_scheme()} rounds={security.settings.PASSWORD_HASH_ROUNDS or 'default'}")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Response serialization cost: FastAPI's response_model path vs FastJSONRoute.
+
+Builds an `ok(data=[JobRead, ...])` envelope for GET /api/v1/jobs and renders it
+the way each path does (no database, no HTTP): FastAPI dumps, re-validates and
+serializes it against the route's response field before JSONResponse encodes it;
+FastJSONRoute serializes it once with the response type's TypeAdapter. Reports
+the best time out of `--repeat` and the peak memory allocated while rendering
+(tracemalloc, separate run).
+
+    python -m benchmarks.bench_serialization --rows 1000 10000 100000
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+from app.core.response import ok, render_envelope
+from app.entities.jobs.schema import JobRead
+from app.main import app
+from benchmarks.common import print_table
+
+
+def _rows(count: int) -> list[JobRead]:
+    start = datetime(2030, 1, 1, 8, tzinfo=timezone.utc)
+    return [
+        JobRead.model_validate({
+            "id": i, "admin_id": 1, "title": f"Shift {i} barista", "description": "Synthetic benchmark job",
+            "status": "active", "minimum_education": "none", "job_category": "part_time",
+            "characteristics": ["friendly", "punctual"], "workers_required": 1 + i % 10, "workers_hired": i % 3,
+            "salary": 10 + i % 90, "from_date_time": start + timedelta(hours=i), "to_date_time": start + timedelta(hours=i + 4),
+        })
+        for i in range(count)
+    ]
+
+
+def _route(path: str, method: str = "GET"):
+    return next(r for r in app.routes if getattr(r, "path", None) == path and method in r.methods)
+
+
+def fastapi_path(route, envelope) -> bytes:
+    content = asyncio.run(serialize_response(field=route.secure_cloned_response_field, response_content=envelope, is_coroutine=True))
+    return JSONResponse(content).body
+
+
+def fast_path(route, envelope) -> bytes:
+    return render_envelope(route.response_model, envelope)
+
+
+def measure(render, route, envelope, repeat: int) -> tuple[float, float, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = render(route, envelope)
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    render(route, envelope)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, len(body)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    route = _route("/api/v1/jobs")
+    results = []
+    for count in args.rows:
+        envelope = ok(data=_rows(count), message="All Jobs Found Successfully")
+        assert fastapi_path(route, envelope) == fast_path(route, envelope)
+        for name, render in (("response_model (FastAPI)", fastapi_path), ("FastJSONRoute", fast_path)):
+            seconds, peak, size = measure(render, route, envelope, args.repeat)
+            results.append({
+                "rows": count,
+                "path": name,
+                "ms": round(seconds * 1000, 2),
+                "peak_alloc_mb": round(peak / 2**20, 2),
+                "body_mb": round(size / 2**20, 2),
+            })
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
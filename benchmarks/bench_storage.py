@@ -0,0 +1,161 @@
+"""
+Peak memory of storage I/O on large objects: the old whole-object download vs the streaming backends.
+
+Writes one `--size-mb` file, then runs every operation in a fresh
+subprocess. Before each operation the subprocess resets its RSS high-water
+mark (/proc/self/clear_refs), so the reported peak is what that operation
+added on top of the interpreter and imports. The Supabase backend talks to
+an in-process httpx transport. It consumes uploads part by part and serves
+downloads as a stream, so only the backend's own buffering shows
+up. No network is needed.
+
+    python -m benchmarks.bench_storage --size-mb 500
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import print_table
+
+OPERATIONS = (
+    "whole-object read + write (old download_file)",
+    "local upload_file (copyfile)",
+    "local upload_file with progress (chunked)",
+    "local download_file",
+    "local file_response (FileResponse)",
+    "supabase upload_file (TUS, 6 MiB parts)",
+    "supabase download_file (streamed)",
+    "supabase file_response (proxied)",
+)
+
+
+def _rss_mb(field: str) -> float:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError(f"{field} not available (Linux only)")
+
+
+def _mock_supabase(size: int):
+    import httpx
+
+    from app.db.supabase import SupabaseStorage
+
+    received = {"bytes": 0}
+    block = os.urandom(1024 * 1024)
+
+    def body():
+        for start in range(0, size, len(block)):
+            yield block[: min(len(block), size - start)]
+
+    class Transport(httpx.BaseTransport):
+        # Unlike httpx.MockTransport, never calls request.read(), which would cache every part on its request
+        def handle_request(self, request: httpx.Request) -> httpx.Response:
+            return handler(request)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST" and request.url.path.endswith("/upload/resumable"):
+            return httpx.Response(201, headers={"Location": "http://supabase.test/storage/v1/upload/resumable/1"})
+        if request.method == "PATCH":
+            received["bytes"] += sum(len(chunk) for chunk in request.stream)
+            return httpx.Response(204, headers={"Upload-Offset": str(received["bytes"])})
+        return httpx.Response(200, content=body(), headers={"content-type": "application/octet-stream", "content-length": str(size)})
+
+    client = httpx.Client(transport=Transport())
+    return SupabaseStorage(url="http://supabase.test", key="bench", storage_bucket="bench", client=client)
+
+
+async def _drain(response) -> int:
+    sent = 0
+    requested = False
+
+    async def receive():
+        # The request body once, then block like a client that stays connected
+        nonlocal requested
+        if requested:
+            await asyncio.Event().wait()
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal sent
+        sent += len(message.get("body", b""))
+
+    await response({"type": "http", "method": "GET", "headers": [], "extensions": {}}, receive, send)
+    return sent
+
+
+def run_operation(name: str, source: str, workdir: str) -> dict:
+    from app.core.storage import LocalStorage
+
+    size = os.path.getsize(source)
+    local = LocalStorage(root=os.path.join(workdir, "root"))
+    supabase = _mock_supabase(size)
+    local.upload_file(source, "object.bin")
+    destination = os.path.join(workdir, "download.bin")
+
+    baseline = _rss_mb("VmRSS")
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+    started = time.perf_counter()
+    if name.startswith("whole-object"):
+        with open(source, "rb") as f:
+            data = f.read()
+        with open(destination, "wb") as f:
+            f.write(data)
+        del data
+    elif name == "local upload_file (copyfile)":
+        local.upload_file(source, "copy.bin")
+    elif name.startswith("local upload_file with progress"):
+        local.upload_file(source, "copy.bin", progress=lambda done, total: None)
+    elif name == "local download_file":
+        local.download_file("object.bin", destination)
+    elif name.startswith("local file_response"):
+        assert asyncio.run(_drain(local.file_response("object.bin"))) == size
+    elif name.startswith("supabase upload_file"):
+        supabase.upload_file(source, "object.bin", progress=lambda done, total: None)
+    elif name.startswith("supabase download_file"):
+        supabase.download_file("object.bin", destination)
+        assert os.path.getsize(destination) == size
+    elif name.startswith("supabase file_response"):
+        assert asyncio.run(_drain(supabase.file_response("object.bin"))) == size
+    elapsed = time.perf_counter() - started
+    return {"operation": name, "seconds": round(elapsed, 2), "peak_extra_mb": round(_rss_mb("VmHWM") - baseline, 1)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=int, default=500)
+    parser.add_argument("--dir", default=None, help="Scratch directory (needs about 3x --size-mb free)")
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    parser.add_argument("--source", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(run_operation(args.run, args.source, os.path.dirname(args.source))))
+        return
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as workdir:
+        source = os.path.join(workdir, "source.bin")
+        block = os.urandom(1024 * 1024)
+        with open(source, "wb") as f:
+            for _ in range(args.size_mb):
+                f.write(block)
+        rows = []
+        for name in OPERATIONS:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_storage", "--run", name, "--source", source],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            rows.append({"size_mb": args.size_mb} | json.loads(output.strip().splitlines()[-1]))
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
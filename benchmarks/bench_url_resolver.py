@@ -0,0 +1,118 @@
+"""
+Photo URLs for a 1k-worker list: one signing call per file vs batch resolution through the URL cache.
+
+The Supabase backend runs with SUPABASE_SIGNED_URLS. It talks to an
+in-process httpx transport that sleeps `--rtt-ms` per request, like a
+round trip to Storage, and signs whatever it is asked to. Users are
+unsaved User rows with uploaded-photo variants. No database or network
+is needed.
+
+The timed work is turning the rows into UserRead items, as
+`get_all_workers_by_admin` does:
+- per-file: each row signs its own URLs, like a bare get_file_url in the
+  serializer.
+- batch, cold cache: `prefetch_photo_urls` signs the whole page in one
+  request, then the rows read the cache.
+- batch, warm cache: the next poll of the same page.
+- no photos: the same rows without variants, as a floor.
+
+    python -m benchmarks.bench_url_resolver --workers 1000 --rtt-ms 20
+"""
+import argparse
+import json
+import time
+
+from app.config import settings
+from app.core import storage
+from app.core.photos import FULL, photo_key, prefetch_photo_urls
+from app.entities.user.modal import User
+from app.entities.user.schema import UserRead
+from benchmarks.common import print_table
+
+
+def signed_backend(rtt: float, calls: dict):
+    import httpx
+
+    from app.db.supabase import SupabaseStorage
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["requests"] += 1
+        time.sleep(rtt)
+        body = json.loads(request.read())
+        signed = [
+            {"path": path, "signedURL": f"/object/sign/bench/{path}?token=t{calls['requests']}", "error": None}
+            for path in body["paths"]
+        ]
+        return httpx.Response(200, json=signed)
+
+    settings.SUPABASE_SIGNED_URLS = True
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    return SupabaseStorage(url="http://supabase.test", key="bench", storage_bucket="bench", client=client)
+
+
+def workers(n: int, photos: bool = True) -> list[User]:
+    variants = (FULL, str(settings.PHOTO_LIST_SIZE))
+    return [
+        User(
+            id=i, first_name=f"W{i}", last_name="K", email=f"w{i}@bench.example.com", phone="1", gender="male",
+            availability=True, worker_roles=[],
+            photo_variants={v: photo_key(f"{i:064x}", v) for v in variants} if photos else None,
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+def per_file(users: list[User]) -> list[UserRead]:
+    backend = storage.get_storage()
+    items = []
+    for user in users:
+        # Validate without the variants so the URL cache stays out of it
+        variants, user.photo_variants = user.photo_variants, None
+        item = UserRead.model_validate(user)
+        user.photo_variants = variants
+        item.photo = backend.get_file_url(variants[FULL])
+        item.photo_thumbnail = backend.get_file_url(variants[str(settings.PHOTO_LIST_SIZE)])
+        items.append(item)
+    return items
+
+
+def batched(users: list[User]) -> list[UserRead]:
+    prefetch_photo_urls(users)
+    return [UserRead.model_validate(u) for u in users]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=1000)
+    parser.add_argument("--rtt-ms", type=float, default=20.0, help="Simulated Storage round trip per request")
+    args = parser.parse_args()
+
+    calls = {"requests": 0}
+    storage._storage = signed_backend(args.rtt_ms / 1000, calls)
+    users = workers(args.workers)
+
+    rows = []
+    for name, fn, fixture in (
+        ("per-file", per_file, users),
+        ("batch, cold cache", batched, users),
+        ("batch, warm cache", batched, users),
+        ("no photos", batched, workers(args.workers, photos=False)),
+    ):
+        before = calls["requests"]
+        started = time.perf_counter()
+        items = fn(fixture)
+        elapsed = time.perf_counter() - started
+        assert fixture is not users or all(item.photo and item.photo_thumbnail for item in items)
+        rows.append({
+            "serialize": name,
+            "workers": len(items),
+            "storage_requests": calls["requests"] - before,
+            "ms": round(elapsed * 1e3, 1),
+            "us_per_worker": round(elapsed / len(items) * 1e6, 1),
+        })
+    print(f"rtt={args.rtt_ms}ms cache_ttl={storage.url_resolver().cache.ttl:.0f}s")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
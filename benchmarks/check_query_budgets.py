@@ -0,0 +1,66 @@
+"""
+Query budgets for the list endpoints.
+
+Seeds one tenant, calls every list endpoint through the ASGI app and compares
+the statements each request ran (counted by QueryCounterMiddleware) with its
+budget. The budgets and the tenant are shared with the test suite
+(tests/query_budgets.py). Exits non-zero on any violation.
+
+    python -m benchmarks.check_query_budgets --jobs 50 --workers 20
+"""
+import argparse
+import asyncio
+import sys
+
+import httpx
+
+from app.core.query_counter import observe_requests
+from app.db.session import SessionLocal
+from app.main import app
+from benchmarks.common import print_table
+from tests.query_budgets import QUERY_BUDGETS, drop_budget_rows, role_headers, seed_budget_tenant
+
+
+async def check(admin_id: int, worker_id: int) -> list[dict]:
+    headers = role_headers(admin_id, worker_id)
+    rows = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://budget") as client:
+        for path, (role, budget) in QUERY_BUDGETS.items():
+            with observe_requests() as requests:
+                response = await client.get(path, headers=headers[role])
+            stats = requests[0]
+            body = response.json()
+            rows.append({
+                "endpoint": path,
+                "rows": len(body["data"]) if isinstance(body.get("data"), list) else 1,
+                "queries": stats.count,
+                "duplicates": stats.duplicates,
+                "budget": budget,
+                "ok": "yes" if stats.count <= budget and stats.duplicates == 0 and body.get("success") else "NO",
+            })
+            if rows[-1]["ok"] == "NO":
+                print(stats.report())
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=20)
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        admin_id, worker_id = seed_budget_tenant(db, jobs=args.jobs, workers=args.workers)
+    try:
+        rows = asyncio.run(check(admin_id, worker_id))
+    finally:
+        with SessionLocal() as db:
+            drop_budget_rows(db)
+    print_table(rows)
+    if any(row["ok"] == "NO" for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
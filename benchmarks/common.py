@@ -0,0 +1,95 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks expect DATABASE_URL to point at a disposable local PostgreSQL
+(e.g. the postgres service in docker-compose.yml); they create and drop their own rows.
+"""
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Awaitable, Callable
+
+import httpx
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of samples (seconds in, seconds out)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(name: str, latencies: list[float], elapsed: float) -> dict:
+    """Build a result row: req/s plus p50/p95/p99 in milliseconds."""
+    count = len(latencies)
+    return {
+        "name": name,
+        "requests": count,
+        "req_per_s": round(count / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def print_table(rows: list[dict]) -> None:
+    """Print result rows as an aligned table."""
+    if not rows:
+        return
+    headers = list(rows[0].keys())
+    widths = {h: max(len(h), *(len(str(r.get(h, ""))) for r in rows)) for h in headers}
+    print("  ".join(h.ljust(widths[h]) for h in headers))
+    for row in rows:
+        print("  ".join(str(row.get(h, "")).ljust(widths[h]) for h in headers))
+
+
+async def run_concurrent(
+    call: Callable[[], Awaitable[object]],
+    total: int,
+    concurrency: int,
+) -> tuple[list[float], float]:
+    """Run `call` `total` times with at most `concurrency` in flight; return (latencies, elapsed)."""
+    latencies: list[float] = []
+    remaining = iter(range(total))
+
+    async def worker() -> None:
+        for _ in remaining:
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - started
+
+
+def timed(fn: Callable[[], object], repeat: int) -> list[float]:
+    """Call a sync function `repeat` times and return per-call durations."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def start_uvicorn(port: int, env: dict[str, str] | None = None) -> subprocess.Popen:
+    """Run app.main:app under uvicorn in a subprocess and wait until /health answers."""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=os.environ | {"JOB_QUEUE_WORKERS": "0"} | (env or {}),
+    )
+    for _ in range(300):
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("uvicorn did not start")
@@ -0,0 +1,148 @@
+"""
+EXPLAIN ANALYZE report for the hot service queries, with and without the indexes.
+
+Seeds `--tenants` tenants (defaults give 1M jobs and 10M applications), then
+runs each query twice: once inside a transaction that drops the indexes from
+migration d41e7b9a3c20 (rolled back afterwards) and once as deployed. Prints
+the top plan node, the scan types used and the execution time of each.
+
+    python -m benchmarks.explain_indexes --tenants 1000 --jobs-per-tenant 1000 --applications-per-job 10
+    python -m benchmarks.explain_indexes --skip-seed --plans   # reuse seeded rows, print full plans
+"""
+import argparse
+import json
+import time
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.db.session import SessionLocal
+from benchmarks.common import print_table
+from benchmarks.seed import BENCH_EMAIL_DOMAIN, BENCH_PASSWORD, drop_bench_rows, seed_businesses, seed_tenant
+
+INDEXES = [
+    "ix_jobs_admin_id_created_at_id",
+    "ix_jobs_admin_id_stats",
+    "ix_job_applications_worker_id",
+    "ix_job_applications_job_id_payment_status",
+    "ix_users_email",
+    "ix_users_admin_id_workers",
+    "ix_business_email",
+]
+
+# The statements the services issue, with their bind parameters
+QUERIES = {
+    "JobService.get_all_jobs": "SELECT * FROM jobs WHERE admin_id = :admin_id",
+    "JobService.get_jobs_stats": (
+        "SELECT count(id), coalesce(sum(workers_required), 0), coalesce(sum(workers_hired), 0), "
+        "sum(CASE WHEN status = 'active' THEN 1 ELSE 0 END) FROM jobs WHERE admin_id = :admin_id"
+    ),
+    "JobApplicationService.get_all_job_applications": "SELECT * FROM job_applications WHERE worker_id = :worker_id",
+    "JobApplicationService.get_worker_revenue": (
+        "SELECT * FROM job_applications WHERE worker_id = :worker_id AND work_status = 'completed'"
+    ),
+    "JobApplicationService.get_pending_payment": (
+        "SELECT ja.* FROM job_applications ja JOIN jobs j ON ja.job_id = j.id "
+        "WHERE j.admin_id = :admin_id AND ja.payment_status = 'pending'"
+    ),
+    "UserService.login_user": "SELECT * FROM users WHERE email = :user_email",
+    "UserService.get_all_workers_by_admin": "SELECT * FROM users WHERE admin_id = :admin_id AND user_role = 'worker'",
+    "BusinessService.request_registration": "SELECT * FROM business WHERE email = :business_email",
+}
+
+
+def seed(db: Session, tenants: int, jobs: int, workers: int, applications_per_job: int) -> None:
+    password_hash = get_password_hash(BENCH_PASSWORD)
+    started = time.perf_counter()
+    for i in range(tenants):
+        seed_tenant(db, jobs=jobs, workers=workers, applications_per_job=applications_per_job, tag=f"ix{i}", password_hash=password_hash)
+        if (i + 1) % 100 == 0:
+            print(f"seeded {i + 1}/{tenants} tenants ({time.perf_counter() - started:.0f}s)", flush=True)
+    seed_businesses(db, tenants * 100, tag="ix")
+    # VACUUM sets the visibility map so covering indexes can serve index-only scans
+    with db.get_bind().connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in ("users", "jobs", "job_applications", "business"):
+            conn.execute(text(f"VACUUM (ANALYZE) {table}"))
+
+
+def pick_params(db: Session) -> dict:
+    """A tenant from the middle of the seeded range, one of its workers and their emails."""
+    admin_id = db.execute(
+        text("SELECT id FROM users WHERE email LIKE :pattern ORDER BY id OFFSET (SELECT count(*) / 2 FROM users WHERE email LIKE :pattern) LIMIT 1"),
+        {"pattern": f"admin-ix%@{BENCH_EMAIL_DOMAIN}"},
+    ).scalar_one()
+    worker = db.execute(
+        text("SELECT id, email FROM users WHERE admin_id = :admin_id ORDER BY id LIMIT 1"), {"admin_id": admin_id}
+    ).one()
+    business_email = db.execute(
+        text("SELECT email FROM business WHERE email LIKE :pattern ORDER BY id DESC LIMIT 1"),
+        {"pattern": f"business-ix%@{BENCH_EMAIL_DOMAIN}"},
+    ).scalar_one()
+    return {"admin_id": admin_id, "worker_id": worker.id, "user_email": worker.email, "business_email": business_email}
+
+
+def _scans(node: dict) -> set[str]:
+    found = set()
+    if "Scan" in node["Node Type"]:
+        found.add(f"{node['Node Type']}({node.get('Index Name') or node.get('Relation Name')})")
+    for child in node.get("Plans", []):
+        found |= _scans(child)
+    return found
+
+
+def explain(db: Session, sql: str, params: dict) -> dict:
+    plan = db.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]
+
+
+def report(db: Session, params: dict, show_plans: bool) -> list[dict]:
+    rows = []
+    for name, sql in QUERIES.items():
+        bound = {k: v for k, v in params.items() if f":{k}" in sql}
+        # Before: the new indexes dropped inside a transaction that is rolled back
+        for index in INDEXES:
+            db.execute(text(f"DROP INDEX IF EXISTS {index}"))
+        before = explain(db, sql, bound)
+        db.rollback()
+        after = explain(db, sql, bound)
+        db.rollback()
+        for label, result in (("before", before), ("after", after)):
+            rows.append({
+                "query": name,
+                "indexes": label,
+                "scans": ", ".join(sorted(_scans(result["Plan"]))),
+                "rows": result["Plan"]["Actual Rows"],
+                "exec_ms": round(result["Execution Time"], 3),
+            })
+            if show_plans:
+                print(f"--- {name} ({label})\n{json.dumps(result['Plan'], indent=1)}")
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tenants", type=int, default=1000)
+    parser.add_argument("--jobs-per-tenant", type=int, default=1000)
+    parser.add_argument("--workers-per-tenant", type=int, default=50)
+    parser.add_argument("--applications-per-job", type=int, default=10)
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse rows seeded by a previous --keep run")
+    parser.add_argument("--keep", action="store_true", help="Leave the seeded rows in place")
+    parser.add_argument("--plans", action="store_true", help="Also print the full JSON plans")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        if not args.skip_seed:
+            drop_bench_rows(db)
+            seed(db, args.tenants, args.jobs_per_tenant, args.workers_per_tenant, args.applications_per_job)
+        try:
+            print_table(report(db, pick_params(db), args.plans))
+        finally:
+            if not args.keep:
+                drop_bench_rows(db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+Mixed-workload load test for the whole API, in-process (ASGI) or against a uvicorn subprocess.
+
+Seeds `--tenants` synthetic tenants (one admin, `--workers` workers, `--jobs`
+jobs and `--applications-per-job` pending applications each). Then
+`--concurrency` virtual users run for `--duration` seconds after a
+`--warmup`. On every iteration a virtual user picks a random tenant and a
+weighted operation from WORKLOAD: worker login, job listing and detail,
+stats, worker list, approval panel, applying, bulk approval.
+
+For each operation it reports requests, errors, req/s, p50/p95/p99 and
+mean SQL statements per request. The statement count comes from the
+X-DB-Query-Count header, which the app sends when `debug` is on. Results
+go to a JSON artifact stamped with the git commit, so runs can be compared
+across commits:
+
+    python -m benchmarks.loadtest --mode inprocess --duration 30 --out before.json
+    python -m benchmarks.loadtest --mode uvicorn --concurrency 64 --out after.json
+    python -m benchmarks.loadtest --compare before.json after.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Iterator
+
+import httpx
+from sqlalchemy import text
+
+from app.core.security import create_token, get_password_hash
+from app.db.session import SessionLocal
+from app.entities.jobs.stats import reconcile_job_stats
+from benchmarks.common import print_table, start_uvicorn, summarize
+from benchmarks.seed import BENCH_EMAIL_DOMAIN, BENCH_PASSWORD, drop_bench_rows, seed_tenant
+
+API = "/api/v1"
+
+
+@dataclass
+class Tenant:
+    tag: str
+    admin_id: int
+    admin_headers: dict
+    workers: list[int]
+    worker_headers: dict[int, dict]
+    jobs: list[int]
+    pending: deque = field(default_factory=deque)
+    unapplied: Iterator[tuple[int, int]] = iter(())
+
+
+def _unapplied_pairs(jobs: list[int], workers: list[int], seeded_per_job: int) -> Iterator[tuple[int, int]]:
+    # seed_tenant gives job j the workers[(j + k) % n] for k < per_job; the offsets after that are free
+    for offset in range(seeded_per_job, len(workers)):
+        for job_id in jobs:
+            yield job_id, workers[(job_id + offset) % len(workers)]
+
+
+def seed(tenants: int, workers: int, jobs: int, applications_per_job: int) -> list[Tenant]:
+    password_hash = get_password_hash(BENCH_PASSWORD)
+    seeded = []
+    with SessionLocal() as db:
+        drop_bench_rows(db)
+        for i in range(tenants):
+            tag = f"load{i}"
+            admin_id = seed_tenant(db, jobs=jobs, workers=workers, applications_per_job=applications_per_job, tag=tag, password_hash=password_hash)
+            reconcile_job_stats(db, admin_id)
+            worker_ids = sorted(db.scalars(text("SELECT id FROM users WHERE admin_id = :a AND user_role = 'worker'"), {"a": admin_id}))
+            job_ids = list(db.scalars(text("SELECT id FROM jobs WHERE admin_id = :a ORDER BY id"), {"a": admin_id}))
+            pending = db.scalars(
+                text("SELECT ja.id FROM job_applications ja JOIN jobs j ON j.id = ja.job_id WHERE j.admin_id = :a AND ja.approved_status = 'applied'"),
+                {"a": admin_id},
+            )
+            tenant = Tenant(
+                tag=tag,
+                admin_id=admin_id,
+                admin_headers={"Authorization": f"Bearer {create_token({'sub': str(admin_id), 'role': 'admin'})}"},
+                workers=worker_ids,
+                worker_headers={
+                    w: {"Authorization": f"Bearer {create_token({'sub': str(w), 'role': 'worker', 'admin_id': admin_id})}"}
+                    for w in worker_ids
+                },
+                jobs=job_ids,
+                pending=deque(pending),
+            )
+            tenant.unapplied = _unapplied_pairs(job_ids, worker_ids, applications_per_job)
+            seeded.append(tenant)
+        db.execute(text("ANALYZE users, jobs, job_applications, job_stats"))
+        db.commit()
+    return seeded
+
+
+# ---------- Workload ----------
+
+Operation = Callable[[httpx.AsyncClient, Tenant, random.Random], Awaitable[httpx.Response | None]]
+
+
+async def login(client, tenant, rng):
+    g = 1 + tenant.workers.index(rng.choice(tenant.workers))
+    email = f"worker-{tenant.tag}-{g}@{BENCH_EMAIL_DOMAIN}"
+    return await client.post(f"{API}/users/login", json={"email": email, "password": BENCH_PASSWORD})
+
+
+async def list_jobs(client, tenant, rng):
+    return await client.get(f"{API}/jobs", headers=tenant.worker_headers[rng.choice(tenant.workers)])
+
+
+async def job_detail(client, tenant, rng):
+    return await client.get(f"{API}/jobs/{rng.choice(tenant.jobs)}", headers=tenant.admin_headers)
+
+
+async def job_stats(client, tenant, rng):
+    return await client.get(f"{API}/jobs/stats", headers=tenant.admin_headers)
+
+
+async def list_workers(client, tenant, rng):
+    return await client.get(f"{API}/users", headers=tenant.admin_headers)
+
+
+async def approval_panel(client, tenant, rng):
+    return await client.get(f"{API}/job_applications/approval-panel", headers=tenant.admin_headers)
+
+
+async def apply(client, tenant, rng):
+    pair = next(tenant.unapplied, None)
+    if pair is None:
+        return None
+    job_id, worker_id = pair
+    response = await client.post(f"{API}/job_applications", json={"job_id": job_id}, headers=tenant.worker_headers[worker_id])
+    if response.status_code == 200 and response.json().get("success"):
+        tenant.pending.append(response.json()["data"]["id"])
+    return response
+
+
+async def approve(client, tenant, rng):
+    batch = [tenant.pending.popleft() for _ in range(min(5, len(tenant.pending)))]
+    if not batch:
+        return None
+    decisions = [{"id": application_id, "approved_status": "approved"} for application_id in batch]
+    return await client.put(f"{API}/job_applications/approval-panel/bulk", json={"decisions": decisions}, headers=tenant.admin_headers)
+
+
+# (name, weight, operation)
+WORKLOAD: list[tuple[str, int, Operation]] = [
+    ("POST /users/login", 1, login),
+    ("GET /jobs", 10, list_jobs),
+    ("GET /jobs/{job_id}", 6, job_detail),
+    ("GET /jobs/stats", 3, job_stats),
+    ("GET /users", 3, list_workers),
+    ("GET /job_applications/approval-panel", 2, approval_panel),
+    ("POST /job_applications", 3, apply),
+    ("PUT /job_applications/approval-panel/bulk", 2, approve),
+]
+
+
+@dataclass
+class OperationStats:
+    latencies: list[float] = field(default_factory=list)
+    queries: list[int] = field(default_factory=list)
+    errors: int = 0
+    sample_error: str = ""
+
+
+def _failed(response: httpx.Response) -> bool:
+    if response.status_code >= 400:
+        return True
+    if response.headers.get("content-type", "").startswith("application/json"):
+        return response.json().get("success") is False
+    return False
+
+
+async def drive(client: httpx.AsyncClient, tenants: list[Tenant], concurrency: int, warmup: float, duration: float, seed: int) -> tuple[dict[str, OperationStats], float]:
+    names, weights, operations = zip(*WORKLOAD)
+    stats: dict[str, OperationStats] = defaultdict(OperationStats)
+    measuring_from = time.perf_counter() + warmup
+    deadline = measuring_from + duration
+
+    async def virtual_user(index: int) -> None:
+        rng = random.Random(seed * 1000 + index)
+        while (now := time.perf_counter()) < deadline:
+            i = rng.choices(range(len(operations)), weights)[0]
+            started = time.perf_counter()
+            response = await operations[i](client, rng.choice(tenants), rng)
+            elapsed = time.perf_counter() - started
+            if response is None or now < measuring_from:
+                continue
+            op = stats[names[i]]
+            op.latencies.append(elapsed)
+            if "x-db-query-count" in response.headers:
+                op.queries.append(int(response.headers["x-db-query-count"]))
+            if _failed(response):
+                op.errors += 1
+                op.sample_error = op.sample_error or f"{response.status_code} {response.text[:200]}"
+
+    await asyncio.gather(*(virtual_user(i) for i in range(concurrency)))
+    return stats, duration
+
+
+def report(stats: dict[str, OperationStats], elapsed: float) -> list[dict]:
+    rows = []
+    for name, _, _ in WORKLOAD:
+        op = stats.get(name)
+        if op is None or not op.latencies:
+            continue
+        rows.append(summarize(name, op.latencies, elapsed) | {
+            "errors": op.errors,
+            "queries_per_req": round(statistics.fmean(op.queries), 2) if op.queries else None,
+        })
+    every = [latency for op in stats.values() for latency in op.latencies]
+    rows.append(summarize("TOTAL", every, elapsed) | {
+        "errors": sum(op.errors for op in stats.values()),
+        "queries_per_req": round(statistics.fmean(q for op in stats.values() for q in op.queries), 2) if any(op.queries for op in stats.values()) else None,
+    })
+    return rows
+
+
+def _git_commit() -> str | None:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ---------- Compare ----------
+
+def _change(old: float | None, new: float | None) -> str:
+    if not old or new is None:
+        return ""
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+def compare(before_path: str, after_path: str) -> None:
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    print(f"before: {before['commit']} ({before['mode']}, {before['created_at']})")
+    print(f"after:  {after['commit']} ({after['mode']}, {after['created_at']})")
+    old_rows = {row["name"]: row for row in before["results"]}
+    rows = []
+    for new in after["results"]:
+        old = old_rows.get(new["name"], {})
+        rows.append({
+            "name": new["name"],
+            "req_per_s": f"{old.get('req_per_s', '-')} -> {new['req_per_s']}",
+            "req_per_s_change": _change(old.get("req_per_s"), new["req_per_s"]),
+            "p95_ms": f"{old.get('p95_ms', '-')} -> {new['p95_ms']}",
+            "p95_change": _change(old.get("p95_ms"), new["p95_ms"]),
+            "p99_ms": f"{old.get('p99_ms', '-')} -> {new['p99_ms']}",
+            "queries_per_req": f"{old.get('queries_per_req', '-')} -> {new['queries_per_req']}",
+            "errors": f"{old.get('errors', '-')} -> {new['errors']}",
+        })
+    print_table(rows)
+
+
+# ---------- Main ----------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mode", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--tenants", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=200, help="Workers per tenant")
+    parser.add_argument("--jobs", type=int, default=2000, help="Jobs per tenant")
+    parser.add_argument("--applications-per-job", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=32, help="Virtual users")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Seconds run before measuring")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds measured")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8766, help="uvicorn port (--mode uvicorn)")
+    parser.add_argument("--out", default=None, help="JSON artifact path (default loadtest-<mode>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Compare two artifacts and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    tenants = seed(args.tenants, args.workers, args.jobs, args.applications_per_job)
+    server = start_uvicorn(args.port) if args.mode == "uvicorn" else None
+
+    async def run() -> tuple[dict[str, OperationStats], float]:
+        if server is not None:
+            transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=args.concurrency))
+            base_url = f"http://127.0.0.1:{args.port}"
+        else:
+            from app.main import app
+
+            transport = httpx.ASGITransport(app=app)
+            base_url = "http://loadtest"
+        async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60) as client:
+            return await drive(client, tenants, args.concurrency, args.warmup, args.duration, args.seed)
+
+    try:
+        stats, elapsed = asyncio.run(run())
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        with SessionLocal() as db:
+            drop_bench_rows(db)
+
+    rows = report(stats, elapsed)
+    print_table(rows)
+    for name, op in stats.items():
+        if op.sample_error:
+            print(f"{name}: {op.errors} errors, e.g. {op.sample_error}")
+
+    artifact = {
+        "commit": _git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "mode": args.mode,
+        "args": {k: v for k, v in vars(args).items() if k not in ("compare", "out")},
+        "results": rows,
+    }
+    out = args.out or f"loadtest-{args.mode}.json"
+    with open(out, "w") as f:
+        json.dump(artifact, f, indent=2)
+    print(f"wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Synthetic tenant seeding for benchmarks.
+
+Rows are generated server-side with generate_series so that seeding a large
+tenant costs a handful of statements instead of one INSERT per row.
+"""
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+
+BENCH_EMAIL_DOMAIN = "bench.example.com"  # reserved (RFC 2606) but accepted by EmailStr, unlike .local
+BENCH_PASSWORD = "bench-password"
+# Job descriptions draw three of these per job (each ~8% of jobs) plus a permit<n> token (1 in 5000), for search
+JOB_WORDS = [
+    "forklift", "warehouse", "espresso", "latte", "delivery", "weekend", "overnight", "kitchen", "prep",
+    "inventory", "customer", "register", "loading", "dock", "catering", "event", "security", "reception",
+    "housekeeping", "laundry", "gardening", "painting", "moving", "packing", "retail", "stocking", "cleaning",
+    "dishwashing", "bartending", "hosting", "valet", "courier", "tutoring", "childcare", "eldercare", "lifeguard",
+    "scaffolding",
+]
+
+
+def seed_tenant(
+    db: Session,
+    jobs: int = 1000,
+    workers: int = 100,
+    applications_per_job: int = 0,
+    tag: str = "t0",
+    password_hash: str | None = None,
+) -> int:
+    """
+    Create one admin with `workers` workers, `jobs` jobs and applications; return the admin id.
+    Pass `password_hash` when seeding many tenants to hash BENCH_PASSWORD only once.
+    """
+    password = password_hash or get_password_hash(BENCH_PASSWORD)
+    admin_id = db.execute(
+        text(
+            "INSERT INTO users (first_name, last_name, email, password, phone, gender, user_role, availability, worker_roles, is_active) "
+            "VALUES ('Bench', 'Admin', :email, :password, '000', 'male', 'admin', true, '{}', true) RETURNING id"
+        ),
+        {"email": f"admin-{tag}@{BENCH_EMAIL_DOMAIN}", "password": password},
+    ).scalar_one()
+    db.execute(
+        text(
+            "INSERT INTO users (first_name, last_name, email, password, phone, gender, user_role, availability, worker_roles, admin_id, is_active) "
+            "SELECT 'Worker', g::text, 'worker-' || :tag || '-' || g || '@' || :domain, :password, '000', "
+            "(ARRAY['male','female','other'])[1 + g % 3]::gender, 'worker', g % 5 <> 0, '{}', :admin_id, true "
+            "FROM generate_series(1, :workers) AS g"
+        ),
+        {"tag": tag, "domain": BENCH_EMAIL_DOMAIN, "password": password, "admin_id": admin_id, "workers": workers},
+    )
+    db.execute(
+        text(
+            "INSERT INTO jobs (title, description, status, minimum_education, job_category, characteristics, workers_required, workers_hired, "
+            "salary, salary_type, from_date_time, to_date_time, admin_id, is_active, created_at) "
+            "SELECT 'Shift ' || g || ' ' || (ARRAY['barista','cashier','driver','cook','cleaner'])[1 + g % 5], "
+            "'Synthetic benchmark job number ' || g || ': ' || w.words[1 + g % 37] || ' ' || w.words[1 + (g / 37) % 37] || ' ' "
+            "|| w.words[1 + (g / 1369) % 37] || ', permit' || g % 5000, "
+            "(ARRAY['active','inactive','completed','cancelled'])[1 + g % 4]::jobstatus, 'none', "
+            "(ARRAY['full_time','part_time','contract','freelancer'])[1 + g % 4]::jobcategory, ARRAY['friendly','punctual'], "
+            "1 + g % 10, 0, 10 + g % 90, (ARRAY['hourly','fixed'])[1 + g % 2]::salarytype, "
+            "now() + (g || ' hours')::interval, now() + (g + 4 || ' hours')::interval, :admin_id, true, "
+            "now() - (g || ' seconds')::interval "
+            "FROM generate_series(1, :jobs) AS g CROSS JOIN (SELECT CAST(:words AS text[]) AS words) w"
+        ),
+        {"admin_id": admin_id, "jobs": jobs, "words": JOB_WORDS},
+    )
+    if applications_per_job:
+        # Job j gets workers[(j + k) % n] for k < per_job: distinct per job, no per-row sort
+        db.execute(
+            text(
+                "INSERT INTO job_applications (job_id, worker_id, approved_status, work_status, payment_status, is_active) "
+                "SELECT j.id, w.ids[1 + (j.id + k) % w.n], 'applied', 'pending', "
+                "CASE WHEN j.status = 'completed' THEN 'pending'::paymentstatus END, true "
+                "FROM jobs j "
+                "CROSS JOIN (SELECT array_agg(id ORDER BY id) AS ids, count(*)::int AS n FROM users "
+                "            WHERE admin_id = :admin_id AND user_role = 'worker') w "
+                "CROSS JOIN generate_series(0, LEAST(:per_job, w.n) - 1) AS k "
+                "WHERE j.admin_id = :admin_id"
+            ),
+            {"admin_id": admin_id, "per_job": applications_per_job},
+        )
+    db.commit()
+    return admin_id
+
+
+def seed_businesses(db: Session, count: int, tag: str = "b0") -> None:
+    """Create `count` business rows with bench emails."""
+    db.execute(
+        text(
+            "INSERT INTO business (business_name, email, phone, address, city, state, zip_code, country, description, is_active) "
+            "SELECT 'Bench Business ' || g, 'business-' || :tag || '-' || g || '@' || :domain, '000', 'Street ' || g, "
+            "'City', 'State', '00000', 'Country', 'Synthetic benchmark business', true "
+            "FROM generate_series(1, :count) AS g"
+        ),
+        {"tag": tag, "domain": BENCH_EMAIL_DOMAIN, "count": count},
+    )
+    db.commit()
+
+
+def drop_bench_rows(db: Session) -> None:
+    """Delete everything created by seed_tenant and seed_businesses."""
+    admin_ids = f"SELECT id FROM users WHERE email LIKE 'admin-%@{BENCH_EMAIL_DOMAIN}'"
+    db.execute(text(f"DELETE FROM job_applications WHERE job_id IN (SELECT id FROM jobs WHERE admin_id IN ({admin_ids}))"))
+    db.execute(text(f"DELETE FROM jobs WHERE admin_id IN ({admin_ids})"))
+    db.execute(text(f"DELETE FROM users WHERE admin_id IN ({admin_ids})"))
+    db.execute(text(f"DELETE FROM users WHERE email LIKE 'admin-%@{BENCH_EMAIL_DOMAIN}'"))
+    db.execute(text(f"DELETE FROM business WHERE email LIKE 'business-%@{BENCH_EMAIL_DOMAIN}'"))
+    db.commit()
@@ -0,0 +1,136 @@
+"""
+Concurrency stress test for approvals: many admins' sessions deciding overlapping applications at once.
+
+Every thread runs its own session and keeps sending random, overlapping
+batches (and single approvals) for the same tenant. Afterwards each job must
+satisfy workers_hired <= workers_required, workers_hired must equal the number
+of approved applications and job_stats must not have drifted. Exits non-zero
+on any violation.
+
+    python -m benchmarks.stress_approvals --jobs 50 --applications-per-job 12 --threads 16
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from sqlalchemy import text
+
+from app.db.session import SessionLocal
+from app.entities.job_application.schema import ApprovalDecision, JobApplicationRead
+from app.entities.job_application.service import JobApplicationApprovalService
+from app.entities.jobs.stats import job_stats_drift, reconcile_job_stats
+from benchmarks.common import print_table
+from benchmarks.seed import drop_bench_rows, seed_tenant
+
+
+def _approver(admin_id: int, applications: list[tuple[int, int, int]], rounds: int, batch: int, seed: int, totals: Counter, lock: threading.Lock) -> None:
+    rng = random.Random(seed)
+    local = Counter()
+    with SessionLocal() as db:
+        service = JobApplicationApprovalService(db)
+        for _ in range(rounds):
+            if rng.random() < 0.2:
+                # Single-approval endpoint path
+                application_id, job_id, worker_id = rng.choice(applications)
+                payload = JobApplicationRead(id=application_id, job_id=job_id, worker_id=worker_id, approved_status="approved")
+                try:
+                    local["single_approved" if service.approve_job_application(payload, admin_id) else "single_not_pending"] += 1
+                except ValueError:
+                    local["single_capacity_exceeded"] += 1
+                continue
+            picked = rng.sample(applications, min(batch, len(applications)))
+            decisions = [
+                ApprovalDecision(id=application_id, approved_status="rejected" if rng.random() < 0.1 else "approved")
+                for application_id, _, _ in picked
+            ]
+            result = service.decide_job_applications(admin_id, decisions)
+            local.update(outcome.outcome for outcome in result.outcomes)
+    with lock:
+        totals.update(local)
+
+
+def check(db, admin_id: int) -> list[str]:
+    problems = []
+    over = db.execute(
+        text("SELECT id, workers_hired, workers_required FROM jobs WHERE admin_id = :a AND workers_hired > workers_required"),
+        {"a": admin_id},
+    ).all()
+    problems += [f"job {row.id}: hired {row.workers_hired} > required {row.workers_required}" for row in over]
+    mismatched = db.execute(
+        text(
+            "SELECT j.id, j.workers_hired, count(ja.id) FILTER (WHERE ja.approved_status = 'approved') AS approved "
+            "FROM jobs j LEFT JOIN job_applications ja ON ja.job_id = j.id WHERE j.admin_id = :a "
+            "GROUP BY j.id HAVING j.workers_hired <> count(ja.id) FILTER (WHERE ja.approved_status = 'approved')"
+        ),
+        {"a": admin_id},
+    ).all()
+    problems += [f"job {row.id}: hired {row.workers_hired} but {row.approved} approved applications" for row in mismatched]
+    if job_stats_drift(db, admin_id):
+        problems.append("job_stats drifted from jobs")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=40)
+    parser.add_argument("--applications-per-job", type=int, default=12)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=40, help="Requests per thread")
+    parser.add_argument("--batch", type=int, default=25, help="Decisions per bulk request")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        drop_bench_rows(db)
+        admin_id = seed_tenant(db, jobs=args.jobs, workers=args.workers, applications_per_job=args.applications_per_job, tag="approvals")
+        reconcile_job_stats(db, admin_id)
+        applications = [
+            tuple(row) for row in db.execute(
+                text("SELECT ja.id, ja.job_id, ja.worker_id FROM job_applications ja JOIN jobs j ON j.id = ja.job_id WHERE j.admin_id = :a"),
+                {"a": admin_id},
+            )
+        ]
+
+    totals, lock = Counter(), threading.Lock()
+    threads = [
+        threading.Thread(target=_approver, args=(admin_id, applications, args.rounds, args.batch, seed, totals, lock))
+        for seed in range(args.threads)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    try:
+        with SessionLocal() as db:
+            problems = check(db, admin_id)
+            hired, required = db.execute(
+                text("SELECT sum(workers_hired), sum(workers_required) FROM jobs WHERE admin_id = :a"), {"a": admin_id}
+            ).one()
+    finally:
+        with SessionLocal() as db:
+            drop_bench_rows(db)
+
+    print_table([{
+        "threads": args.threads,
+        "requests": args.threads * args.rounds,
+        "seconds": round(elapsed, 2),
+        "applications": len(applications),
+        "hired": hired,
+        "positions": required,
+        **dict(sorted(totals.items())),
+    }])
+    for problem in problems:
+        print(problem)
+    if problems:
+        sys.exit(1)
+    print("OK: no job over capacity, hired counts match approved applications")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Staleness stress test for the job entity cache: concurrent writers and readers on a few hot jobs.
+
+Writer threads keep renaming random jobs with JobService.update_job while
+reader threads read them with JobService.get_job_by_id. Readers load through
+a loader that sleeps for `--load-delay` seconds after its SELECT, which widens
+the window where a write commits between a reader's miss and its fill. Once
+every thread has stopped, each job's cached entry (if any) and a fresh
+cached read must equal the row in the database. Exits non-zero on any stale
+entry and prints the cache stats (stale_fills counts the fills that the
+generation check dropped).
+
+    python -m benchmarks.stress_entity_cache --jobs 20 --writers 4 --readers 16 --seconds 10
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from app.db.session import SessionLocal
+from app.entities.jobs.schema import JobRead, JobUpdate
+from app.entities.jobs.service import JobService, job_cache
+from benchmarks.common import print_table
+from benchmarks.seed import drop_bench_rows, seed_tenant
+
+
+class SlowLoadJobService(JobService):
+    load_delay = 0.0
+
+    def _load_job(self, job_id: int) -> JobRead | None:
+        job = super()._load_job(job_id)
+        time.sleep(self.load_delay * random.random())
+        return job
+
+
+def _writer(job_ids: list[int], stop: threading.Event, seed: int, totals: Counter, lock: threading.Lock) -> None:
+    rng = random.Random(seed)
+    writes = 0
+    with SessionLocal() as db:
+        service = JobService(db)
+        while not stop.is_set():
+            job_id = rng.choice(job_ids)
+            current = service._load_job(job_id)
+            payload = JobUpdate.model_validate(current.model_dump() | {"title": f"writer {seed} edit {writes}"})
+            service.update_job(job_id, payload)
+            writes += 1
+    with lock:
+        totals["writes"] += writes
+
+
+def _reader(job_ids: list[int], stop: threading.Event, seed: int, totals: Counter, lock: threading.Lock) -> None:
+    rng = random.Random(seed)
+    reads = 0
+    with SessionLocal() as db:
+        service = SlowLoadJobService(db)
+        while not stop.is_set():
+            service.get_job_by_id(rng.choice(job_ids))
+            db.rollback()
+            reads += 1
+    with lock:
+        totals["reads"] += reads
+
+
+def check(job_ids: list[int]) -> list[str]:
+    problems = []
+    with SessionLocal() as db:
+        service = JobService(db)
+        for job_id in job_ids:
+            fresh = service._load_job(job_id)
+            cached = job_cache.local.get(job_id)
+            if cached is not None and cached != fresh:
+                problems.append(f"job {job_id}: cached title {cached.title!r}, database has {fresh.title!r}")
+            read = service.get_job_by_id(job_id)
+            if read != fresh:
+                problems.append(f"job {job_id}: read title {read.title!r}, database has {fresh.title!r}")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=20, help="Hot jobs shared by every thread")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--load-delay", type=float, default=0.005, help="Max sleep between a reader's SELECT and its fill")
+    args = parser.parse_args()
+
+    if not job_cache.enabled:
+        sys.exit("ENTITY_CACHE_SIZE is 0: nothing to test")
+    SlowLoadJobService.load_delay = args.load_delay
+    with SessionLocal() as db:
+        drop_bench_rows(db)
+        admin_id = seed_tenant(db, jobs=args.jobs, workers=1, tag="entity-cache")
+        job_ids = [job.id for job in JobService(db).get_all_jobs(admin_id).items]
+    job_cache.clear()
+
+    stop, totals, lock = threading.Event(), Counter(), threading.Lock()
+    threads = [threading.Thread(target=_writer, args=(job_ids, stop, seed, totals, lock)) for seed in range(args.writers)]
+    threads += [threading.Thread(target=_reader, args=(job_ids, stop, seed, totals, lock)) for seed in range(args.readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    try:
+        problems = check(job_ids)
+    finally:
+        with SessionLocal() as db:
+            drop_bench_rows(db)
+
+    stats = job_cache.stats()
+    print_table([{
+        "writers": args.writers,
+        "readers": args.readers,
+        "writes": totals["writes"],
+        "reads": totals["reads"],
+        **{key: stats[key] for key in ("hits", "misses", "stale_fills", "invalidations", "evictions")},
+        "hit_ratio": round(stats["hit_ratio"], 3),
+    }])
+    for problem in problems:
+        print(problem)
+    if problems:
+        sys.exit(1)
+    print("OK: every cached job matches the database")
+
+
+if __name__ == "__main__":
+    main()
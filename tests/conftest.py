@@ -0,0 +1,60 @@
+from contextlib import contextmanager
+
+import pytest
+
+from app.core.query_counter import observe_requests, track_queries
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Fail the test when code inside the block goes over a query budget.
+
+        def test_jobs_list(client, query_budget):
+            with query_budget(2):
+                client.get("/api/v1/jobs", headers=admin_headers)
+
+    Every HTTP request finished inside the block (TestClient runs the app in
+    another thread, so requests are observed through QueryCounterMiddleware)
+    and the statements run directly in the test are checked separately.
+    `max_duplicates` additionally caps repeated statement shapes (N+1).
+    """
+    @contextmanager
+    def budget(max_queries: int, max_duplicates: int | None = None):
+        with observe_requests() as requests, track_queries("test body") as local:
+            yield requests
+        for stats in [*requests, local]:
+            if stats.count > max_queries:
+                pytest.fail(f"Query budget exceeded ({stats.count} > {max_queries})\n{stats.report()}")
+            if max_duplicates is not None and stats.duplicates > max_duplicates:
+                pytest.fail(f"Repeated queries ({stats.duplicates} > {max_duplicates}), likely N+1\n{stats.report()}")
+
+    return budget
+
+
+@pytest.fixture(scope="session")
+def db_engine():
+    """The configured Postgres with every table created; tests using it are skipped when it is unreachable."""
+    from sqlalchemy import text
+
+    from app.db.base import Base
+    from app.db.session import engine
+    import app.main  # noqa: F401  (registers every model on Base.metadata)
+
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as e:
+        pytest.skip(f"Postgres is not available: {e}")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture(scope="module")
+def client(db_engine):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,119 @@
+"""
+Query budgets for the list endpoints and the tenant they are checked against.
+
+Shared by tests/test_query_budgets.py and benchmarks/check_query_budgets.py.
+Budgets do not depend on the number of rows, so a lazy load per row (N+1)
+goes over them however large the tenant is.
+"""
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.security import create_token
+
+BUDGET_EMAIL_DOMAIN = "budget.example.com"  # reserved (RFC 2606) but accepted by EmailStr
+
+# path -> (role, max statements per request); the ETag'd lists add one version query
+QUERY_BUDGETS = {
+    "/api/v1/jobs": ("admin", 2),
+    "/api/v1/jobs/stats": ("admin", 2),
+    "/api/v1/jobs/facets": ("admin", 2),
+    "/api/v1/users": ("admin", 2),
+    "/api/v1/business": ("admin", 1),
+    "/api/v1/job_applications/approval-panel": ("admin", 1),
+    "/api/v1/job_applications/admin/revenue": ("admin", 1),
+    "/api/v1/job_applications": ("worker", 1),
+    "/api/v1/job_applications/worker/revenue": ("worker", 1),
+    "/api/v1/job_applications/job-application-status-panel": ("worker", 1),
+}
+
+
+def seed_budget_tenant(db: Session, jobs: int = 50, workers: int = 20) -> tuple[int, int]:
+    """
+    Seed one admin with `workers` workers, `jobs` jobs (three applications each)
+    and ten businesses; returns (admin_id, worker_id). Tokens are minted
+    directly, so nobody needs a real password hash.
+    """
+    drop_budget_rows(db)
+    params = {"domain": BUDGET_EMAIL_DOMAIN, "jobs": jobs, "workers": workers}
+    admin_id = db.execute(
+        text(
+            "INSERT INTO users (first_name, last_name, email, password, phone, gender, user_role, availability, worker_roles, is_active) "
+            "VALUES ('Budget', 'Admin', 'admin@' || :domain, '-', '000', 'male', 'admin', true, '{}', true) RETURNING id"
+        ),
+        params,
+    ).scalar_one()
+    params["admin_id"] = admin_id
+    db.execute(
+        text(
+            "INSERT INTO users (first_name, last_name, email, password, phone, gender, user_role, availability, worker_roles, admin_id, is_active) "
+            "SELECT 'Worker', g::text, 'worker-' || g || '@' || :domain, '-', '000', "
+            "(ARRAY['male','female','other'])[1 + g % 3]::gender, 'worker', true, '{}', :admin_id, true "
+            "FROM generate_series(1, :workers) AS g"
+        ),
+        params,
+    )
+    db.execute(
+        text(
+            "INSERT INTO jobs (title, description, status, minimum_education, job_category, characteristics, workers_required, workers_hired, "
+            "salary, salary_type, from_date_time, to_date_time, admin_id, is_active, created_at) "
+            "SELECT 'Shift ' || g, 'Budget job ' || g, (ARRAY['active','inactive','completed','cancelled'])[1 + g % 4]::jobstatus, 'none', "
+            "(ARRAY['full_time','part_time','contract','freelancer'])[1 + g % 4]::jobcategory, ARRAY['friendly'], "
+            "1 + g % 10, 0, 10 + g % 90, (ARRAY['hourly','fixed'])[1 + g % 2]::salarytype, "
+            "now() + (g || ' hours')::interval, now() + (g + 4 || ' hours')::interval, :admin_id, true, "
+            "now() - (g || ' seconds')::interval "
+            "FROM generate_series(1, :jobs) AS g"
+        ),
+        params,
+    )
+    # Job j gets workers[(j + k) % n] for k < 3
+    db.execute(
+        text(
+            "INSERT INTO job_applications (job_id, worker_id, approved_status, work_status, payment_status, is_active) "
+            "SELECT j.id, w.ids[1 + (j.id + k) % w.n], 'applied', 'pending', "
+            "CASE WHEN j.status = 'completed' THEN 'pending'::paymentstatus END, true "
+            "FROM jobs j "
+            "CROSS JOIN (SELECT array_agg(id ORDER BY id) AS ids, count(*)::int AS n FROM users "
+            "            WHERE admin_id = :admin_id AND user_role = 'worker') w "
+            "CROSS JOIN generate_series(0, LEAST(3, w.n) - 1) AS k "
+            "WHERE j.admin_id = :admin_id"
+        ),
+        params,
+    )
+    db.execute(
+        text(
+            "INSERT INTO business (business_name, email, phone, address, city, state, zip_code, country, description, is_active) "
+            "SELECT 'Budget Business ' || g, 'business-' || g || '@' || :domain, '000', 'Street ' || g, "
+            "'City', 'State', '00000', 'Country', 'Query budget business', true "
+            "FROM generate_series(1, 10) AS g"
+        ),
+        params,
+    )
+    worker_id = db.execute(
+        text("SELECT worker_id FROM job_applications ja JOIN jobs j ON j.id = ja.job_id WHERE j.admin_id = :a LIMIT 1"),
+        {"a": admin_id},
+    ).scalar_one()
+    # Give the worker completed, paid-pending work so the revenue lists have rows
+    db.execute(
+        text("UPDATE job_applications SET work_status = 'completed', payment_status = 'pending' WHERE worker_id = :w"),
+        {"w": worker_id},
+    )
+    db.commit()
+    return admin_id, worker_id
+
+
+def drop_budget_rows(db: Session) -> None:
+    """Delete everything created by seed_budget_tenant."""
+    admin_ids = f"SELECT id FROM users WHERE email = 'admin@{BUDGET_EMAIL_DOMAIN}'"
+    db.execute(text(f"DELETE FROM job_applications WHERE job_id IN (SELECT id FROM jobs WHERE admin_id IN ({admin_ids}))"))
+    db.execute(text(f"DELETE FROM jobs WHERE admin_id IN ({admin_ids})"))
+    db.execute(text(f"DELETE FROM users WHERE admin_id IN ({admin_ids})"))
+    db.execute(text(f"DELETE FROM users WHERE email = 'admin@{BUDGET_EMAIL_DOMAIN}'"))
+    db.execute(text(f"DELETE FROM business WHERE email LIKE 'business-%@{BUDGET_EMAIL_DOMAIN}'"))
+    db.commit()
+
+
+def role_headers(admin_id: int, worker_id: int) -> dict[str, dict[str, str]]:
+    return {
+        "admin": {"Authorization": f"Bearer {create_token({'sub': str(admin_id), 'role': 'admin'})}"},
+        "worker": {"Authorization": f"Bearer {create_token({'sub': str(worker_id), 'role': 'worker', 'admin_id': admin_id})}"},
+    }
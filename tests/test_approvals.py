@@ -0,0 +1,114 @@
+"""Bulk approvals (JobApplicationApprovalService.decide_job_applications) racing each other on Postgres."""
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import delete, func, select
+
+from app.db.session import SessionLocal
+from app.entities.job_application.model import JobApplication, JobApplicationStatus
+from app.entities.job_application.schema import ApprovalDecision
+from app.entities.job_application.service import JobApplicationApprovalService
+from app.entities.jobs.model import Job, JobStatsSummary
+from app.entities.jobs.stats import job_stats_drift, reconcile_job_stats
+from app.entities.user.modal import User
+
+pytestmark = pytest.mark.usefixtures("db_engine")
+
+EMAIL_DOMAIN = "approvals.example.com"
+JOBS, WORKERS, REQUIRED = 10, 6, 2
+
+
+def _user(email: str, role: str, admin_id: int | None = None) -> User:
+    return User(
+        first_name="Approval", last_name="Test", email=email, password="-", phone="0", gender="male",
+        user_role=role, admin_id=admin_id,
+    )
+
+
+def _drop(db) -> None:
+    admin_ids = select(User.id).where(User.email == f"admin@{EMAIL_DOMAIN}").scalar_subquery()
+    job_ids = select(Job.id).where(Job.admin_id.in_(admin_ids)).scalar_subquery()
+    db.execute(delete(JobApplication).where(JobApplication.job_id.in_(job_ids)))
+    db.execute(delete(Job).where(Job.admin_id.in_(admin_ids)))
+    db.execute(delete(JobStatsSummary).where(JobStatsSummary.admin_id.in_(admin_ids)))
+    db.execute(delete(User).where(User.admin_id.in_(admin_ids)))
+    db.execute(delete(User).where(User.email == f"admin@{EMAIL_DOMAIN}"))
+    db.commit()
+
+
+@pytest.fixture
+def tenant():
+    """One admin with JOBS jobs needing REQUIRED workers each, every worker applied to every job."""
+    with SessionLocal() as db:
+        _drop(db)
+        admin = _user(f"admin@{EMAIL_DOMAIN}", "admin")
+        db.add(admin)
+        db.flush()
+        workers = [_user(f"worker-{i}@{EMAIL_DOMAIN}", "worker", admin.id) for i in range(WORKERS)]
+        now = datetime.now(timezone.utc)
+        jobs = [
+            Job(
+                title=f"Shift {i}", description="Approval race", status="active", minimum_education="none",
+                job_category="part_time", workers_required=REQUIRED, workers_hired=0, salary=10, salary_type="hourly",
+                from_date_time=now, to_date_time=now + timedelta(hours=4), admin_id=admin.id,
+            )
+            for i in range(JOBS)
+        ]
+        db.add_all(workers + jobs)
+        db.flush()
+        db.add_all(
+            JobApplication(job_id=job.id, worker_id=worker.id, approved_status="applied", work_status="pending")
+            for job in jobs for worker in workers
+        )
+        db.commit()
+        admin_id = admin.id
+        reconcile_job_stats(db, admin_id)
+        application_ids = list(db.scalars(select(JobApplication.id).where(JobApplication.job_id.in_([j.id for j in jobs]))))
+    yield admin_id, sorted(application_ids)
+    with SessionLocal() as db:
+        _drop(db)
+
+
+def test_overlapping_bulk_approvals_do_not_deadlock_or_overhire(tenant):
+    admin_id, application_ids = tenant
+    # Opposite request orders: the service must still take its row locks in one order
+    orders = [application_ids, application_ids[::-1]]
+    start = threading.Barrier(len(orders))
+    results, errors = [], []
+
+    def approve(ids: list[int]) -> None:
+        try:
+            with SessionLocal() as db:
+                decisions = [ApprovalDecision(id=i, approved_status="approved") for i in ids]
+                start.wait(timeout=10)
+                results.append(JobApplicationApprovalService(db).decide_job_applications(admin_id, decisions))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=approve, args=(ids,)) for ids in orders]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+    assert not any(thread.is_alive() for thread in threads), "bulk approvals are stuck"
+    assert errors == []  # Postgres raises DeadlockDetected into one of them
+
+    assert sum(result.approved for result in results) == JOBS * REQUIRED
+    for result in results:
+        assert result.approved + result.capacity_exceeded + result.not_pending == len(application_ids)
+
+    with SessionLocal() as db:
+        approved = dict(db.execute(
+            select(JobApplication.job_id, func.count())
+            .join(Job, Job.id == JobApplication.job_id)
+            .where(Job.admin_id == admin_id, JobApplication.approved_status == JobApplicationStatus.approved)
+            .group_by(JobApplication.job_id)
+        ).tuples().all())
+        hired = dict(db.execute(select(Job.id, Job.workers_hired).where(Job.admin_id == admin_id)).tuples().all())
+        assert hired == approved == {job_id: REQUIRED for job_id in hired}
+
+        summary = db.get(JobStatsSummary, admin_id)
+        assert summary.workers_hired == JOBS * REQUIRED
+        assert summary.workers_required == JOBS * REQUIRED
+        assert job_stats_drift(db, admin_id) == []
@@ -0,0 +1,141 @@
+"""Entity cache tiers (app.core.entity_cache) without a database: generations, stale fills and Redis."""
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from app.core.entity_cache import EntityCache, LocalTier, RedisTier
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+def loader_that_races(cache: EntityCache, id: int, old: Item, new: Item, rows: dict):
+    """Return the row as read before a concurrent writer commits `new` and invalidates `id`."""
+    def load():
+        rows[id] = new
+        cache.invalidate(id)
+        return old
+
+    return load
+
+
+# ---------- Local tier ----------
+
+def test_local_generation_bump_evicts_the_entry():
+    tier = LocalTier(max_size=10, ttl=60)
+    assert tier.put("a", 1, tier.generation("a"))
+    generation = tier.generation("a")
+    tier.invalidate("a")
+    assert tier.get("a") is None
+    assert tier.generation("a") == generation + 1
+    assert not tier.put("a", 1, generation)  # a fill that read the old generation is dropped
+    assert tier.get("a") is None
+    assert tier.put("a", 2, tier.generation("a"))
+    assert tier.get("a") == 2
+
+
+def test_local_clear_bumps_every_generation():
+    tier = LocalTier(max_size=10, ttl=60)
+    generation = tier.generation("a")
+    tier.put("a", 1, generation)
+    tier.clear()
+    assert len(tier) == 0
+    assert not tier.put("a", 1, generation)
+
+
+def test_local_lru_eviction():
+    tier = LocalTier(max_size=2, ttl=60)
+    for key in ("a", "b"):
+        tier.put(key, key, tier.generation(key))
+    tier.get("a")  # a is now the most recently used
+    tier.put("c", "c", tier.generation("c"))
+    assert tier.get("b") is None
+    assert tier.get("a") == "a" and tier.get("c") == "c"
+    assert tier.evictions == 1
+
+
+def test_invalidation_during_load_does_not_store_the_stale_row():
+    cache = EntityCache("item", Item, LocalTier(max_size=10, ttl=60))
+    old, new = Item(id=1, name="old"), Item(id=1, name="new")
+    rows = {1: old}
+    # The caller still gets what it read, but the cache does not keep it
+    assert cache.get_or_load(1, loader_that_races(cache, 1, old, new, rows)) == old
+    assert cache.stats()["stale_fills"] == 1
+    assert cache.get_or_load(1, lambda: rows[1]) == new
+    assert cache.get_or_load(1, lambda: pytest.fail("should be cached")) == new
+
+
+def test_async_invalidation_during_load_does_not_store_the_stale_row():
+    cache = EntityCache("item", Item, LocalTier(max_size=10, ttl=60))
+    old, new = Item(id=1, name="old"), Item(id=1, name="new")
+    rows = {1: old}
+    load = loader_that_races(cache, 1, old, new, rows)
+
+    async def aload():
+        return load()
+
+    async def current():
+        return rows[1]
+
+    assert asyncio.run(cache.aget_or_load(1, aload)) == old
+    assert asyncio.run(cache.aget_or_load(1, current)) == new
+
+
+# ---------- Redis tier (fakeredis) ----------
+
+@pytest.fixture
+def redis_tier():
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisTier(ttl=60, client=fakeredis.FakeRedis())
+
+
+def test_redis_put_is_skipped_after_invalidation(redis_tier):
+    generation = redis_tier.generation("entity:item:1")
+    assert redis_tier.put("entity:item:1", b"old", generation)
+    redis_tier.invalidate("entity:item:1")
+    assert redis_tier.get("entity:item:1") is None
+    assert not redis_tier.put("entity:item:1", b"old", generation)
+    assert redis_tier.get("entity:item:1") is None
+    assert redis_tier.put("entity:item:1", b"new", redis_tier.generation("entity:item:1"))
+    assert redis_tier.get("entity:item:1") == b"new"
+    assert 0 < redis_tier.client.ttl("entity:item:1") <= 60
+
+
+def test_shared_tier_is_filled_and_invalidated_across_processes(redis_tier):
+    # Two caches over one Redis stand in for two worker processes
+    first = EntityCache("item", Item, LocalTier(max_size=10, ttl=60), redis_tier)
+    second = EntityCache("item", Item, LocalTier(max_size=10, ttl=60), redis_tier)
+    old, new = Item(id=1, name="old"), Item(id=1, name="new")
+    rows = {1: old}
+
+    assert first.get_or_load(1, lambda: rows[1]) == old
+    assert second.get_or_load(1, lambda: pytest.fail("should come from Redis")) == old
+    assert second.stats()["shared_hits"] == 1
+
+    rows[1] = new
+    first.invalidate(1)
+    second.local.invalidate(1)  # the other process drops its local copy when its TTL runs out
+    assert second.get_or_load(1, lambda: rows[1]) == new
+
+
+def test_shared_tier_drops_a_stale_fill(redis_tier):
+    cache = EntityCache("item", Item, LocalTier(max_size=10, ttl=60), redis_tier)
+    old, new = Item(id=1, name="old"), Item(id=1, name="new")
+    rows = {1: old}
+    assert cache.get_or_load(1, loader_that_races(cache, 1, old, new, rows)) == old
+    assert redis_tier.get("entity:item:1") is None
+    assert cache.get_or_load(1, lambda: rows[1]) == new
+    assert Item.model_validate_json(redis_tier.get("entity:item:1")) == new
+
+
+def test_shared_tier_outage_falls_back_to_the_loader():
+    class Down:
+        def __getattr__(self, name):
+            raise ConnectionError("redis down")
+
+    cache = EntityCache("item", Item, LocalTier(max_size=10, ttl=60), RedisTier(ttl=60, client=Down()))
+    assert cache.get_or_load(1, lambda: Item(id=1, name="db")) == Item(id=1, name="db")
+    assert cache.stats()["errors"] >= 1
@@ -0,0 +1,157 @@
+"""Background job queue (app.core.job_queue) against Postgres: restarts, batches and after_commit side effects."""
+import multiprocessing
+import os
+import signal
+import time
+
+import pytest
+from sqlalchemy import delete, select
+
+from app.core.job_queue import BackgroundJob, BackgroundJobStatus, after_commit, enqueue, process_batch, process_next, register_task
+from app.core.security import verify_password
+from app.db.session import SessionLocal
+from app.entities.user.modal import User
+from app.entities.user.service import SEND_PASSWORD_EMAIL_TASK
+
+pytestmark = pytest.mark.usefixtures("db_engine")
+
+DONE_TASK = "test_done"
+HANG_TASK = "test_hang"
+FAIL_TASK = "test_fail"
+TEST_TASKS = (DONE_TASK, HANG_TASK, FAIL_TASK, SEND_PASSWORD_EMAIL_TASK)
+TEST_EMAIL = "job-queue-test@whenwework.local"
+
+sent: list[str] = []
+
+
+@register_task(DONE_TASK)
+def _done(db, payload) -> None:
+    after_commit(db, lambda: sent.append(payload["i"]))
+
+
+@register_task(HANG_TASK)
+def _hang(db, payload) -> None:
+    if payload.get("hang"):
+        time.sleep(3600)
+
+
+@register_task(FAIL_TASK)
+def _fail(db, payload) -> None:
+    after_commit(db, lambda: sent.append("never"))
+    raise RuntimeError("boom")
+
+
+def _jobs(db, task: str) -> list[BackgroundJob]:
+    return db.scalars(select(BackgroundJob).where(BackgroundJob.task == task).order_by(BackgroundJob.id)).all()
+
+
+def _drain(db) -> None:
+    while process_batch(db):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def clean():
+    def clear():
+        with SessionLocal() as db:
+            db.execute(delete(BackgroundJob).where(BackgroundJob.task.in_(TEST_TASKS)))
+            db.execute(delete(User).where(User.email == TEST_EMAIL))
+            db.commit()
+
+    clear()
+    sent.clear()
+    yield
+    clear()
+
+
+def _crashing_worker(jobs: int) -> None:
+    with SessionLocal() as db:
+        enqueue(db, HANG_TASK, {"hang": True})
+        db.commit()  # earliest run_at, so it is the job this process claims
+        for i in range(jobs):
+            enqueue(db, HANG_TASK, {"i": i})
+        db.commit()
+        process_next(db)  # claims the hanging job and blocks inside its handler
+
+
+def test_jobs_survive_a_killed_worker():
+    child = multiprocessing.get_context("spawn").Process(target=_crashing_worker, args=(10,))
+    child.start()
+    try:
+        deadline = time.monotonic() + 60
+        with SessionLocal() as db:
+            while len(_jobs(db, HANG_TASK)) < 11:
+                assert time.monotonic() < deadline, "worker process did not enqueue its jobs"
+                db.rollback()
+                time.sleep(0.1)
+        time.sleep(1)  # let it claim the hanging job
+    finally:
+        os.kill(child.pid, signal.SIGKILL)
+        child.join()
+
+    with SessionLocal() as db:
+        assert len(_jobs(db, HANG_TASK)) == 11
+        # The in-flight job would hang again, so the restarted worker runs it as a normal job
+        for job in _jobs(db, HANG_TASK):
+            job.payload = {"restarted": True}
+        db.commit()
+        _drain(db)
+        assert _jobs(db, HANG_TASK) == []
+
+
+def test_batch_runs_after_commit_callbacks_only_for_successful_jobs():
+    with SessionLocal() as db:
+        for i in range(3):
+            enqueue(db, DONE_TASK, {"i": i})
+        enqueue(db, FAIL_TASK, {})
+        db.commit()
+        _drain(db)
+        assert sorted(sent) == [0, 1, 2]
+        assert _jobs(db, DONE_TASK) == []
+        [failed] = _jobs(db, FAIL_TASK)
+        assert failed.attempts == 1 and failed.last_error == "boom"
+
+
+def _user(db) -> User:
+    user = User(
+        first_name="Job", last_name="Queue", email=TEST_EMAIL, password="x", phone="1", gender="male", user_role="worker",
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_password_email_is_sent_after_the_hash_is_committed(monkeypatch):
+    emailed = []
+
+    def send_email(self, to, subject, body):
+        password = body.removeprefix("Your password is: ")
+        with SessionLocal() as other:  # a separate connection only sees committed rows
+            stored = other.scalar(select(User.password).where(User.email == to))
+        emailed.append(verify_password(password, stored))
+        return True
+
+    monkeypatch.setattr("app.core.email.EmailService.send_email", send_email)
+    with SessionLocal() as db:
+        enqueue(db, SEND_PASSWORD_EMAIL_TASK, {"user_id": _user(db).id})
+        db.commit()
+        _drain(db)
+        assert emailed == [True]
+        assert _jobs(db, SEND_PASSWORD_EMAIL_TASK) == []
+
+
+def test_failed_password_email_is_queued_again(monkeypatch):
+    def send_email(self, to, subject, body):
+        raise OSError("smtp down")
+
+    monkeypatch.setattr("app.core.email.EmailService.send_email", send_email)
+    with SessionLocal() as db:
+        user = _user(db)
+        enqueue(db, SEND_PASSWORD_EMAIL_TASK, {"user_id": user.id})
+        db.commit()
+        assert process_batch(db) >= 1
+        [retry] = _jobs(db, SEND_PASSWORD_EMAIL_TASK)
+        assert retry.status == BackgroundJobStatus.queued
+        assert retry.attempts == 1 and retry.payload == {"user_id": user.id}
+        db.refresh(user)
+        assert user.password != "x"  # the new hash stays committed; the retry sets another one
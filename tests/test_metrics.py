@@ -0,0 +1,66 @@
+"""GET /metrics exposition (app.core.metrics.render_metrics) without a database."""
+import re
+
+from app.core.auth import token_cache
+from app.core.metrics import Gauge, Histogram, render_metrics
+from app.entities.jobs.service import facet_cache
+
+FAMILIES = {
+    "http_request_duration_seconds": "histogram",
+    "http_requests_total": "counter",
+    "db_pool_checkout_seconds": "histogram",
+    "db_pool_connections_in_use": "gauge",
+    "entity_cache_hits_total": "counter",
+    "token_cache_hits_total": "counter",
+    "token_cache_misses_total": "counter",
+    "token_cache_size": "gauge",
+    "job_facets_cache_hits_total": "counter",
+    "job_facets_cache_size": "gauge",
+    "password_hash_queue_seconds": "histogram",
+    "password_hash_in_flight": "gauge",
+    "photo_render_seconds": "histogram",
+    "photo_renders_in_progress": "gauge",
+    "smtp_pool_in_use": "gauge",
+    "smtp_pool_idle": "gauge",
+    "background_job_workers": "gauge",
+}
+
+
+def _types(text: str) -> dict[str, str]:
+    return dict(re.findall(r"^# TYPE (\S+) (\S+)$", text, re.M))
+
+
+def _value(text: str, name: str) -> float:
+    return float(re.search(rf"^{name} (\S+)$", text, re.M).group(1))
+
+
+def test_every_cache_and_executor_is_exported():
+    types = _types(render_metrics())
+    assert {name: types.get(name) for name in FAMILIES} == FAMILIES
+
+
+def test_token_and_facet_cache_counters_are_read_at_scrape_time():
+    before = render_metrics()
+    token_cache.get("not-a-cached-token")
+    facet_cache.get(("no-such-admin",))
+    after = render_metrics()
+    assert _value(after, "token_cache_misses_total") == _value(before, "token_cache_misses_total") + 1
+    assert _value(after, "job_facets_cache_misses_total") == _value(before, "job_facets_cache_misses_total") + 1
+
+
+def test_histogram_and_gauge_rendering():
+    histogram = Histogram("test_seconds", "Test", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value)
+    assert histogram.render()[2:] == [
+        'test_seconds_bucket{le="0.1"} 1',
+        'test_seconds_bucket{le="1"} 2',
+        'test_seconds_bucket{le="+Inf"} 3',
+        "test_seconds_sum 5.55",
+        "test_seconds_count 3",
+    ]
+    gauge = Gauge("test_in_flight", "Test")
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+    assert gauge.render()[2:] == ["test_in_flight 1"]
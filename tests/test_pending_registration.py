@@ -0,0 +1,104 @@
+"""Pending registration stores (app.core.pending_registration) without a database."""
+import pytest
+
+from app.core import pending_registration
+from app.core.pending_registration import InMemoryPendingStore, RedisPendingStore
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(pending_registration.time, "time", clock)
+    return clock
+
+
+def entry(otp: str, expires_at: float) -> dict:
+    return {"otp": otp, "payload": {"business_name": "Cafe"}, "expires_at": expires_at}
+
+
+# ---------- Redis (fakeredis) ----------
+
+@pytest.fixture
+def redis_store():
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisPendingStore(client=fakeredis.FakeRedis())
+
+
+def test_redis_set_get_pop(redis_store):
+    redis_store.set("a@example.com", entry("123456", 2e9), ttl=600)
+    assert redis_store.get("a@example.com") == entry("123456", 2e9)
+    assert redis_store.pop("a@example.com") == entry("123456", 2e9)
+    assert redis_store.pop("a@example.com") is None
+    assert redis_store.get("a@example.com") is None
+
+
+def test_redis_set_overwrites(redis_store):
+    redis_store.set("a@example.com", entry("111111", 2e9), ttl=600)
+    redis_store.set("a@example.com", entry("222222", 2e9), ttl=600)
+    assert redis_store.get("a@example.com")["otp"] == "222222"
+
+
+def test_redis_ttl_is_set_on_the_server(redis_store):
+    redis_store.set("a@example.com", entry("123456", 2e9), ttl=600)
+    assert 0 < redis_store.client.ttl(RedisPendingStore.prefix + "a@example.com") <= 600
+    redis_store.set("b@example.com", entry("123456", 2e9), ttl=0.2)
+    assert redis_store.client.ttl(RedisPendingStore.prefix + "b@example.com") == 1  # never 0 (no expiry)
+
+
+def test_redis_expired_key_is_gone(redis_store):
+    redis_store.set("a@example.com", entry("123456", 2e9), ttl=600)
+    redis_store.client.expire(RedisPendingStore.prefix + "a@example.com", 0)
+    assert redis_store.get("a@example.com") is None
+    assert redis_store.pop("a@example.com") is None
+
+
+# ---------- In memory ----------
+
+def test_memory_set_get_pop(clock):
+    store = InMemoryPendingStore()
+    store.set("a@example.com", entry("123456", clock.now + 600), ttl=600)
+    assert store.get("a@example.com")["otp"] == "123456"
+    assert store.pop("a@example.com")["otp"] == "123456"
+    assert store.get("a@example.com") is None
+
+
+def test_memory_lru_eviction(clock):
+    store = InMemoryPendingStore(max_size=2)
+    store.set("a", entry("1", clock.now + 600), ttl=600)
+    store.set("b", entry("2", clock.now + 600), ttl=600)
+    store.get("a")  # a is now the most recently used
+    store.set("c", entry("3", clock.now + 600), ttl=600)
+    assert len(store) == 2
+    assert store.get("b") is None
+    assert store.get("a") is not None and store.get("c") is not None
+
+
+def test_memory_expired_entries_are_not_returned(clock):
+    store = InMemoryPendingStore()
+    store.set("a", entry("1", clock.now + 600), ttl=600)
+    clock.now += 601
+    assert store.get("a") is None
+    store.set("b", entry("2", clock.now + 600), ttl=600)
+    clock.now += 601
+    assert store.pop("b") is None
+
+
+def test_memory_sweep_drops_expired_entries_on_write(clock):
+    store = InMemoryPendingStore(sweep_interval=60)
+    for key in ("a", "b", "c"):
+        store.set(key, entry("1", clock.now + 30), ttl=30)
+    clock.now += 31
+    store.set("d", entry("2", clock.now + 600), ttl=600)  # before the next sweep: expired entries stay
+    assert len(store) == 4
+    clock.now += 60
+    store.set("e", entry("3", clock.now + 600), ttl=600)  # sweep runs
+    assert len(store) == 2
+    assert store.get("d") is not None and store.get("e") is not None
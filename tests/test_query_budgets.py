@@ -0,0 +1,22 @@
+"""List endpoints stay within their query budgets (tests.query_budgets.QUERY_BUDGETS)."""
+import pytest
+
+from app.db.session import SessionLocal
+from tests.query_budgets import QUERY_BUDGETS, drop_budget_rows, role_headers, seed_budget_tenant
+
+
+@pytest.fixture(scope="module")
+def budget_headers(db_engine):
+    with SessionLocal() as db:
+        headers = role_headers(*seed_budget_tenant(db))
+    yield headers
+    with SessionLocal() as db:
+        drop_budget_rows(db)
+
+
+@pytest.mark.parametrize("path, role, budget", [(path, role, budget) for path, (role, budget) in QUERY_BUDGETS.items()])
+def test_list_endpoint_query_budget(client, budget_headers, query_budget, path, role, budget):
+    with query_budget(budget, max_duplicates=0):
+        response = client.get(path, headers=budget_headers[role])
+    assert response.status_code == 200
+    assert response.json()["success"], response.json()
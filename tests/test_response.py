@@ -0,0 +1,124 @@
+"""FastJSONRoute (app.core.response) on a throwaway app: the pydantic-core fast path and FastAPI's fallback."""
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, Response
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.core import response as response_module
+from app.core.response import APIResponse, EnvelopeJSONResponse, FastJSONRoute, fail, ok
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+class ItemWithSecret(Item):
+    secret: str
+
+
+def tag_response(response: Response) -> None:
+    response.headers["X-Dependency"] = "yes"
+
+
+def build_app() -> FastAPI:
+    router = APIRouter(route_class=FastJSONRoute, dependencies=[Depends(tag_response)])
+
+    @router.get("/model", response_model=APIResponse[Item])
+    def model(response: Response):
+        response.headers["X-Endpoint"] = "yes"
+        return ok(data=ItemWithSecret(id=1, name="a", secret="s"), message="fast")
+
+    @router.get("/async-model", response_model=APIResponse[list[Item]])
+    async def async_model():
+        return ok(data=[Item(id=1, name="a"), Item(id=2, name="b")])
+
+    @router.get("/dict", response_model=APIResponse[Item])
+    def dict_data():
+        return ok(data={"id": "1", "name": "a", "secret": "s"})  # needs validation: falls back
+
+    @router.get("/raw", response_model=APIResponse[Item])
+    def raw():
+        return {"success": True, "data": {"id": 1, "name": "a"}}
+
+    @router.get("/error", response_model=APIResponse[Item], status_code=201)
+    def error(response: Response):
+        response.status_code = 404
+        return fail("missing")
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+@pytest.fixture
+def rendered(monkeypatch):
+    """Envelopes rendered by the fast path (None when it handed over to FastAPI)."""
+    calls = []
+    render_envelope = response_module.render_envelope
+
+    def spy(response_model, result):
+        body = render_envelope(response_model, result)
+        calls.append(body)
+        return body
+
+    monkeypatch.setattr(response_module, "render_envelope", spy)
+    return calls
+
+
+@pytest.fixture
+def client(rendered):
+    with TestClient(build_app()) as client:
+        yield client
+
+
+EXPECTED = {"success": True, "message": "fast", "data": {"id": 1, "name": "a"}, "errors": None, "next_cursor": None}
+
+
+def test_fast_path_filters_to_the_declared_type_and_keeps_headers(client, rendered):
+    response = client.get("/model")
+    assert response.json() == EXPECTED  # `secret` is not part of APIResponse[Item]
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["X-Endpoint"] == response.headers["X-Dependency"] == "yes"
+    assert len(rendered) == 1 and rendered[0] is not None
+
+
+def test_fast_path_for_async_endpoints(client, rendered):
+    assert client.get("/async-model").json()["data"] == [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+    assert rendered[0] is not None
+
+
+def test_fast_path_keeps_the_status_set_by_the_endpoint(client):
+    response = client.get("/error")
+    assert response.status_code == 404
+    assert response.json()["message"] == "missing"
+
+
+def test_mismatched_envelope_falls_back_to_fastapi_validation(client, rendered):
+    response = client.get("/dict")
+    assert response.json()["data"] == {"id": 1, "name": "a"}
+    assert rendered == [None]
+
+
+def test_non_envelope_results_take_the_fastapi_path(client, rendered):
+    assert client.get("/raw").json()["data"] == {"id": 1, "name": "a"}
+    assert rendered == []
+
+
+def test_disabled_setting_uses_the_default_handler(monkeypatch, rendered):
+    monkeypatch.setattr(response_module.settings, "FAST_JSON_RESPONSES", False)
+    with TestClient(build_app()) as client:
+        response = client.get("/model")
+    assert response.json() == EXPECTED
+    assert response.headers["X-Endpoint"] == response.headers["X-Dependency"] == "yes"
+    assert rendered == []
+
+
+def test_both_paths_return_the_same_body(monkeypatch):
+    with TestClient(build_app()) as client:
+        fast = client.get("/model").content
+    monkeypatch.setattr(response_module.settings, "FAST_JSON_RESPONSES", False)
+    with TestClient(build_app()) as client:
+        default = client.get("/model").json()
+    assert EnvelopeJSONResponse.media_type == "application/json"
+    assert APIResponse[Item].model_validate_json(fast).model_dump() == default